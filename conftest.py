@@ -5,12 +5,18 @@ It is also used to define hooks that can be used to modify the behavior of pytes
 """
 
 import pytest
+import contextlib
 import os
 import typing
+import uuid
 from dotenv import load_dotenv
 from pathlib import Path
 from _pytest.python import Function
+from playwright.sync_api import Browser, BrowserContext, Page, expect
 from pytest_html.report_data import ReportData
+from utils.artifact_manifest import ArtifactManifest
+from utils.axe import Axe
+from utils.user_tools import UserTools
 
 # Environment Variable Handling
 
@@ -53,6 +59,216 @@ def pytest_runtest_makereport(item: Function) -> typing.Generator[None, None, No
     if outcome is not None:
         report = outcome.get_result()
         report.description = str(item.function.__doc__)
+        record_test_artifacts(item, report)
+
+
+# Axe Session Handling
+
+# The key each pytest-xdist worker passes its Axe violation index to the controller under
+AXE_VIOLATION_INDEX_KEY = "axe_violation_index"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("axe", "Axe accessibility scanning")
+    group.addoption(
+        "--axe-summary",
+        action="store_true",
+        help="Write a summary report of the unique Axe violations found across the test run.",
+    )
+    group.addoption(
+        "--axe-summary-only",
+        action="store_true",
+        help="Write a summary report of the unique Axe violations found, without generating per-page reports.",
+    )
+    group.addoption(
+        "--axe-update-baseline",
+        action="store_true",
+        help="Regenerate any Axe baseline files used from the violations found, instead of checking against them.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("axe_summary") or config.getoption("axe_summary_only"):
+        Axe.enable_summary(skip_page_reports=config.getoption("axe_summary_only"))
+    if config.getoption("axe_update_baseline"):
+        Axe.update_baselines = True
+        # Set before any pytest-xdist workers start, so they all share the same run id
+        os.environ.setdefault("AXE_BASELINE_RUN_ID", uuid.uuid4().hex)
+
+
+@pytest.fixture
+def axe(context: BrowserContext) -> type[Axe]:
+    """
+    This fixture registers axe-core against the browser context for the test, so it is only injected once
+    (and persists across any navigation) rather than being injected on every scan, and returns the Axe utility
+    to use within the test, e.g. axe.run(page).
+    """
+    Axe.register_context(context)
+    return Axe
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """
+    This waits for any Axe reports being generated in the background to complete, logs a summary of any
+    Axe result cache usage, regenerates any Axe baselines (if requested), records the end of the test run in the
+    artifact manifest and writes the Axe summary report (if enabled) once the test run has completed. When running with pytest-xdist, each worker instead passes its
+    violation index to the controller, which writes a single summary for the test run.
+    """
+    report_errors = Axe.flush_reports()
+    if report_errors:
+        session.config.get_terminal_writer().line(
+            f"{len(report_errors)} Axe report(s) failed to generate:\n" + "\n".join(report_errors), red=True
+        )
+    Axe.result_cache.log_summary()
+    Axe.write_baselines()
+
+    record_artifact_manifest_end(session)
+
+    if Axe.violation_index.enabled:
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput[AXE_VIOLATION_INDEX_KEY] = Axe.violation_index.export()
+        else:
+            Axe.write_summary()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: typing.Any, error: typing.Any) -> None:
+    """
+    This merges the Axe violation index from each pytest-xdist worker into the controller's index as the worker
+    finishes, so the summary written at the end of the test run covers every worker.
+    """
+    exported = getattr(node, "workeroutput", {}).get(AXE_VIOLATION_INDEX_KEY)
+    if exported:
+        Axe.violation_index.merge(exported)
+
+
+# User Leasing
+
+
+@pytest.fixture
+def lease_user() -> typing.Generator[typing.Callable[..., dict], None, None]:
+    """
+    This fixture provides a function to lease a user with a specific role for the duration of the test, e.g.
+    lease_user("Example Role A"), so that no other test (including tests running on other pytest-xdist workers)
+    can use the same user at the same time. All users leased are released when the test completes.
+    """
+    with contextlib.ExitStack() as leases:
+        yield lambda role, **kwargs: leases.enter_context(UserTools.lease_user(role, **kwargs))
+
+
+# Logged In Contexts
+
+
+@pytest.fixture
+def log_in_user() -> typing.Callable[[Page, dict], None]:
+    """
+    This fixture provides the function the logged_in_context fixture uses to log a user in through the UI, which is
+    passed a new page and the user details from users.json, using the USER_PASS environment variable as the password.
+    Override this fixture (in this file, or a conftest.py file closer to your tests) with the login steps for your
+    application.
+    """
+    def _log_in_user(page: Page, user_details: dict) -> None:
+        page.goto("/login")
+        page.get_by_role("textbox", name="Username").fill(user_details["username"])
+        page.get_by_role("textbox", name="Password").fill(os.environ["USER_PASS"])
+        page.get_by_role("button", name="Log in").click()
+        expect(page.get_by_role("link", name="Log out")).to_be_visible()
+
+    return _log_in_user
+
+
+@pytest.fixture
+def logged_in_context(
+    browser: Browser, browser_context_args: dict, log_in_user: typing.Callable[[Page, dict], None]
+) -> typing.Generator[typing.Callable[[str], BrowserContext], None, None]:
+    """
+    This fixture provides a function to create a browser context logged in as the user provided, e.g.
+    logged_in_context("Example User").new_page(), reusing the storage state saved by UserTools so each user is only
+    logged in through the UI when there is no current saved state for them. All contexts created are closed when the
+    test completes.
+    """
+    contexts = []
+
+    def _log_in(user_details: dict) -> dict:
+        login_context = browser.new_context(**browser_context_args)
+        try:
+            log_in_user(login_context.new_page(), user_details)
+            return login_context.storage_state()
+        finally:
+            login_context.close()
+
+    def _logged_in_context(user: str) -> BrowserContext:
+        storage_state = UserTools.retrieve_storage_state(user, _log_in)
+        context = browser.new_context(**browser_context_args, storage_state=storage_state)
+        contexts.append(context)
+        return context
+
+    yield _logged_in_context
+    for context in contexts:
+        context.close()
+
+
+# Artifact Manifest Handling
+
+TEST_OUTCOME_KEY = pytest.StashKey[str]()
+TEST_ARTIFACTS_KEY = pytest.StashKey[list]()
+
+
+@pytest.fixture
+def record_artifact(request: pytest.FixtureRequest) -> typing.Callable[[str | Path], None]:
+    """
+    This fixture provides a function to record a file saved by the test (such as a screenshot or CSV file) in the
+    artifact manifest, e.g. record_artifact("test-results/screenshot/home.png"), so it can be linked back to the
+    test. Trace files and screenshots saved by pytest-playwright are recorded automatically.
+    """
+    artifacts = request.node.stash.setdefault(TEST_ARTIFACTS_KEY, [])
+    return lambda path: artifacts.append(Path(path))
+
+
+def record_test_artifacts(item: Function, report: pytest.TestReport) -> None:
+    """
+    This tracks the outcome of the test across the setup, call and teardown phases and, once the test has been
+    torn down (after pytest-playwright has saved any trace files or screenshots), appends the artifacts produced
+    by the test to the artifact manifest in the results directory, which jira_upload.py then reads instead of
+    searching the results directory.
+    """
+    previous_outcome = item.stash.get(TEST_OUTCOME_KEY, "passed")
+    if report.failed:
+        phase_outcome = "failed" if report.when == "call" else "error"
+    elif hasattr(report, "wasxfail"):
+        phase_outcome = "xfailed" if report.skipped else "xpassed"
+    else:
+        phase_outcome = report.outcome
+    # Keep the earliest outcome that is not a pass, so a test failing in teardown after failing is still "failed"
+    item.stash[TEST_OUTCOME_KEY] = phase_outcome if previous_outcome == "passed" else previous_outcome
+
+    if report.when != "teardown":
+        return
+
+    artifacts = list(item.stash.get(TEST_ARTIFACTS_KEY, []))
+    output_path = (getattr(item, "funcargs", None) or {}).get("output_path")
+    if output_path and Path(output_path).is_dir():
+        artifacts.extend(path for path in Path(output_path).rglob("*") if path.is_file())
+
+    ArtifactManifest.record_artifacts(
+        Path(item.config.getoption("--output", default="test-results")),
+        artifacts,
+        item.nodeid,
+        item.stash[TEST_OUTCOME_KEY],
+    )
+
+
+
+def record_artifact_manifest_end(session: pytest.Session) -> None:
+    """
+    This records the number of entries in the artifact manifest once every test (including on any pytest-xdist
+    workers) has completed, so jira_upload.py only relies on the manifest if nothing is missing from it.
+    """
+    # The pytest-xdist controller records the end of the run once all of the workers have finished
+    if hasattr(session.config, "workerinput"):
+        return
+    ArtifactManifest.record_session_end(Path(session.config.getoption("--output", default="test-results")))
 
 
 ### Add your additional fixtures or hooks below ###
@@ -16,6 +16,7 @@ The script itself can be executed using the following command:
 
 The following arguments are supported in addition:
     --jira-ref <Jira Reference> = The Jira ticket to upload to. Will take precedence over auto-deriving from branch name and the set environment variable.
+        Multiple Jira tickets can be provided (e.g. --jira-ref TEST-1 TEST-2), in which case the files are uploaded to all of them at the same time.
     --results-dir <Directory> = The directory to point to. If not set, points to test-results/ in this directory.
     --no-html = Don't include HTML files in the upload.
     --no-trace = Don't include Trace files (.zip) in the upload.
@@ -25,11 +26,17 @@ The following arguments are supported in addition:
     --no-env-data = Don't include environment data in the Jira comment.
     --overwrite-files = If a filename exists on the ticket that matches those in the results directory, overwrite them.
     --auto-confirm = Will not ask if you want to proceed if set, and will assume that yes has been pressed.
+    --parallel <Number> = The number of files to upload at the same time. If not set, uploads one file at a time.
+    --incremental = Skip any files that are unchanged since they were last uploaded to the Jira ticket.
+    --shrink-oversized = Recompress or split any files too big to upload to Jira (> 10MB), instead of skipping them.
+    --failed-only = Only upload the HTML report and the files for tests that failed or errored (according to results.json and the artifact manifest).
+    --bundle = Upload the files (other than HTML reports) in zip bundles under 10MB, each with an index of the files included, instead of individually.
+    --max-connections <Number> = The maximum number of requests to Jira at the same time when uploading to multiple Jira tickets, up to 10. Defaults to 10.
 """
 
 import argparse
 import sys
-from utils.jira_confluence_util import JiraConfluenceUtil
+from utils.jira_confluence_util import JIRA_CONNECTION_POOL_SIZE, JiraConfluenceUtil
 
 
 def upload_jira_files(args: argparse.Namespace) -> None:
@@ -45,19 +52,37 @@ def upload_jira_files(args: argparse.Namespace) -> None:
         )
 
         if args.jira_ref is not None:
-            jira_ref = (
-                args.jira_ref
-                if jira_instance.is_valid_jira_reference(args.jira_ref)
-                else ""
-            )
+            jira_refs = [
+                jira_ref if jira_instance.is_valid_jira_reference(jira_ref) else ""
+                for jira_ref in args.jira_ref
+            ]
         else:
-            jira_ref = jira_instance.determine_jira_reference_local()
+            jira_refs = [jira_instance.determine_jira_reference_local()]
 
-        if not jira_ref:
+        if not all(jira_refs):
             raise ValueError("ERROR: Cannot proceed due to invalid Jira reference")
 
+        if len(jira_refs) > 1:
+            jira_instance.upload_test_results_dir_to_jira_tickets(
+                ticket_ids=jira_refs,
+                overwrite_files=args.overwrite_files,
+                include_html=not args.no_html,
+                include_trace_files=not args.no_trace,
+                include_screenshots=not args.no_screenshots,
+                include_csv=not args.no_csv,
+                include_env_metadata=not args.no_env_data,
+                add_comment=not args.no_comment,
+                automatically_accept=args.auto_confirm,
+                max_connections=args.max_connections,
+                incremental=args.incremental,
+                shrink_oversized_files=args.shrink_oversized,
+                failed_only=args.failed_only,
+                bundle_files=args.bundle,
+            )
+            return
+
         jira_instance.upload_test_results_dir_to_jira(
-            ticket_id=jira_ref,
+            ticket_id=jira_refs[0],
             overwrite_files=args.overwrite_files,
             include_html=not args.no_html,
             include_trace_files=not args.no_trace,
@@ -66,6 +91,11 @@ def upload_jira_files(args: argparse.Namespace) -> None:
             include_env_metadata=not args.no_env_data,
             add_comment=not args.no_comment,
             automatically_accept=args.auto_confirm,
+            parallel=args.parallel,
+            incremental=args.incremental,
+            shrink_oversized_files=args.shrink_oversized,
+            failed_only=args.failed_only,
+            bundle_files=args.bundle,
         )
     except Exception as e:
         print("An error has been encountered so exiting upload process")
@@ -78,7 +108,10 @@ if __name__ == "__main__":
         description="Upload test results from the test-results directory."
     )
     parser.add_argument(
-        "--jira-ref", type=str, help="Specify the Jira reference to upload to"
+        "--jira-ref",
+        type=str,
+        nargs="+",
+        help="Specify the Jira reference (or references) to upload to",
     )
     parser.add_argument(
         "--results-dir", type=str, help="Specify the results directory to upload from"
@@ -111,5 +144,37 @@ if __name__ == "__main__":
         action="store_true",
         help="Don't prompt to confirm actions before proceeding",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="The number of files to upload at the same time",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip files that are unchanged since they were last uploaded to the Jira ticket",
+    )
+    parser.add_argument(
+        "--shrink-oversized",
+        action="store_true",
+        help="Recompress or split files too big to upload to Jira, instead of skipping them",
+    )
+    parser.add_argument(
+        "--failed-only",
+        action="store_true",
+        help="Only upload the HTML report and the files for tests that failed or errored",
+    )
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Upload the files (other than HTML reports) in zip bundles under 10MB instead of individually",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=JIRA_CONNECTION_POOL_SIZE,
+        help=f"The maximum number of requests to Jira at the same time when uploading to multiple Jira tickets (up to {JIRA_CONNECTION_POOL_SIZE})",
+    )
     args = parser.parse_args()
     upload_jira_files(args)
@@ -0,0 +1,81 @@
+import hashlib
+import pytest
+from pathlib import Path
+from utils.artifact_manifest import ArtifactManifest
+
+
+pytestmark = [pytest.mark.utils]
+
+
+def test_record_and_read_artifacts(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    trace_file = tmp_path / "test-one" / "trace.zip"
+    trace_file.parent.mkdir()
+    trace_file.write_bytes(b"trace")
+    screenshot = tmp_path / "screenshot" / "home.png"
+    screenshot.parent.mkdir()
+    screenshot.write_bytes(b"screenshot")
+
+    assert not ArtifactManifest.manifest_exists(tmp_path)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    ArtifactManifest.record_artifacts(tmp_path, [trace_file], "tests/test_one.py::test_one", "failed")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    ArtifactManifest.record_artifacts(tmp_path, [screenshot, tmp_path / "missing.png"], "tests/test_two.py::test_two", "passed")
+
+    assert ArtifactManifest.manifest_exists(tmp_path)
+    assert sorted(path.name for path in tmp_path.glob("*.jsonl")) == ["artifact-manifest-gw0.jsonl", "artifact-manifest-gw1.jsonl"]
+    assert ArtifactManifest.read_artifacts(tmp_path) == [
+        {
+            "path": trace_file,
+            "size": 5,
+            "sha256": hashlib.sha256(b"trace").hexdigest(),
+            "nodeid": "tests/test_one.py::test_one",
+            "outcome": "failed",
+        },
+        {
+            "path": screenshot,
+            "size": 10,
+            "sha256": hashlib.sha256(b"screenshot").hexdigest(),
+            "nodeid": "tests/test_two.py::test_two",
+            "outcome": "passed",
+        },
+    ]
+
+
+def test_read_artifacts_skips_invalid_entries(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    artifact = tmp_path / "test-one" / "trace.zip"
+    artifact.parent.mkdir()
+    artifact.write_bytes(b"first run")
+    ArtifactManifest.record_artifacts(tmp_path, [artifact], "tests/test_one.py::test_one", "failed")
+    artifact.write_bytes(b"rerun")
+    ArtifactManifest.record_artifacts(tmp_path, [artifact], "tests/test_one.py::test_one", "passed")
+
+    # Simulate a run that was interrupted part way through writing an entry
+    with open(tmp_path / "artifact-manifest.jsonl", "a", encoding="utf-8") as file:
+        file.write('{"path": "test-two/trace.zip", "si')
+
+    artifacts = ArtifactManifest.read_artifacts(tmp_path)
+    assert len(artifacts) == 1
+    assert artifacts[0]["outcome"] == "passed"
+    assert artifacts[0]["sha256"] == hashlib.sha256(b"rerun").hexdigest()
+
+
+def test_manifest_complete(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    artifact = tmp_path / "test-one" / "trace.zip"
+    artifact.parent.mkdir()
+    artifact.write_bytes(b"trace")
+
+    # Nothing is recorded for a run without a manifest
+    ArtifactManifest.record_session_end(tmp_path)
+    assert not ArtifactManifest.manifest_complete(tmp_path)
+
+    # A manifest without the end of the run recorded (e.g. an interrupted run) is not complete
+    ArtifactManifest.record_artifacts(tmp_path, [artifact], "tests/test_one.py::test_one", "failed")
+    assert not ArtifactManifest.manifest_complete(tmp_path)
+    ArtifactManifest.record_session_end(tmp_path)
+    assert ArtifactManifest.manifest_complete(tmp_path)
+
+    # A manifest added to after the end of the run is not complete
+    ArtifactManifest.record_artifacts(tmp_path, [artifact], "tests/test_one.py::test_one", "passed")
+    assert not ArtifactManifest.manifest_complete(tmp_path)
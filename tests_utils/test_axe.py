@@ -1,6 +1,17 @@
+import inspect
+import json
 import pytest
+import utils.axe
+from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
-from utils.axe import Axe
+from utils.axe import (
+    Axe,
+    AxeBaseline,
+    AxeResultCache,
+    AxeViolationIndex,
+    AXE_REGISTERED_SCRIPT_PATH,
+    _AxeCompat
+)
 import pytest_playwright_axe
 
 
@@ -206,3 +217,525 @@ def test_run_list_with_custom_parameters(
     assert run_list_kwargs["strict_mode"] is True
     assert run_list_kwargs["html_report_generated"] is False
     assert run_list_kwargs["json_report_generated"] is False
+
+
+@patch('utils.axe.sync_playwright')
+@patch('utils.axe.pytest_playwright_axe.Axe')
+def test_run_list_with_workers(
+    mock_axe_class: MagicMock,
+    mock_sync_playwright: MagicMock,
+    mock_page: Mock
+) -> None:
+    """Test run_list splits the page list between workers."""
+    mock_axe_class.return_value.run_list.side_effect = (
+        lambda page, page_list, **kwargs: {
+            entry: {"url": entry, "violations": []} for entry in page_list
+        }
+    )
+    mock_page.context.browser.browser_type.name = "firefox"
+    mock_page.context.storage_state.return_value = {"cookies": []}
+    mock_page.viewport_size = {"width": 390, "height": 844}
+    page_list = ["/page1", "/page2", "/page3", "/page1"]
+
+    results = Axe.run_list(
+        page=mock_page,
+        page_list=page_list,  # pyright: ignore[reportArgumentType]
+        workers=2,
+        base_url="https://example.com",
+        strict_mode=True,
+        browser_launch_args={"headless": True, "channel": "firefox-beta"},
+        browser_context_args={"locale": "en-GB", "base_url": "https://other.example.com"}
+    )
+
+    # Verify results are returned in page list order
+    assert list(results.keys()) == ["/page1", "/page2", "/page3"]
+
+    # Verify each worker scanned its share of the list
+    scanned_chunks = sorted(
+        call.kwargs["page_list"]
+        for call in mock_axe_class.return_value.run_list.call_args_list
+    )
+    assert scanned_chunks == [["/page1", "/page3"], ["/page2"]]
+    for call in mock_axe_class.return_value.run_list.call_args_list:
+        assert call.kwargs["strict_mode"] is False
+        assert call.kwargs["use_list_for_filename"] is True
+
+    # Verify worker browsers match the page and settings provided
+    playwright = mock_sync_playwright.return_value.__enter__.return_value
+    playwright.firefox.launch.assert_called_with(headless=True, channel="firefox-beta")
+    playwright.firefox.launch.return_value.new_context.assert_called_with(
+        locale="en-GB",
+        viewport={"width": 390, "height": 844},
+        base_url="https://example.com",
+        storage_state={"cookies": []}
+    )
+
+
+@patch('utils.axe.sync_playwright')
+@patch('utils.axe.pytest_playwright_axe.Axe')
+def test_run_list_with_workers_strict_mode(
+    mock_axe_class: MagicMock,
+    mock_sync_playwright: MagicMock,
+    mock_page: Mock
+) -> None:
+    """Test run_list with workers raises on violations in strict mode."""
+    mock_axe_class.return_value.run_list.side_effect = (
+        lambda page, page_list, **kwargs: {
+            entry: {"url": entry, "violations": [{"id": "rule"}]}
+            for entry in page_list
+        }
+    )
+    mock_page.context.browser.browser_type.name = "chromium"
+
+    with pytest.raises(
+        pytest_playwright_axe.AxeAccessibilityException,
+        match=r"detected on page: /page1"
+    ):
+        Axe.run_list(
+            page=mock_page,
+            page_list=["/page1", "/page2"],  # pyright: ignore[reportArgumentType]
+            workers=2,
+            strict_mode=True
+        )
+
+    with pytest.raises(
+        pytest_playwright_axe.AxeAccessibilityException,
+        match=r"cannot be scanned with workers > 1"
+    ):
+        Axe.run_list(
+            page=mock_page,
+            page_list=[{"url": "/page1"}],  # pyright: ignore[reportArgumentType]
+            workers=2
+        )
+
+
+@patch('utils.axe.pytest_playwright_axe.Axe')
+def test_run_with_cache(
+    mock_axe_class: MagicMock,
+    mock_page: Mock,
+    mock_axe_instance: MagicMock,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test run method only executes axe-core once for the same page state."""
+    mock_axe_class.return_value = mock_axe_instance
+    mock_page.url = "https://example.com/dashboard"
+    mock_page.content.return_value = "<html><body>Dashboard</body></html>"
+    monkeypatch.setattr(Axe, "result_cache", AxeResultCache())
+
+    first_result = Axe.run(page=mock_page, use_cache=True)
+    second_result = Axe.run(page=mock_page, use_cache=True)
+
+    assert first_result == second_result
+    mock_axe_instance.run.assert_called_once()
+    assert Axe.result_cache.hits == 1
+    assert Axe.result_cache.misses == 1
+
+    # A change to the DOM or options should trigger a new scan
+    mock_page.content.return_value = "<html><body>Updated</body></html>"
+    Axe.run(page=mock_page, use_cache=True)
+    Axe.run(page=mock_page, options="{}", use_cache=True)
+    assert mock_axe_instance.run.call_count == 3
+
+
+def test_result_cache_persistence_and_eviction(tmp_path: Path) -> None:
+    """Test the result cache persists to disk and evicts old entries."""
+    cache = AxeResultCache(max_entries=1, cache_directory=tmp_path, max_disk_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.put(key, {"url": key, "violations": []})
+
+    assert len(cache._entries) == 1
+    assert len(list(tmp_path.glob("*.json"))) <= 2
+
+    new_cache = AxeResultCache(cache_directory=tmp_path)
+    assert new_cache.get("c") == {"url": "c", "violations": []}
+    assert new_cache.get("missing") is None
+    assert (new_cache.hits, new_cache.misses) == (1, 1)
+
+
+def test_result_cache_key_includes_axe_version(mock_page: Mock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the result cache key changes when pytest-playwright-axe (and so axe-core) is upgraded."""
+    mock_page.url = "https://example.com/dashboard"
+    mock_page.content.return_value = "<html><body>Dashboard</body></html>"
+    key = AxeResultCache.key_for(mock_page)
+    assert AxeResultCache.key_for(mock_page) == key
+
+    monkeypatch.setattr(utils.axe, "AXE_PACKAGE_VERSION", "99.0.0")
+    assert AxeResultCache.key_for(mock_page) != key
+
+
+def test_run_with_registered_context(mock_page: Mock) -> None:
+    """Test run method does not inject axe-core for a registered context."""
+    Axe.register_context(mock_page.context)
+    Axe.register_context(mock_page.context)
+    mock_page.context.add_init_script.assert_called_once()
+    assert (
+        mock_page.context.add_init_script.call_args.kwargs["path"].name ==
+        "axe.js"
+    )
+
+    axe_paths_used = []
+    with patch.object(
+        pytest_playwright_axe.Axe,
+        "run",
+        autospec=True,
+        side_effect=lambda self, *args, **kwargs: (
+            axe_paths_used.append(self.axe_path) or {"violations": []}
+        )
+    ):
+        # axe-core already present in the page
+        mock_page.evaluate.return_value = True
+        Axe.run(page=mock_page)
+        # axe-core not yet present (e.g. page loaded before registration)
+        mock_page.evaluate.return_value = False
+        Axe.run(page=mock_page)
+
+    assert axe_paths_used[0] == AXE_REGISTERED_SCRIPT_PATH
+    assert axe_paths_used[1].name == "axe.js"
+
+
+def test_run_with_background_reports(mock_page: Mock, tmp_path: Path) -> None:
+    """Test run method generates reports in the background when requested."""
+    axe_response = {
+        "url": "https://example.com/page",
+        "violations": [],
+        "passes": [],
+        "inapplicable": [],
+        "incomplete": [],
+    }
+    mock_page.evaluate.return_value = axe_response
+
+    with patch.object(
+        pytest_playwright_axe.Axe, "_create_html_report", autospec=True
+    ) as mock_html_report:
+        result = Axe.run(
+            page=mock_page,
+            filename="background",
+            output_directory=str(tmp_path),
+            background_reports=True
+        )
+        result["violations"].append("changed after return")
+        assert Axe.flush_reports() == []
+
+    assert tmp_path.joinpath("background.json").is_file()
+    assert "changed after return" not in tmp_path.joinpath(
+        "background.json"
+    ).read_text()
+    mock_html_report.assert_called_once()
+
+    # Report failures are returned when flushing
+    with patch.object(
+        pytest_playwright_axe.Axe,
+        "_create_html_report",
+        autospec=True,
+        side_effect=OSError("disk full")
+    ):
+        Axe.run(
+            page=mock_page,
+            filename="failure",
+            output_directory=str(tmp_path),
+            json_report_generated=False,
+            background_reports=True
+        )
+        errors = Axe.flush_reports()
+
+    assert errors == ["Failed to generate Axe report for [failure]: disk full"]
+
+
+def test_violation_index_and_summary(tmp_path: Path) -> None:
+    """Test the violation index deduplicates violations across pages."""
+    def result(url: str) -> dict:
+        return {
+            "url": url,
+            "violations": [
+                {
+                    "id": "color-contrast",
+                    "impact": "serious",
+                    "help": "Elements must meet contrast thresholds",
+                    "helpUrl": "https://example.com/color-contrast",
+                    "nodes": [{"target": ["header > a"]}]
+                },
+                {
+                    "id": "image-alt",
+                    "impact": "critical",
+                    "help": "Images must have alternate text",
+                    "helpUrl": "https://example.com/image-alt",
+                    "nodes": [{"target": [["#frame", "img"]]}]
+                }
+            ]
+        }
+
+    index = AxeViolationIndex(enabled=True)
+    index.add("/page1", result("/page1"))
+    index.add("/page2", result("/page2"))
+    index.add("/page2", result("/page2"))
+
+    violations = index.violations()
+    assert len(violations) == 2
+    assert violations[0]["id"] == "color-contrast"
+    assert violations[0]["selector"] == "header > a"
+    assert violations[0]["pages"] == ["/page1", "/page2"]
+    assert violations[1]["selector"] == "#frame > img"
+
+    index.write_summary(tmp_path)
+    summary = json.loads(tmp_path.joinpath("axe-summary.json").read_text())
+    assert summary["pagesScanned"] == 2
+    assert summary["uniqueViolations"] == 2
+    assert "color-contrast" in tmp_path.joinpath(
+        "axe-summary.html"
+    ).read_text()
+
+
+def test_violation_index_merge(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the violation indexes from pytest-xdist workers are merged into a single summary."""
+    def result(url: str, selector: str) -> dict:
+        return {
+            "url": url,
+            "violations": [
+                {"id": "color-contrast", "impact": "serious", "nodes": [{"target": ["header > a"]}]},
+                {"id": "image-alt", "impact": "critical", "nodes": [{"target": [selector]}]}
+            ]
+        }
+
+    worker_one = AxeViolationIndex(enabled=True)
+    worker_one.add("/page1", result("/page1", "#logo"))
+    worker_two = AxeViolationIndex(enabled=True)
+    worker_two.add("/page2", result("/page2", "#logo"))
+    worker_two.add("/page3", result("/page3", "#banner"))
+
+    # Each worker passes its index to the controller instead of writing a summary
+    import conftest
+    mock_write_summary = Mock()
+    monkeypatch.setattr(Axe, "write_summary", mock_write_summary)
+    worker_outputs = []
+    for worker in [worker_one, worker_two]:
+        monkeypatch.setattr(Axe, "violation_index", worker)
+        worker_session = Mock(config=Mock(workeroutput={}))
+        conftest.pytest_sessionfinish(worker_session, 0)
+        worker_outputs.append(worker_session.config.workeroutput)
+    mock_write_summary.assert_not_called()
+
+    # The controller merges the indexes as each worker finishes, then writes a single summary
+    monkeypatch.setattr(Axe, "violation_index", AxeViolationIndex(enabled=True))
+    for workeroutput in worker_outputs + [{}]:
+        conftest.pytest_testnodedown(Mock(workeroutput=workeroutput), None)
+    controller_config = Mock(spec=["getoption"])
+    controller_config.getoption.return_value = str(tmp_path / "test-results")
+    conftest.pytest_sessionfinish(Mock(config=controller_config), 0)
+    mock_write_summary.assert_called_once_with()
+
+    Axe.violation_index.write_summary(tmp_path)
+    summary = json.loads(tmp_path.joinpath("axe-summary.json").read_text())
+    assert summary["pagesScanned"] == 3
+    assert [
+        (violation["id"], violation["selector"], violation["pages"]) for violation in summary["violations"]
+    ] == [
+        ("color-contrast", "header > a", ["/page1", "/page2", "/page3"]),
+        ("image-alt", "#logo", ["/page1", "/page2"]),
+        ("image-alt", "#banner", ["/page3"]),
+    ]
+
+
+@patch('utils.axe.pytest_playwright_axe.Axe')
+def test_run_with_summary_only(
+    mock_axe_class: MagicMock,
+    mock_page: Mock,
+    mock_axe_instance: MagicMock,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test run method skips page reports and still applies strict mode."""
+    mock_axe_class.return_value = mock_axe_instance
+    mock_axe_instance.run.return_value = {
+        "url": "https://example.com",
+        "violations": [{"id": "rule", "nodes": [{"target": ["#main"]}]}]
+    }
+    monkeypatch.setattr(Axe, "violation_index", AxeViolationIndex())
+    Axe.enable_summary(skip_page_reports=True)
+
+    with pytest.raises(pytest_playwright_axe.AxeAccessibilityException):
+        Axe.run(page=mock_page, filename="home", strict_mode=True)
+
+    run_kwargs = mock_axe_instance.run.call_args.kwargs
+    assert run_kwargs["strict_mode"] is False
+    assert run_kwargs["html_report_generated"] is False
+    assert run_kwargs["json_report_generated"] is False
+    assert Axe.violation_index.violations()[0]["pages"] == ["home"]
+
+
+def test_baseline_check_and_write(tmp_path: Path) -> None:
+    """Test the baseline only fails on violations not in the baseline."""
+    def result(selector: str) -> dict:
+        return {
+            "url": "https://test.example.com/home?query=1",
+            "violations": [
+                {"id": "color-contrast", "nodes": [{"target": [selector]}]}
+            ]
+        }
+
+    baseline_path = tmp_path / "axe-baseline.json"
+    run_id = "test-run"
+
+    # Regenerate the baseline, merging the results of two processes
+    AxeBaseline(baseline_path).check(
+        {"https://test.example.com/home": result("li:nth-child(2) > a")},
+        update=True
+    )
+    first_process = AxeBaseline(baseline_path)
+    first_process.check({"/home": result("li:nth-child(2) > a")}, update=True)
+    first_process.write(run_id)
+    second_process = AxeBaseline(baseline_path)
+    second_process.check({"/home": result("#footer  a")}, update=True)
+    second_process.write(run_id)
+    assert len(json.loads(baseline_path.read_text())["fingerprints"]) == 2
+
+    # Known violations pass, regardless of environment or list position
+    baseline = AxeBaseline(baseline_path)
+    baseline.check({"https://prod.example.com/home": result("li:nth-child(5) > a")})
+    baseline.check({"/home": result("#footer a")})
+
+    with pytest.raises(
+        pytest_playwright_axe.AxeAccessibilityException,
+        match=r"1 Axe Accessibility Violation\(s\) not in baseline"
+    ):
+        baseline.check({"/home": result("#new-element")})
+
+    # A new run replaces the fingerprints for the pages it scanned, and keeps
+    # the fingerprints for any other pages
+    other_page = AxeBaseline(baseline_path)
+    other_page.check({"/about": result("#header")}, update=True)
+    other_page.write("other-page-run")
+    assert len(json.loads(baseline_path.read_text())["fingerprints"]) == 3
+
+    new_run = AxeBaseline(baseline_path)
+    new_run.check({"https://test.example.com/home": result("#new-element")}, update=True)
+    new_run.write("new-run")
+    descriptions = json.loads(baseline_path.read_text())["fingerprints"].values()
+    assert sorted(descriptions) == [
+        "color-contrast | #header | /about",
+        "color-contrast | #new-element | /home",
+    ]
+
+    # A page scanned with no violations has its fingerprints removed
+    fixed_page = AxeBaseline(baseline_path)
+    fixed_page.check({"/about": {"url": "/about", "violations": []}}, update=True)
+    fixed_page.write("fixed-page-run")
+    assert list(json.loads(baseline_path.read_text())["fingerprints"].values()) == [
+        "color-contrast | #new-element | /home"
+    ]
+
+
+@patch('utils.axe.pytest_playwright_axe.Axe')
+def test_run_with_baseline(
+    mock_axe_class: MagicMock,
+    mock_page: Mock,
+    mock_axe_instance: MagicMock,
+    tmp_path: Path
+) -> None:
+    """Test run method checks violations against the baseline provided."""
+    mock_axe_class.return_value = mock_axe_instance
+    mock_axe_instance.run.return_value = {
+        "url": "https://example.com/home",
+        "violations": [{"id": "rule", "nodes": [{"target": ["#main"]}]}]
+    }
+    fingerprint, description = AxeBaseline.fingerprint(
+        "rule", "#main", "/home"
+    )
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(
+        json.dumps({"fingerprints": {fingerprint: description}})
+    )
+
+    Axe.run(page=mock_page, strict_mode=True, baseline_file=baseline_path)
+    assert mock_axe_instance.run.call_args.kwargs["strict_mode"] is False
+
+    mock_axe_instance.run.return_value["violations"][0]["id"] = "new-rule"
+    with pytest.raises(pytest_playwright_axe.AxeAccessibilityException):
+        Axe.run(page=mock_page, baseline_file=baseline_path)
+
+
+@patch('utils.axe.pytest_playwright_axe.Axe')
+def test_run_incremental(
+    mock_axe_class: MagicMock,
+    mock_page: Mock,
+    mock_axe_instance: MagicMock
+) -> None:
+    """Test run method merges incremental scans of changed regions."""
+    mock_axe_class.return_value = mock_axe_instance
+    full_result = {
+        "url": "https://example.com",
+        "violations": [
+            {"id": "image-alt", "nodes": [{"target": ["#panel > img"]}]}
+        ],
+        "passes": [
+            {"id": "color-contrast", "nodes": [{"target": ["header"]}]}
+        ],
+        "incomplete": [],
+        "inapplicable": [{"id": "label", "nodes": []}]
+    }
+    region_result = {
+        "url": "https://example.com",
+        "violations": [
+            {"id": "label", "nodes": [{"target": ["#modal input"]}]}
+        ],
+        "passes": [
+            {"id": "image-alt", "nodes": [{"target": ["#panel > img"]}]}
+        ],
+        "incomplete": [],
+        "inapplicable": []
+    }
+    mock_axe_instance.run.side_effect = [full_result, region_result]
+    changed_regions = [2, 0]
+
+    def evaluate(script: str, *args: object) -> object:
+        if script == utils.axe.INCREMENTAL_MARK_SCRIPT:
+            return changed_regions.pop(0)
+        if script == utils.axe.INCREMENTAL_STALE_SCRIPT:
+            return [selector for selector in args[0] if "#panel" in selector]
+        return None
+
+    mock_page.evaluate.side_effect = evaluate
+
+    # First scan covers the full page and installs the observer
+    assert Axe.run(page=mock_page, incremental=True) == full_result
+    mock_page.evaluate.assert_called_with(utils.axe.INCREMENTAL_OBSERVE_SCRIPT)
+
+    # Second scan only covers the changed regions, and is merged
+    merged_result = Axe.run(page=mock_page, incremental=True)
+    region_kwargs = mock_axe_instance.run.call_args.kwargs
+    assert region_kwargs["context"] == utils.axe.INCREMENTAL_CONTEXT
+    assert region_kwargs["html_report_generated"] is False
+    assert [rule["id"] for rule in merged_result["violations"]] == ["label"]
+    assert [rule["id"] for rule in merged_result["passes"]] == [
+        "color-contrast", "image-alt"
+    ]
+    assert merged_result["inapplicable"] == []
+    mock_axe_instance._create_html_report.assert_called_once_with(
+        merged_result, ""
+    )
+
+    # Third scan has no changes, so returns the merged result without scanning
+    assert Axe.run(page=mock_page, incremental=True) == merged_result
+    assert mock_axe_instance.run.call_count == 2
+
+    with pytest.raises(pytest_playwright_axe.AxeAccessibilityException):
+        Axe.run(page=mock_page, context="{}", incremental=True)
+
+
+def test_axe_compat_attributes_exist() -> None:
+    """Test the pytest-playwright-axe internals this utility depends on are still present."""
+    runner = pytest_playwright_axe.Axe()
+    missing = [
+        attribute for attribute in _AxeCompat.REQUIRED_ATTRIBUTES
+        if not hasattr(runner, attribute)
+    ]
+    assert not missing, (
+        f"pytest-playwright-axe no longer provides {missing}, so utils/axe.py "
+        "needs updating before the pinned version in requirements.txt is changed"
+    )
+    assert Path(_AxeCompat.axe_script_path()).is_file()
+
+    # The overrides must accept the same arguments pytest-playwright-axe calls them with
+    for method in _AxeCompat.OVERRIDDEN_METHODS:
+        assert (
+            inspect.signature(getattr(pytest_playwright_axe.Axe, method)) ==
+            inspect.signature(getattr(utils.axe._BlueprintAxe, method))
+        )
@@ -0,0 +1,89 @@
+import pytest
+import pytest_playwright_axe
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from utils.axe import Axe, AxeViolationIndex
+from utils.axe_offline import AxeOffline
+
+
+pytestmark = [pytest.mark.utils]
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path: Path) -> Path:
+    """Create a directory of HTML snapshots."""
+    tmp_path.joinpath("sub").mkdir()
+    for file in ["home.html", "sub/search.html", "about.html"]:
+        tmp_path.joinpath(file).write_text("<html></html>")
+    tmp_path.joinpath("notes.txt").write_text("not a snapshot")
+    return tmp_path
+
+
+def test_snapshot_files(snapshot_dir: Path) -> None:
+    """Test snapshots are found from a directory or glob pattern."""
+    assert list(AxeOffline._snapshot_files(snapshot_dir).keys()) == [
+        "about.html",
+        "home.html",
+        "sub/search.html"
+    ]
+
+    glob_files = AxeOffline._snapshot_files(str(snapshot_dir / "**" / "s*.html"))
+    assert list(glob_files.values()) == [
+        snapshot_dir.joinpath("sub/search.html").resolve()
+    ]
+
+
+@patch('utils.axe_offline._scan_snapshots')
+def test_run_snapshots(
+    mock_scan_snapshots: MagicMock,
+    snapshot_dir: Path
+) -> None:
+    """Test run_snapshots returns results keyed by snapshot."""
+    mock_scan_snapshots.side_effect = lambda snapshots, browser_name, scan_args: {
+        key: {"url": path.as_uri(), "violations": []}
+        for key, path in reversed(snapshots.items())
+    }
+
+    results = AxeOffline.run_snapshots(snapshot_dir, workers=1)
+
+    assert list(results.keys()) == [
+        "about.html",
+        "home.html",
+        "sub/search.html"
+    ]
+    scan_args = mock_scan_snapshots.call_args.args[2]
+    assert scan_args["options"] == pytest_playwright_axe.OPTIONS_WCAG_22AA
+    assert scan_args["html_report_generated"] is True
+
+    mock_scan_snapshots.side_effect = lambda snapshots, browser_name, scan_args: {
+        key: {"url": path.as_uri(), "violations": [{"id": "rule"}]}
+        for key, path in snapshots.items()
+    }
+    with pytest.raises(pytest_playwright_axe.AxeAccessibilityException):
+        AxeOffline.run_snapshots(snapshot_dir, workers=1, strict_mode=True)
+
+    assert AxeOffline.run_snapshots(snapshot_dir / "missing", workers=1) == {}
+
+
+@patch('utils.axe.pytest_playwright_axe.Axe')
+@patch('utils.axe_offline.sync_playwright')
+def test_run_snapshots_indexes_once(
+    mock_sync_playwright: MagicMock,
+    mock_axe_class: MagicMock,
+    snapshot_dir: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test run_snapshots adds each snapshot to the violation index once, keyed by snapshot."""
+    mock_axe_class.return_value.run.return_value = {
+        "url": "file:///snapshot.html",
+        "violations": [{"id": "rule", "nodes": [{"target": ["#main"]}]}]
+    }
+    monkeypatch.setattr(Axe, "violation_index", AxeViolationIndex())
+    monkeypatch.setattr(Axe, "register_context", MagicMock())
+    Axe.enable_summary()
+
+    AxeOffline.run_snapshots(snapshot_dir, workers=1)
+
+    assert Axe.violation_index.pages_scanned == {"about.html", "home.html", "sub/search.html"}
+    assert Axe.violation_index.violations()[0]["pages"] == ["about.html", "home.html", "sub/search.html"]
+    assert mock_axe_class.return_value.run.call_args.kwargs["strict_mode"] is False
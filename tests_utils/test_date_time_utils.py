@@ -1,6 +1,9 @@
 import pytest
 import utils.date_time_utils
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from playwright.sync_api import sync_playwright
+from unittest.mock import Mock
+from utils.date_time_utils import DateTimeUtils, DateTimeUtilsException
 
 
 pytestmark = [pytest.mark.utils]
@@ -40,3 +43,94 @@ def test_get_a_day_of_week():
     date = datetime(2023, 11, 8)
     day_of_week = dtu.get_a_day_of_week(date)
     assert day_of_week in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def test_is_working_day():
+    assert DateTimeUtils.is_working_day(date(2024, 12, 24))
+    assert not DateTimeUtils.is_working_day(date(2024, 12, 25))  # Christmas Day
+    assert not DateTimeUtils.is_working_day(datetime(2024, 12, 28, 10, 30))  # Saturday
+    assert not DateTimeUtils.is_working_day(date(2022, 9, 19))  # One-off bank holiday
+
+    with pytest.raises(DateTimeUtilsException, match=r'The date 01/01/1990 is outside the bank holiday calendar'):
+        DateTimeUtils.is_working_day(date(1990, 1, 1))
+
+
+def test_add_working_days():
+    # Skips the Christmas bank holidays and the weekend
+    assert DateTimeUtils.add_working_days(date(2024, 12, 24), 1) == date(2024, 12, 27)
+    assert DateTimeUtils.add_working_days(date(2024, 12, 24), 2) == date(2024, 12, 30)
+    assert DateTimeUtils.add_working_days(datetime(2024, 12, 27, 9, 15), -1) == datetime(2024, 12, 24, 9, 15)
+    # Starting from a non-working day
+    assert DateTimeUtils.add_working_days(date(2024, 12, 28), 1) == date(2024, 12, 30)
+    assert DateTimeUtils.add_working_days(date(2024, 12, 28), -1) == date(2024, 12, 27)
+    assert DateTimeUtils.add_working_days(date(2024, 12, 28), 0) == date(2024, 12, 28)
+
+    with pytest.raises(DateTimeUtilsException, match=r'Adding 5000 working days to 24/12/2024 is outside'):
+        DateTimeUtils.add_working_days(date(2024, 12, 24), 5000)
+
+
+def test_working_days_between():
+    assert DateTimeUtils.working_days_between(date(2024, 12, 24), date(2024, 12, 30)) == 2
+    assert DateTimeUtils.working_days_between(date(2024, 12, 30), date(2024, 12, 24)) == -2
+    assert DateTimeUtils.working_days_between(date(2024, 1, 1), date(2024, 12, 31)) == 254
+
+
+def test_clock_control():
+    page = Mock()
+    DateTimeUtils.install_clock(page, datetime(2024, 1, 1, 9, 0))
+    page.clock.install.assert_called_once_with(time=datetime(2024, 1, 1, 9, 0))
+
+    DateTimeUtils.fast_forward_clock(page, timedelta(minutes=5))
+    page.clock.fast_forward.assert_called_once_with(300000)
+    DateTimeUtils.run_clock_for(page, timedelta(seconds=1.5))
+    page.clock.run_for.assert_called_once_with(1500)
+    DateTimeUtils.freeze_clock(page, datetime(2024, 1, 1, 10, 0))
+    page.clock.pause_at.assert_called_once_with(datetime(2024, 1, 1, 10, 0))
+    DateTimeUtils.resume_clock(page)
+    page.clock.resume.assert_called_once()
+    page.clock.install.assert_called_once()
+
+    # The current datetime is taken from the page's virtual clock
+    page.evaluate.return_value = datetime(2024, 1, 1, 10, 5).timestamp() * 1000
+    assert DateTimeUtils.page_datetime(page) == datetime(2024, 1, 1, 10, 5)
+    assert DateTimeUtils.current_datetime(page=page) == "01/01/2024 10:05"
+    assert DateTimeUtils.current_datetime(page=Mock()) == datetime.now().strftime("%d/%m/%Y %H:%M")
+
+
+def test_clock_installed_when_needed():
+    page = Mock()
+    page.evaluate.return_value = datetime(2024, 1, 1, 9, 0).timestamp() * 1000
+    DateTimeUtils.freeze_clock(page)
+    page.clock.install.assert_called_once()
+    page.clock.pause_at.assert_called_once_with(datetime(2024, 1, 1, 9, 0, 1))
+
+
+def test_freeze_clock_in_browser() -> None:
+    # Uses its own Playwright instance, so no event loop is left running for the tests that follow
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        try:
+            page = browser.new_page()
+            page.set_content("<p>Frozen clock</p>")
+            before_freeze = datetime.now()
+
+            # Freezing without a datetime pauses the running clock just ahead of the page's current datetime
+            DateTimeUtils.freeze_clock(page)
+            frozen_datetime = DateTimeUtils.page_datetime(page)
+            assert frozen_datetime > before_freeze
+            page.wait_for_timeout(200)
+            assert DateTimeUtils.page_datetime(page) == frozen_datetime
+        finally:
+            browser.close()
+
+
+def test_clock_shared_by_context():
+    page = Mock()
+    DateTimeUtils.install_clock(page, datetime(2024, 1, 1, 9, 0))
+
+    # Another page in the same browser context already uses the installed clock
+    second_page = Mock(context=page.context)
+    second_page.evaluate.return_value = datetime(2024, 1, 1, 9, 0).timestamp() * 1000
+    DateTimeUtils.freeze_clock(second_page)
+    second_page.clock.install.assert_not_called()
+    assert DateTimeUtils.current_datetime(page=second_page) == "01/01/2024 09:00"
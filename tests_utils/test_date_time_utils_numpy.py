@@ -0,0 +1,21 @@
+import pytest
+from datetime import date
+from utils.date_time_utils import DateTimeUtils, DateTimeUtilsException
+
+# add_working_days_array() needs numpy, which is only installed from requirements-dev.txt
+np = pytest.importorskip("numpy")
+
+
+pytestmark = [pytest.mark.utils]
+
+def test_add_working_days_array():
+    dates = [date(2024, 12, 24), date(2024, 12, 27), date(2024, 12, 28), date(2025, 3, 3)]
+    days = [1, -1, 0, 35]
+    expected = [DateTimeUtils.add_working_days(d, n) for d, n in zip(dates, days)]
+    assert DateTimeUtils.add_working_days_array(dates, days).tolist() == expected
+    assert DateTimeUtils.add_working_days_array(np.array(dates, dtype="datetime64[D]"), 1).tolist() == [
+        DateTimeUtils.add_working_days(d, 1) for d in dates
+    ]
+
+    with pytest.raises(DateTimeUtilsException, match=r'outside the bank holiday calendar'):
+        DateTimeUtils.add_working_days_array(dates, 5000)
@@ -1,7 +1,14 @@
 import pytest
+import json
 import os
+import shutil
+import zipfile
 from pathlib import Path
-from utils.jira_confluence_util import JiraConfluenceUtil
+from unittest.mock import Mock
+import utils.jira_confluence_util
+import requests
+from utils.artifact_manifest import ArtifactManifest
+from utils.jira_confluence_util import JiraConfluenceUtil, JiraRequestScheduler
 
 
 pytestmark = [pytest.mark.utils]
@@ -11,6 +18,13 @@ TEST_RESULTS_DIR = (
 )
 
 
+@pytest.fixture(autouse=True)
+def upload_manifest(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    manifest_path = tmp_path / "manifest.json"
+    monkeypatch.setattr(utils.jira_confluence_util, "UPLOAD_MANIFEST_PATH", manifest_path)
+    return manifest_path
+
+
 @pytest.fixture(autouse=True)
 def set_env_vars(monkeypatch) -> None:
     monkeypatch.setattr("dotenv.load_dotenv", lambda *a, **kw: None)
@@ -89,3 +103,516 @@ def test_get_files_to_upload_to_jira() -> None:
     assert len(path_list) == len(test_files)
     for test_file in test_files:
         assert test_file in path_list
+
+
+def test_upload_files_to_jira_in_parallel(capsys: pytest.CaptureFixture) -> None:
+    """Test that parallel uploads keep the original file order and report failures"""
+    test_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    files_to_attach = test_util._get_files_to_upload_to_jira(True, True, True, True)
+    issue_data = {"key": "TEST-1", "fields": {"attachment": []}}
+
+    def post(url: str, headers: dict, files: dict) -> None:
+        if files["file"][0] == "csv_test.csv":
+            raise Exception("Upload failed")
+
+    test_util.jira_client = Mock()
+    test_util.jira_client.post.side_effect = post
+    uploaded_files = test_util._upload_files_to_jira(issue_data, files_to_attach, True, parallel=4)
+
+    assert uploaded_files == [
+        file_info["default_name"] for file_info in files_to_attach if file_info["default_name"] != "csv_test.csv"
+    ]
+    assert test_util.jira_client.post.call_count == len(files_to_attach)
+    output = capsys.readouterr().out
+    assert f"[{len(files_to_attach)}/{len(files_to_attach)}]" in output
+    assert "ERROR: Failed to upload csv_test.csv to TEST-1, error: Upload failed" in output
+    assert "ERROR: 1 file(s) failed to upload to TEST-1: csv_test.csv" in output
+    assert not TEST_RESULTS_DIR.joinpath("temp").exists()
+
+
+def test_upload_file_to_jira_uses_original_file() -> None:
+    """Test that files are uploaded from their original location using the filename to use"""
+    test_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    file_info = test_util._generate_file_data_dict([TEST_RESULTS_DIR.joinpath("test-sub-dir/trace.zip")])[0]
+    test_util.jira_client = Mock()
+    test_util.jira_client.resource_url.return_value = "https://jira/rest/api/2/issue"
+
+    def post(url: str, headers: dict, files: dict) -> None:
+        filename, attachment = files["file"]
+        assert filename == "20240101_test-sub-dir_trace.zip"
+        assert Path(attachment.name) == TEST_RESULTS_DIR.joinpath("test-sub-dir/trace.zip")
+
+    test_util.jira_client.post.side_effect = post
+    assert test_util._upload_file_to_jira("TEST-1", file_info, "20240101_test-sub-dir_trace.zip") is None
+    assert test_util.jira_client.post.call_args.args[0] == "https://jira/rest/api/2/issue/TEST-1/attachments"
+    assert not TEST_RESULTS_DIR.joinpath("temp").exists()
+
+
+def test_incremental_upload_skips_unchanged_files(upload_manifest: Path) -> None:
+    """Test that files already uploaded with the same content are skipped in incremental mode"""
+    test_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    test_util.jira_client = Mock()
+    issue_data = {"key": "TEST-1", "fields": {"attachment": []}}
+
+    all_files = test_util._get_files_to_upload_to_jira(True, True, True, True)
+    all_paths = [file_info["path"] for file_info in all_files]
+    assert [f["path"] for f in test_util._get_files_to_upload_to_jira(True, True, True, True, issue_data)] == all_paths
+
+    # Uploads are only recorded in the upload manifest in incremental mode
+    test_util._upload_files_to_jira(issue_data, all_files, True)
+    assert not upload_manifest.exists()
+
+    uploaded_files = test_util._upload_files_to_jira(issue_data, all_files, True, incremental=True)
+    manifest = json.loads(upload_manifest.read_text())
+    assert set(manifest["TEST-1"]) == {file_info["local_file_path"] for file_info in all_files}
+
+    # Once uploaded, only files missing from the ticket or with different content are returned
+    issue_data["fields"]["attachment"] = [
+        {"filename": filename, "size": manifest["TEST-1"][file_info["local_file_path"]]["size"]}
+        for filename, file_info in zip(uploaded_files, all_files)
+        if file_info["local_file_path"] != "report.html"
+    ]
+    manifest["TEST-1"]["csv_test.csv"]["sha256"] = "changed"
+    upload_manifest.write_text(json.dumps(manifest))
+
+    changed_files = test_util._get_files_to_upload_to_jira(True, True, True, True, issue_data)
+    assert {file_info["local_file_path"] for file_info in changed_files} == {"report.html", "csv_test.csv"}
+
+    # Other tickets are unaffected
+    other_issue_data = {"key": "TEST-2", "fields": {"attachment": issue_data["fields"]["attachment"]}}
+    assert [f["path"] for f in test_util._get_files_to_upload_to_jira(True, True, True, True, other_issue_data)] == all_paths
+
+
+def test_oversized_files_are_shrunk(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that files too big for Jira are recompressed, or split into parts if still too big"""
+    monkeypatch.setattr(utils.jira_confluence_util, "JIRA_FILE_SIZE_LIMIT", 20000)
+    trace_dir = tmp_path.joinpath("test-trace")
+    trace_dir.mkdir()
+    # A compressible zip that fits once recompressed, and an incompressible zip that needs splitting
+    with zipfile.ZipFile(trace_dir.joinpath("small.zip"), "w", zipfile.ZIP_STORED) as trace:
+        trace.writestr("trace.trace", "a" * 50000)
+    with zipfile.ZipFile(trace_dir.joinpath("large.zip"), "w", zipfile.ZIP_STORED) as trace:
+        trace.writestr("trace.trace", os.urandom(50000))
+
+    test_util = JiraConfluenceUtil(tmp_path)
+    # Oversized files are skipped unless shrinking is requested
+    assert test_util._get_files_to_upload_to_jira(False, True, False, False) == []
+    assert test_util.upload_temp_dir is None
+
+    files = test_util._get_files_to_upload_to_jira(False, True, False, False, shrink_oversized_files=True)
+    try:
+        names = sorted(file_info["default_name"] for file_info in files)
+        assert names == ["test-trace_large.zip.001", "test-trace_large.zip.002", "test-trace_large.zip.003", "test-trace_small.zip"]
+        assert all(Path(file_info["path"]).stat().st_size < 20000 for file_info in files)
+
+        small = next(file_info for file_info in files if file_info["default_name"] == "test-trace_small.zip")
+        with zipfile.ZipFile(small["path"]) as trace:
+            assert trace.read("trace.trace") == b"a" * 50000
+
+        parts = sorted((f for f in files if ".zip.0" in f["default_name"]), key=lambda f: f["default_name"])
+        joined = tmp_path.joinpath("joined.zip")
+        joined.write_bytes(b"".join(Path(f["path"]).read_bytes() for f in parts))
+        with zipfile.ZipFile(joined) as joined_trace, zipfile.ZipFile(trace_dir.joinpath("large.zip")) as trace:
+            assert joined_trace.read("trace.trace") == trace.read("trace.trace")
+    finally:
+        test_util._remove_upload_temp_dir()
+
+    assert not any(Path(file_info["path"]).exists() for file_info in files)
+    assert test_util.upload_temp_dir is None
+
+
+class FakeClock:
+    """A clock that advances when slept on, so scheduler timings can be tested instantly"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(utils.jira_confluence_util.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(utils.jira_confluence_util.time, "sleep", clock.sleep)
+    monkeypatch.setattr(JiraConfluenceUtil, "request_scheduler", JiraRequestScheduler())
+    return clock
+
+
+def http_error(status_code: int, headers: dict | None = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"HTTP {status_code}", response=response)
+
+
+def test_request_scheduler_retries(fake_clock: FakeClock) -> None:
+    """Test that retryable errors are retried, honouring Retry-After when provided"""
+    scheduler = JiraRequestScheduler(base_delay=1, max_delay=8)
+    request = Mock(side_effect=[http_error(429, {"Retry-After": "7"}), http_error(503), requests.ConnectionError(), "ok"])
+    assert scheduler.call(request, "TEST-1") == "ok"
+    assert request.call_count == 4
+    request.assert_called_with("TEST-1")
+
+    assert fake_clock.sleeps[0] == 7
+    assert 0 <= fake_clock.sleeps[1] <= 2
+    assert 0 <= fake_clock.sleeps[2] <= 4
+
+    # Non-retryable errors are raised straight away
+    request = Mock(side_effect=http_error(404))
+    with pytest.raises(requests.HTTPError):
+        scheduler.call(request)
+    assert request.call_count == 1
+
+    # Retryable errors are raised once the retries are used up
+    scheduler = JiraRequestScheduler(max_retries=2)
+    request = Mock(side_effect=http_error(500))
+    with pytest.raises(requests.HTTPError):
+        scheduler.call(request)
+    assert request.call_count == 3
+
+
+@pytest.mark.parametrize("error", [http_error(500), http_error(503), requests.ConnectionError(), requests.Timeout()])
+def test_request_scheduler_does_not_repeat_non_idempotent_requests(fake_clock: FakeClock, error: Exception) -> None:
+    """Test that requests that are not idempotent are not retried if Jira may have processed them"""
+    scheduler = JiraRequestScheduler()
+    request = Mock(side_effect=[error, "ok"])
+    with pytest.raises(type(error)):
+        scheduler.call(request, idempotent=False)
+    assert request.call_count == 1
+
+
+def test_request_scheduler_retries_unprocessed_non_idempotent_requests(fake_clock: FakeClock) -> None:
+    """Test that requests that are not idempotent are retried when Jira has not processed them"""
+    scheduler = JiraRequestScheduler()
+    request = Mock(side_effect=[http_error(429), http_error(503, {"Retry-After": "5"}), "ok"])
+    assert scheduler.call(request, "TEST-1", idempotent=False) == "ok"
+    assert request.call_count == 3
+    request.assert_called_with("TEST-1")
+
+
+def test_request_scheduler_rate_limit(fake_clock: FakeClock) -> None:
+    """Test that the token bucket limits the rate of requests after the burst allowance"""
+    scheduler = JiraRequestScheduler(requests_per_second=2, burst=3)
+    start = fake_clock.now
+    for _ in range(7):
+        scheduler.call(lambda: None)
+    # 3 requests are allowed straight away, then 2 per second
+    assert fake_clock.now - start == pytest.approx(2)
+
+    # A Retry-After pause applies to all requests using the scheduler
+    scheduler._retry_delay(http_error(429, {"Retry-After": "30"}), 0)
+    start = fake_clock.now
+    scheduler.call(lambda: None)
+    assert fake_clock.now - start == pytest.approx(30)
+
+    # A last refill time ahead of the clock does not take tokens away
+    scheduler = JiraRequestScheduler(requests_per_second=2, burst=3)
+    scheduler._last_refill = fake_clock.now + 100
+    start = fake_clock.now
+    scheduler.call(lambda: None)
+    assert fake_clock.now == start
+
+
+def test_jira_client_is_shared(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a single Jira client is created and reused across instances"""
+    monkeypatch.setattr(utils.jira_confluence_util, "_JIRA_CLIENTS", {})
+    mock_jira = Mock()
+    monkeypatch.setattr(utils.jira_confluence_util, "Jira", mock_jira)
+
+    first_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    second_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    first_util._setup_jira_client()
+    first_util._setup_jira_client()
+    second_util._setup_jira_client()
+    assert mock_jira.call_count == 1
+    assert first_util.jira_client is second_util.jira_client
+
+    # Checking a reference does not need a client
+    third_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    os.environ["JIRA_PROJECT_KEY"] = "TEST"
+    third_util.jira_project_key = "TEST"
+    assert third_util.is_valid_jira_reference("TEST-123")
+    assert not hasattr(third_util, "jira_client")
+
+
+def test_jira_client_leaves_rate_limits_to_scheduler(monkeypatch: pytest.MonkeyPatch, fake_clock: FakeClock) -> None:
+    """Test that a rate limited Jira request is retried by the request scheduler, not the Jira client"""
+    monkeypatch.setattr(utils.jira_confluence_util, "_JIRA_CLIENTS", {})
+    monkeypatch.setattr(JiraConfluenceUtil, "_issue_data_cache", {})
+    monkeypatch.setenv("JIRA_URL", "https://jira.example.com")
+    test_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    test_util._setup_jira_client()
+
+    responses = [(429, {"Retry-After": "7"}, b"{}"), (200, {}, b'{"key": "TEST-1", "fields": {}}')]
+    sent_requests = []
+
+    def send(request: requests.PreparedRequest, **kwargs: object) -> requests.Response:
+        status_code, headers, content = responses[len(sent_requests)]
+        sent_requests.append(request)
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers)
+        response._content = content
+        response.request = request
+        response.url = request.url
+        return response
+
+    monkeypatch.setattr(test_util.jira_client.session.get_adapter("https://"), "send", send)
+    assert test_util.get_issue_data("TEST-1") == {"key": "TEST-1", "fields": {}}
+    assert len(sent_requests) == 2
+    assert fake_clock.sleeps == [7]
+
+
+def test_get_issue_data_is_cached(monkeypatch: pytest.MonkeyPatch, fake_clock: FakeClock) -> None:
+    """Test that issue data is reused until it expires or the attachments change"""
+    monkeypatch.setattr(JiraConfluenceUtil, "_issue_data_cache", {})
+    test_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    test_util.jira_client = Mock()
+    test_util.jira_client.get_issue.side_effect = lambda ticket_id: {
+        "key": ticket_id, "fields": {"attachment": [{"filename": "report.html"}]}
+    }
+
+    issue_data = test_util.get_issue_data("TEST-1")
+    assert test_util.get_issue_data("TEST-1") is issue_data
+    assert test_util.jira_client.get_issue.call_count == 1
+    assert test_util.check_attachment_exists_in_issue_data(issue_data, "report.html")
+    assert not test_util.check_attachment_exists_in_issue_data(issue_data, "trace.zip")
+
+    # Issue data not from the cache is still checked
+    assert test_util.check_attachment_exists_in_issue_data(
+        {"key": "TEST-1", "fields": {"attachment": [{"filename": "trace.zip"}]}}, "trace.zip"
+    )
+
+    fake_clock.sleep(utils.jira_confluence_util.ISSUE_DATA_CACHE_TTL + 1)
+    assert test_util.get_issue_data("TEST-1") is not issue_data
+    assert test_util.jira_client.get_issue.call_count == 2
+
+    test_util._upload_files_to_jira(test_util.get_issue_data("TEST-1"), [], True)
+    test_util.get_issue_data("TEST-1")
+    assert test_util.jira_client.get_issue.call_count == 3
+
+
+def test_upload_test_results_dir_to_jira_tickets(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    """Test that files are uploaded to every ticket, with a summary per ticket"""
+    monkeypatch.setattr(JiraConfluenceUtil, "_issue_data_cache", {})
+    test_util = JiraConfluenceUtil(TEST_RESULTS_DIR)
+    test_util.jira_client = Mock()
+    test_util.jira_client.get_issue.side_effect = lambda ticket_id: (
+        None if ticket_id == "TEST-3" else {"key": ticket_id, "fields": {"attachment": [{"filename": "report.html"}]}}
+    )
+
+    def post(url: str, headers: dict, files: dict) -> None:
+        if "TEST-2" in url and files["file"][0] == "csv_test.csv":
+            raise Exception("Upload failed")
+
+    test_util.jira_client.post.side_effect = post
+    results = test_util.upload_test_results_dir_to_jira_tickets(
+        ["TEST-1", "TEST-2", "TEST-3"], overwrite_files=False, automatically_accept=True, max_connections=3,
+        incremental=True,
+    )
+
+    file_count = len(test_util._get_files_to_upload_to_jira(True, True, True, True))
+    assert len(results["TEST-1"]["uploaded"]) == file_count
+    assert "report.html" not in results["TEST-1"]["uploaded"]
+    assert results["TEST-1"]["failed"] == [] and results["TEST-1"]["comment_added"]
+    assert results["TEST-2"]["failed"] == ["csv_test.csv"]
+    assert results["TEST-3"]["error"] and results["TEST-3"]["uploaded"] == []
+    assert test_util.jira_client.issue_add_comment.call_count == 2
+
+    output = capsys.readouterr().out
+    assert f"- TEST-1: {file_count} file(s) uploaded, 0 failed, comment added" in output
+    assert f"- TEST-2: {file_count - 1} file(s) uploaded, 1 failed, comment added" in output
+    assert "- TEST-3: Issue data not found" in output
+
+    # More connections than the shared connection pool allows would have no effect
+    with pytest.raises(ValueError, match="between 1 and 10"):
+        test_util.upload_test_results_dir_to_jira_tickets(["TEST-1"], automatically_accept=True, max_connections=11)
+
+
+def test_get_files_to_upload_to_jira_from_artifact_manifest(tmp_path: Path) -> None:
+    """Test that trace files and screenshots are taken only from a complete artifact manifest when present"""
+    results_dir = tmp_path / "test-results"
+    shutil.copytree(TEST_RESULTS_DIR, results_dir)
+    # A trace file not in the manifest, so should not be found
+    (results_dir / "unrecorded-test").mkdir()
+    (results_dir / "unrecorded-test" / "trace.zip").write_bytes(b"trace")
+    # A trace file only found using the manifest, as it is not in a directory that is searched
+    (results_dir / "nested-test" / "retry-1").mkdir(parents=True)
+    (results_dir / "nested-test" / "retry-1" / "trace.zip").write_bytes(b"nested trace")
+    ArtifactManifest.record_artifacts(
+        results_dir,
+        [results_dir / "test-sub-dir" / "trace.zip", results_dir / "nested-test" / "retry-1" / "trace.zip"],
+        "tests/test_example.py::test_example",
+        "failed",
+    )
+    ArtifactManifest.record_session_end(results_dir)
+
+    def files_to_upload() -> dict[str, dict]:
+        return {
+            file_info["path"].relative_to(results_dir).as_posix(): file_info
+            for file_info in JiraConfluenceUtil(results_dir)._get_files_to_upload_to_jira(True, True, True, True)
+        }
+
+    test_util = JiraConfluenceUtil(results_dir)
+    files = files_to_upload()
+    assert sorted(files) == [
+        "csv_test.csv",
+        "nested-test/retry-1/trace.zip",
+        "report.html",
+        "test-sub-dir/trace.zip",
+        "test_image.png",
+    ]
+    assert files["test-sub-dir/trace.zip"]["sha256"] == test_util._file_hash(results_dir / "test-sub-dir" / "trace.zip")
+    assert files["test-sub-dir/trace.zip"]["outcome"] == "failed"
+
+    # The results directory is searched instead if the manifest was added to after the end of the run
+    ArtifactManifest.record_artifacts(
+        results_dir, [results_dir / "unrecorded-test" / "trace.zip"], "tests/test_example.py::test_rerun", "passed"
+    )
+    files = files_to_upload()
+    assert sorted(files) == [
+        "csv_test.csv",
+        "report.html",
+        "screenshot/test_image_b.png",
+        "test-sub-dir/trace.zip",
+        "test_image.png",
+        "unrecorded-test/trace.zip",
+    ]
+    assert files["unrecorded-test/trace.zip"]["outcome"] == "passed"
+
+
+def write_results_json(results_dir: Path, outcomes: dict[str, str]) -> None:
+    """Writes a results.json file in the pytest-json-report format with the test outcomes provided"""
+    results = {
+        "created": 1700000000.0,
+        "summary": {"total": len(outcomes)},
+        "tests": [
+            {"nodeid": nodeid, "outcome": outcome, "call": {"duration": 0.5, "outcome": outcome, "longrepr": "x" * 100}}
+            for nodeid, outcome in outcomes.items()
+        ],
+        "warnings": [],
+    }
+    (results_dir / "results.json").write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+
+def test_get_files_to_upload_to_jira_failed_only(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test that only the HTML report and the files for failed tests are selected"""
+    results_dir = tmp_path / "test-results"
+    for test_dir in ["tests-test-one-py-test-passed", "tests-test-one-py-test-failed", "tests-test-one-py-test-error"]:
+        (results_dir / test_dir).mkdir(parents=True)
+        (results_dir / test_dir / "trace.zip").write_bytes(test_dir.encode())
+    (results_dir / "screenshot").mkdir()
+    (results_dir / "screenshot" / "failed.png").write_bytes(b"png")
+    (results_dir / "report.html").write_text("<html></html>")
+    (results_dir / "results.csv").write_text("a,b")
+    write_results_json(results_dir, {
+        "tests/test_one.py::test_passed": "passed",
+        "tests/test_one.py::test_failed": "failed",
+        "tests/test_one.py::test_error": "error",
+    })
+
+    # Files can only be linked to tests using the artifact manifest
+    test_util = JiraConfluenceUtil(results_dir)
+    with pytest.raises(ValueError, match="artifact manifest .* is required"):
+        test_util._get_files_to_upload_to_jira(True, True, True, True, failed_only=True)
+
+    ArtifactManifest.record_artifacts(
+        results_dir, [results_dir / "tests-test-one-py-test-passed" / "trace.zip", results_dir / "results.csv"],
+        "tests/test_one.py::test_passed", "passed",
+    )
+    ArtifactManifest.record_artifacts(
+        results_dir, [results_dir / "tests-test-one-py-test-failed" / "trace.zip", results_dir / "screenshot" / "failed.png"],
+        "tests/test_one.py::test_failed", "failed",
+    )
+    # The trace file for the errored test is not recorded, so cannot be linked to it
+    assert sorted(f["local_file_path"] for f in test_util._get_files_to_upload_to_jira(True, True, True, True, failed_only=True)) == [
+        "report.html",
+        "screenshot/failed.png",
+        "tests-test-one-py-test-failed/trace.zip",
+    ]
+    assert "1 file(s) are not recorded in the artifact manifest" in capsys.readouterr().out
+
+    (results_dir / "results.json").unlink()
+    with pytest.raises(ValueError, match="results.json.* is required"):
+        test_util._get_files_to_upload_to_jira(True, True, True, True, failed_only=True)
+
+
+def test_streaming_json_reader(tmp_path: Path) -> None:
+    """Test that array items are read correctly when values are split across chunks"""
+    results_dir = tmp_path
+    outcomes = {f"tests/test_{index}.py::test[1.5e-3]": "failed" if index % 3 else "passed" for index in range(50)}
+    write_results_json(results_dir, outcomes)
+    expected = json.loads((results_dir / "results.json").read_text())["tests"]
+
+    for chunk_size in [1, 7, 64, 65536]:
+        reader = utils.jira_confluence_util._StreamingJsonReader(results_dir / "results.json", chunk_size)
+        assert list(reader.iter_array_items("tests")) == expected
+        assert list(reader.iter_array_items("missing")) == []
+
+    (results_dir / "results.json").write_text('{"tests": [{"nodeid": "a"}, {"nodeid": "b"')
+    with pytest.raises(ValueError):
+        list(utils.jira_confluence_util._StreamingJsonReader(results_dir / "results.json", 4).iter_array_items("tests"))
+
+
+def test_files_are_bundled(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, upload_manifest: Path) -> None:
+    """Test that files are bundled into zip files under the file size limit, with an index file in each"""
+    monkeypatch.setattr(utils.jira_confluence_util, "JIRA_FILE_SIZE_LIMIT", 64 * 1024)
+    results_dir = tmp_path / "test-results"
+    (results_dir / "screenshot").mkdir(parents=True)
+    (results_dir / "report.html").write_text("<html></html>")
+    files = {}
+    for index in range(20):
+        files[f"screenshot/image_{index}.png"] = os.urandom(5000)
+        files[f"results_{index}.csv"] = b"a,b\n" * 1000
+    for file_name, content in files.items():
+        (results_dir / file_name).write_bytes(content)
+    ArtifactManifest.record_artifacts(
+        results_dir, [results_dir / "screenshot" / "image_0.png"], "tests/test_one.py::test_one", "failed"
+    )
+    ArtifactManifest.record_artifacts(
+        results_dir, [results_dir / "screenshot" / f"image_{index}.png" for index in range(1, 20)], "tests/test_two.py::test_two", "passed"
+    )
+
+    test_util = JiraConfluenceUtil(results_dir)
+    try:
+        file_data = test_util._get_files_to_upload_to_jira(True, True, True, True, bundle_files=True)
+        assert file_data[0]["local_file_path"] == "report.html"
+        bundles = file_data[1:]
+        assert [bundle["default_name"] for bundle in bundles] == ["results-bundle-001.zip", "results-bundle-002.zip"]
+
+        bundled_content = {}
+        for bundle in bundles:
+            assert bundle["path"].stat().st_size < 64 * 1024
+            with zipfile.ZipFile(bundle["path"]) as bundle_zip:
+                index = bundle_zip.read("index.csv").decode("utf-8").splitlines()
+                names = [name for name in bundle_zip.namelist() if name != "index.csv"]
+                assert [row.split(",")[0] for row in index[1:]] == names
+                bundled_content.update({name: bundle_zip.read(name) for name in names})
+                if "screenshot/image_0.png" in names:
+                    row = next(row for row in index if row.startswith("screenshot/image_0.png,"))
+                    assert row.endswith(",tests/test_one.py::test_one,failed")
+        assert sorted(bundled_content) == sorted(files), set(bundled_content) ^ set(files)
+        assert all(bundled_content[name] == content for name, content in files.items())
+
+        test_util.jira_client = Mock()
+        test_util._upload_files_to_jira({"key": "TEST-1", "fields": {"attachment": []}}, file_data, True, incremental=True)
+        assert test_util.jira_client.post.call_count == 3
+        csv_bundle = next(
+            bundle["default_name"] for bundle in bundles
+            if "results_0.csv" in [file_info["local_file_path"] for file_info in bundle["bundled_files"]]
+        )
+        assert json.loads(upload_manifest.read_text())["TEST-1"]["results_0.csv"]["filename"] == csv_bundle
+
+        test_util._add_comment_to_jira("TEST-1", [bundle["default_name"] for bundle in bundles], False)
+        comment = test_util.jira_client.issue_add_comment.call_args[0][1]
+        assert "*Result Bundles" in comment and "* [^results-bundle-002.zip]" in comment
+        assert "Trace Files" not in comment
+    finally:
+        test_util._remove_upload_temp_dir()
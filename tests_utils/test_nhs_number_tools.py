@@ -1,4 +1,5 @@
 import pytest
+from pathlib import Path
 from utils.nhs_number_tools import NHSNumberTools, NHSNumberToolsException
 
 
@@ -16,3 +17,12 @@ def test_nhs_number_checks() -> None:
 def test_spaced_nhs_number() -> None:
     assert NHSNumberTools.spaced_nhs_number("1234567890") == "123 456 7890"
     assert NHSNumberTools.spaced_nhs_number(3216549870) == "321 654 9870"
+
+def test_is_valid_nhs_number() -> None:
+    assert NHSNumberTools.is_valid_nhs_number("9434765919")
+    assert NHSNumberTools.is_valid_nhs_number("943 476 5919")
+    assert NHSNumberTools.is_valid_nhs_number(4010232137)
+    assert not NHSNumberTools.is_valid_nhs_number("9434765918")
+    assert not NHSNumberTools.is_valid_nhs_number("1234567890")  # Check digit would be 10
+    assert not NHSNumberTools.is_valid_nhs_number("943476591")
+    assert not NHSNumberTools.is_valid_nhs_number("A434765919")
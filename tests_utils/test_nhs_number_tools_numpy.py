@@ -0,0 +1,64 @@
+import itertools
+import pytest
+from pathlib import Path
+from utils.nhs_number_tools import NHSNumberTools, NHSNumberToolsException
+
+# The batch NHS number methods need numpy, which is only installed from requirements-dev.txt
+np = pytest.importorskip("numpy")
+
+
+pytestmark = [pytest.mark.utils]
+
+def test_validate_nhs_numbers() -> None:
+    nhs_numbers = ["9434765919", "943 476 5919", "9434765918", "1234567890", "943476591", "A434765919", "٩434765919"]
+    assert NHSNumberTools.validate_nhs_numbers(nhs_numbers).tolist() == [True, True, False, False, False, False, False]
+    assert NHSNumberTools.validate_nhs_numbers(np.array([9434765919, 4010232137, 123, -9434765919])).tolist() == [True, True, False, False]
+    assert NHSNumberTools.validate_nhs_numbers([]).tolist() == []
+
+def test_spaced_nhs_numbers() -> None:
+    valid, spaced = NHSNumberTools.spaced_nhs_numbers(["9434765919", "9434765918", 4010232137])
+    assert valid.tolist() == [True, False, True]
+    assert spaced.tolist() == ["943 476 5919", "", "401 023 2137"]
+
+def test_generate_nhs_numbers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER_COUNT", raising=False)
+
+    generated = list(itertools.islice(NHSNumberTools.generate_nhs_numbers(seed=1), 1000))
+    assert len(set(generated)) == 1000
+    assert all(NHSNumberTools.is_valid_nhs_number(nhs_number) and nhs_number[0] == "9" for nhs_number in generated)
+    assert list(itertools.islice(NHSNumberTools.generate_nhs_numbers(seed=1), 1000)) == generated
+    assert list(itertools.islice(NHSNumberTools.generate_nhs_numbers(seed=2), 1000)) != generated
+
+    # Every NHS number in a small space is generated exactly once across the shards
+    shards = [set(NHSNumberTools.generate_nhs_numbers(prefix="99912", shard_index=index, shard_count=3)) for index in range(3)]
+    assert sum(len(shard) for shard in shards) == len(set.union(*shards))
+    assert set.union(*shards) == {
+        f"99912{body:04d}{check}" for body in range(10000) for check in range(10)
+        if NHSNumberTools.is_valid_nhs_number(f"99912{body:04d}{check}")
+    }
+
+    # The shard defaults to the pytest-xdist worker
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "3")
+    assert set(NHSNumberTools.generate_nhs_numbers(prefix="99912")) == shards[1]
+
+    with pytest.raises(NHSNumberToolsException, match=r'The shard index provided \(3\) is not between 0 and the shard count \(3\)'):
+        next(NHSNumberTools.generate_nhs_numbers(shard_index=3, shard_count=3))
+
+    with pytest.raises(NHSNumberToolsException, match=r'The prefix provided \(99A\) is not up to 8 digits'):
+        next(NHSNumberTools.generate_nhs_numbers(prefix="99A"))
+
+def test_write_nhs_numbers(tmp_path: Path) -> None:
+    expected = list(itertools.islice(NHSNumberTools.generate_nhs_numbers(seed=3, shard_index=1, shard_count=2), 5000))
+
+    csv_file = NHSNumberTools.write_nhs_numbers(tmp_path / "nhs.csv", 5000, seed=3, shard_index=1, shard_count=2)
+    assert csv_file.read_text().splitlines() == ["nhs_number"] + expected
+
+    binary_file = NHSNumberTools.write_nhs_numbers(
+        tmp_path / "nhs.bin", 5000, seed=3, shard_index=1, shard_count=2, file_format="binary"
+    )
+    assert np.fromfile(binary_file, dtype="<u8").tolist() == [int(nhs_number) for nhs_number in expected]
+
+    with pytest.raises(NHSNumberToolsException, match=r'Only \d+ NHS numbers can be generated'):
+        NHSNumberTools.write_nhs_numbers(tmp_path / "small.csv", 10000, prefix="99912345")
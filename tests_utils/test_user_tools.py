@@ -1,7 +1,10 @@
+import json
+import os
 import pytest
 import utils.user_tools
 from utils.user_tools import UserTools, UserToolsException
 from pathlib import Path
+from unittest.mock import MagicMock, Mock
 
 
 pytestmark = [pytest.mark.utils]
@@ -19,3 +22,124 @@ def test_retrieve_user(monkeypatch: object) -> None:
 
     with pytest.raises(UserToolsException, match=r'User \[Invalid User\] is not present in users.json'):
         UserTools.retrieve_user("Invalid User")
+
+def test_retrieve_user_by_username(monkeypatch: object) -> None:
+    monkeypatch.setattr(utils.user_tools, "USERS_FILE", Path(__file__).parent / "resources" / "test_users.json")
+
+    test_user = UserTools.retrieve_user_by_username("TEST_USER2")
+    assert test_user["test_key"] == "TEST B"
+
+    with pytest.raises(UserToolsException, match=r'User with username \[INVALID\] is not present in users.json'):
+        UserTools.retrieve_user_by_username("INVALID")
+
+def test_users_with_role(monkeypatch: object) -> None:
+    monkeypatch.setattr(utils.user_tools, "USERS_FILE", Path(__file__).parent / "resources" / "test_users.json")
+
+    assert list(UserTools.users_with_role("Role A").keys()) == ["Test User", "Test User 2"]
+    assert list(UserTools.users_with_role("Role B").keys()) == ["Test User 2"]
+    assert UserTools.users_with_role("Invalid Role") == {}
+
+def test_users_file_cache(monkeypatch: object, tmp_path: Path) -> None:
+    users_file = tmp_path / "users.json"
+    users_file.write_text(json.dumps({"Cached User": {"username": "CACHED_1"}}))
+    monkeypatch.setattr(utils.user_tools, "USERS_FILE", users_file)
+
+    # Returned values are copies, so changes do not affect the cache
+    test_user = UserTools.retrieve_user("Cached User")
+    test_user["username"] = "CHANGED"
+    assert UserTools.retrieve_user("Cached User")["username"] == "CACHED_1"
+    assert UserTools._load_users() is UserTools._load_users()
+
+    # Modifying the file invalidates the cache
+    users_file.write_text(json.dumps({"Cached User": {"username": "CACHED_2"}}))
+    os.utime(users_file, ns=(1, 1))
+    assert UserTools.retrieve_user("Cached User")["username"] == "CACHED_2"
+
+def test_lease_user(monkeypatch: object, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils.user_tools, "USERS_FILE", Path(__file__).parent / "resources" / "test_users.json")
+    monkeypatch.setattr(utils.user_tools, "LEASE_DIRECTORY", tmp_path)
+
+    with UserTools.lease_user("Role A") as first_user:
+        with UserTools.lease_user("Role A") as second_user:
+            assert {first_user["username"], second_user["username"]} == {"TEST_USER1", "TEST_USER2"}
+
+            with pytest.raises(UserToolsException, match=r'No users with role \[Role A\] became available'):
+                with UserTools.lease_user("Role A", timeout=0.2):
+                    pass
+
+        # The second user is available again once released
+        with UserTools.lease_user("Role B") as third_user:
+            assert third_user["username"] == "TEST_USER2"
+
+    with pytest.raises(UserToolsException, match=r'No users with role \[Invalid Role\] are present in users.json'):
+        with UserTools.lease_user("Invalid Role"):
+            pass
+
+def test_retrieve_storage_state(monkeypatch: object, tmp_path: Path) -> None:
+    monkeypatch.setattr(utils.user_tools, "USERS_FILE", Path(__file__).parent / "resources" / "test_users.json")
+    monkeypatch.setattr(utils.user_tools, "STORAGE_STATE_DIRECTORY", tmp_path)
+    logins = []
+
+    def login(user_details: dict) -> dict:
+        logins.append(user_details["username"])
+        return {"cookies": [{"name": "session", "value": str(len(logins)), "expires": -1}], "origins": []}
+
+    state_file = UserTools.retrieve_storage_state("Test User", login)
+    assert json.loads(state_file.read_text())["cookies"][0]["value"] == "1"
+
+    # Saved state is reused while current
+    assert UserTools.retrieve_storage_state("Test User", login) == state_file
+    assert logins == ["TEST_USER1"]
+
+    # State older than the max age is refreshed
+    os.utime(state_file, (0, 0))
+    UserTools.retrieve_storage_state("Test User", login)
+    assert logins == ["TEST_USER1", "TEST_USER1"]
+
+    # State with expired cookies is refreshed
+    state_file.write_text(json.dumps({"cookies": [{"name": "session", "value": "x", "expires": 1}]}))
+    UserTools.retrieve_storage_state("Test User", login)
+    assert len(logins) == 3
+
+    # Invalidated state is refreshed
+    UserTools.invalidate_storage_state("Test User")
+    assert not state_file.exists()
+    UserTools.retrieve_storage_state("Test User", login)
+    assert len(logins) == 4
+
+# Replace the browser and login steps used by the logged_in_context fixture, so no browser or application is needed
+@pytest.fixture
+def browser() -> MagicMock:
+    return MagicMock()
+
+@pytest.fixture
+def browser_context_args() -> dict:
+    return {"base_url": "https://example.com"}
+
+@pytest.fixture
+def log_in_user() -> Mock:
+    return Mock()
+
+def test_logged_in_context(
+    monkeypatch: object, tmp_path: Path, browser: MagicMock, log_in_user: Mock, logged_in_context: object
+) -> None:
+    monkeypatch.setattr(utils.user_tools, "USERS_FILE", Path(__file__).parent / "resources" / "test_users.json")
+    monkeypatch.setattr(utils.user_tools, "STORAGE_STATE_DIRECTORY", tmp_path)
+    browser.new_context.return_value.storage_state.return_value = {"cookies": [], "origins": []}
+
+    context = logged_in_context("Test User")
+    state_file = tmp_path / "Test_User.json"
+    assert context == browser.new_context.return_value
+    assert json.loads(state_file.read_text()) == {"cookies": [], "origins": []}
+    browser.new_context.assert_called_with(base_url="https://example.com", storage_state=state_file)
+
+    # The login steps are passed a page from a separate context, which is closed once logged in
+    login_page, user_details = log_in_user.call_args.args
+    assert login_page == browser.new_context.return_value.new_page.return_value
+    assert user_details["username"] == "TEST_USER1"
+    browser.new_context.return_value.close.assert_called_once()
+
+    # Saved state is reused for the same user
+    logged_in_context("Test User")
+    assert log_in_user.call_count == 1
+    assert browser.new_context.call_count == 3
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+# The prefix for artifact manifest files, with each pytest-xdist worker writing to its own file
+MANIFEST_FILE_PREFIX = "artifact-manifest"
+# The file recording the number of artifact manifest entries written by the end of the test run
+SESSION_END_FILE = f"{MANIFEST_FILE_PREFIX}-session-end.json"
+
+
+class ArtifactManifest:
+    """
+    A utility class for recording the artifacts (such as trace files and screenshots) produced by each test during a
+    test run, and reading them back afterwards without needing to search the results directory.
+    """
+
+    @staticmethod
+    def record_artifacts(results_dir: Path, artifacts: list[Path], nodeid: str, outcome: str) -> None:
+        """
+        Appends an entry for each artifact provided to the artifact manifest in the results directory, recording the
+        path (relative to the results directory where possible), size, SHA-256 hash, test nodeid and test outcome.
+
+        Args:
+            results_dir (pathlib.Path): The results directory the artifact manifest is written to.
+            artifacts (list[pathlib.Path]): The artifacts produced by the test.
+            nodeid (str): The nodeid of the test that produced the artifacts.
+            outcome (str): The outcome of the test that produced the artifacts, e.g. "passed" or "failed".
+        """
+        results_dir = Path(results_dir).absolute()
+        entries = []
+        for artifact in artifacts:
+            artifact = Path(artifact).absolute()
+            try:
+                with open(artifact, "rb") as file:
+                    sha256 = hashlib.file_digest(file, "sha256").hexdigest()
+                size = artifact.stat().st_size
+            except OSError as e:
+                logger.warning(f"Unable to record artifact [{artifact}] in the artifact manifest: {e}")
+                continue
+
+            path = artifact.relative_to(results_dir).as_posix() if artifact.is_relative_to(results_dir) else str(artifact)
+            entries.append(
+                json.dumps({"path": path, "size": size, "sha256": sha256, "nodeid": nodeid, "outcome": outcome}) + "\n"
+            )
+
+        if not entries:
+            return
+
+        results_dir.mkdir(parents=True, exist_ok=True)
+        # Written in one call, so the entries for a test are not split if the run is interrupted
+        with open(ArtifactManifest._manifest_file(results_dir), "a", encoding="utf-8") as file:
+            file.write("".join(entries))
+
+    @staticmethod
+    def manifest_exists(results_dir: Path) -> bool:
+        """
+        Checks if an artifact manifest has been written to the results directory.
+
+        Args:
+            results_dir (pathlib.Path): The results directory to check.
+
+        Returns:
+            bool: True if at least one artifact manifest file is present in the results directory.
+        """
+        return any(Path(results_dir).glob(f"{MANIFEST_FILE_PREFIX}*.jsonl"))
+
+    @staticmethod
+    def record_session_end(results_dir: Path) -> None:
+        """
+        Records the number of entries in the artifact manifest (across every pytest-xdist worker) for the results
+        directory once the test run has completed, so manifest_complete() can check nothing is missing from it.
+
+        Args:
+            results_dir (pathlib.Path): The results directory the artifact manifest is written to.
+        """
+        results_dir = Path(results_dir)
+        if not ArtifactManifest.manifest_exists(results_dir):
+            return
+        results_dir.joinpath(SESSION_END_FILE).write_text(
+            json.dumps({"entries": ArtifactManifest._count_entries(results_dir)}), encoding="utf-8"
+        )
+
+    @staticmethod
+    def manifest_complete(results_dir: Path) -> bool:
+        """
+        Checks if the artifact manifest in the results directory is complete, meaning the end of the test run was
+        recorded and the manifest has not been added to since. A manifest is not complete if the test run was
+        interrupted, or the manifest was written by an older version of conftest.py.
+
+        Args:
+            results_dir (pathlib.Path): The results directory to check.
+
+        Returns:
+            bool: True if the number of entries in the artifact manifest matches the number recorded at the end of the
+            test run.
+        """
+        results_dir = Path(results_dir)
+        try:
+            recorded_entries = json.loads(results_dir.joinpath(SESSION_END_FILE).read_text(encoding="utf-8"))["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return recorded_entries == ArtifactManifest._count_entries(results_dir)
+
+    @staticmethod
+    def read_artifacts(results_dir: Path) -> list[dict]:
+        """
+        Reads the artifacts recorded in the artifact manifest (across every pytest-xdist worker) for the results
+        directory, reading each manifest a line at a time. If the same artifact was recorded more than once (for
+        example, if a test was rerun), the last entry is used.
+
+        Args:
+            results_dir (pathlib.Path): The results directory to read the artifact manifest from.
+
+        Returns:
+            list[dict]: The artifacts recorded, with the path ("path") as a pathlib.Path, size ("size"), SHA-256 hash
+            ("sha256"), test nodeid ("nodeid") and test outcome ("outcome") for each.
+        """
+        results_dir = Path(results_dir)
+        artifacts = {}
+        for manifest_file in sorted(results_dir.glob(f"{MANIFEST_FILE_PREFIX}*.jsonl")):
+            with open(manifest_file, "r", encoding="utf-8") as file:
+                for line_number, line in enumerate(file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping invalid entry on line {line_number} of [{manifest_file}]")
+                        continue
+
+                    entry["path"] = results_dir / entry["path"]
+                    artifacts[entry["path"]] = entry
+
+        return list(artifacts.values())
+
+    @staticmethod
+    def _manifest_file(results_dir: Path) -> Path:
+        """
+        Returns the path to the artifact manifest file for this process.
+        """
+        worker_id = os.getenv("PYTEST_XDIST_WORKER", "")
+        return results_dir / f"{MANIFEST_FILE_PREFIX}{"-" if worker_id else ""}{worker_id}.jsonl"
+
+    @staticmethod
+    def _count_entries(results_dir: Path) -> int:
+        """
+        Returns the number of entries in the artifact manifest files for the results directory.
+        """
+        entries = 0
+        for manifest_file in results_dir.glob(f"{MANIFEST_FILE_PREFIX}*.jsonl"):
+            with open(manifest_file, "rb") as file:
+                entries += sum(1 for line in file if line.strip())
+        return entries
@@ -1,12 +1,788 @@
+import copy
+import hashlib
+import importlib.metadata
+import json
 import logging
 import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+from html import escape
+from urllib.parse import urlparse
 import pytest_playwright_axe
-from playwright.sync_api import Page
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import BrowserContext, Page, sync_playwright
 from pathlib import Path
+from typing import Callable, Iterator
 
 
 logger = logging.getLogger(__name__)
 PATH_FOR_REPORT = str(Path(os.getcwd()) / "axe-reports")
+AXE_REGISTERED_SCRIPT_PATH = Path(__file__).parent / "resources" / "axe_registered.js"
+AXE_RESULT_CATEGORIES = ["violations", "passes", "incomplete", "inapplicable"]
+# The pytest-playwright-axe version, which determines the axe-core version bundled with it
+AXE_PACKAGE_VERSION = importlib.metadata.version("pytest-playwright-axe")
+
+# The scripts used for incremental scanning (see Axe.run), which track the
+# elements changed between scans using a MutationObserver, and mark the
+# top-most changed elements with an attribute so they can be scanned using
+# the INCREMENTAL_CONTEXT.
+INCREMENTAL_MARKER = "data-axe-incremental"
+INCREMENTAL_CONTEXT = f"{{include: [['[{INCREMENTAL_MARKER}]']]}}"
+INCREMENTAL_OBSERVE_SCRIPT = f"""() => {{
+    const state = {{ changed: new Set() }};
+    state.observer = new MutationObserver((mutations) => {{
+        for (const mutation of mutations) {{
+            if (mutation.attributeName === "{INCREMENTAL_MARKER}") continue;
+            const element = mutation.target.nodeType === Node.ELEMENT_NODE
+                ? mutation.target
+                : mutation.target.parentElement;
+            if (element) state.changed.add(element);
+        }}
+    }});
+    state.observer.observe(document.documentElement, {{
+        subtree: true, childList: true, attributes: true, characterData: true
+    }});
+    window.__axeIncremental = state;
+}}"""
+INCREMENTAL_MARK_SCRIPT = f"""() => {{
+    const state = window.__axeIncremental;
+    if (!state) return -1;
+    const changed = [...state.changed].filter((element) => element.isConnected);
+    state.changed.clear();
+    const regions = changed.filter(
+        (element) => !changed.some((other) => other !== element && other.contains(element))
+    );
+    regions.forEach((element) => element.setAttribute("{INCREMENTAL_MARKER}", ""));
+    return regions.length;
+}}"""
+INCREMENTAL_STALE_SCRIPT = f"""(selectors) => selectors.filter((selector) => {{
+    try {{
+        const element = document.querySelector(selector);
+        return !element || element.closest("[{INCREMENTAL_MARKER}]") !== null;
+    }} catch (e) {{
+        return true;
+    }}
+}})"""
+INCREMENTAL_UNMARK_SCRIPT = f"""() => document.querySelectorAll("[{INCREMENTAL_MARKER}]").forEach(
+    (element) => element.removeAttribute("{INCREMENTAL_MARKER}")
+)"""
+
+
+class AxeResultCache:
+    """
+    A size-bounded cache of axe-core results, keyed by a hash of the page
+    URL, serialized DOM, context and options used for the scan, and the
+    pytest-playwright-axe version (so an upgrade of axe-core does not reuse
+    results from the previous version). Results are
+    held in memory for the session, and optionally persisted to disk so they
+    can be reused across runs.
+
+    Args:
+        max_entries (int): [Optional] The maximum number of results to hold
+            in memory, with the least recently used result evicted first.
+            Defaults to 128.
+        cache_directory (str | pathlib.Path): [Optional] If provided, the
+            directory to persist results to. If not provided (default),
+            results are only held in memory.
+        max_disk_entries (int): [Optional] The maximum number of results to
+            persist to the cache directory, with the least recently used
+            result removed first. Defaults to 1000.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        cache_directory: str | Path | None = None,
+        max_disk_entries: int = 1000,
+    ) -> None:
+        self.max_entries = max_entries
+        self.cache_directory = Path(cache_directory) if cache_directory else None
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(page: Page, context: str = "", options: str = "") -> str:
+        """
+        Generates the cache key for the current state of the page provided.
+
+        Args:
+            page (playwright.sync_api.Page): The page object to generate the
+                key for.
+            context (str): [Optional] The context to be used for the scan.
+            options (str): [Optional] The options to be used for the scan.
+
+        Returns:
+            str: A SHA-256 hex digest representing the page and scan settings.
+        """
+        digest = hashlib.sha256()
+        for value in [AXE_PACKAGE_VERSION, page.url, context, options, page.content()]:
+            digest.update(value.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """
+        Retrieves a copy of the result stored for the key provided, or None if
+        no result is stored.
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            else:
+                result = self._read_from_disk(key)
+                if result is not None:
+                    self._store_in_memory(key, result)
+
+            if result is None:
+                self.misses += 1
+                logger.debug(f"Axe result cache miss [{key}]")
+                return None
+
+            self.hits += 1
+            logger.debug(f"Axe result cache hit [{key}]")
+            return copy.deepcopy(result)
+
+    def put(self, key: str, result: dict) -> None:
+        """
+        Stores a copy of the result provided against the key provided.
+        """
+        with self._lock:
+            self._store_in_memory(key, copy.deepcopy(result))
+            self._write_to_disk(key, result)
+
+    def clear(self) -> None:
+        """
+        Clears all results held in memory, and resets the hit and miss counts.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def log_summary(self) -> None:
+        """
+        Logs the number of cache hits and misses recorded.
+        """
+        if self.hits or self.misses:
+            logger.info(f"Axe result cache summary: Hits = {self.hits}, Misses = {self.misses}")
+
+    def _store_in_memory(self, key: str, result: dict) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_from_disk(self, key: str) -> dict | None:
+        if not self.cache_directory:
+            return None
+
+        cache_file = self.cache_directory.joinpath(f"{key}.json")
+        try:
+            with open(cache_file, "r", encoding="utf-8") as file:
+                result = json.load(file)
+            os.utime(cache_file)
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read Axe result cache file [{cache_file}]: {e}")
+            return None
+
+    def _write_to_disk(self, key: str, result: dict) -> None:
+        if not self.cache_directory:
+            return
+
+        try:
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_directory.joinpath(f"{key}.json"), "w", encoding="utf-8") as file:
+                json.dump(result, file)
+
+            # The file just written is excluded so it cannot be evicted immediately
+            cache_files = sorted(
+                (cache_file for cache_file in self.cache_directory.glob("*.json") if cache_file.stem != key),
+                key=lambda cache_file: cache_file.stat().st_mtime,
+            )
+            for cache_file in cache_files[:max(len(cache_files) + 1 - self.max_disk_entries, 0)]:
+                cache_file.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to write Axe result cache file for [{key}]: {e}")
+
+
+class AxeReportWriter:
+    """
+    A bounded pool of worker threads that generates Axe HTML and JSON
+    reports away from the test thread. Once the number of reports waiting to
+    be generated reaches max_pending, any further reports submitted will wait
+    for space to become available.
+
+    Args:
+        max_workers (int): [Optional] The number of worker threads to use.
+            Defaults to 2.
+        max_pending (int): [Optional] The maximum number of reports waiting
+            to be generated. Defaults to 32.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32) -> None:
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: list = []
+        self._errors: list[str] = []
+        self._lock = threading.Lock()
+
+    def submit(self, report_function: Callable[[dict, str], None], data: dict, filename: str) -> None:
+        """
+        Queues a report to be generated by the report function provided.
+
+        Args:
+            report_function (Callable): The function to generate the report.
+            data (dict): The axe-core output to generate the report from.
+            filename (str): The filename override to use for the report.
+        """
+        self._slots.acquire()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="axe-report"
+                )
+            # The data is copied so it is unaffected by any changes made by the test
+            future = self._executor.submit(
+                self._generate_report, report_function, copy.deepcopy(data), filename
+            )
+            self._futures.append(future)
+
+    def flush(self) -> list[str]:
+        """
+        Waits for all queued reports to be generated.
+
+        Returns:
+            list[str]: A list of errors for any reports that failed to
+                generate since the last flush.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def _generate_report(self, report_function: Callable[[dict, str], None], data: dict, filename: str) -> None:
+        try:
+            report_function(data, filename)
+        except Exception as e:
+            error = f"Failed to generate Axe report for [{filename or data.get('url', '')}]: {e}"
+            logger.error(error)
+            with self._lock:
+                self._errors.append(error)
+        finally:
+            self._slots.release()
+
+
+class AxeViolationIndex:
+    """
+    A compact index of the unique violations found across all scans in a
+    test run, where a violation is unique by its rule id and the selector of
+    the element it was found on, along with the pages it occurs on. This can
+    then be written out as a single summary report at the end of the run.
+
+    Args:
+        enabled (bool): [Optional] If true, the results of each scan
+            completed using Axe.run or Axe.run_list are added to the index.
+            Defaults to False.
+        skip_page_reports (bool): [Optional] If true, the per-page reports
+            are not generated for scans while the index is enabled, so that
+            only the summary report is generated. Defaults to False.
+    """
+
+    def __init__(self, enabled: bool = False, skip_page_reports: bool = False) -> None:
+        self.enabled = enabled
+        self.skip_page_reports = skip_page_reports
+        self.pages_scanned: set[str] = set()
+        self._violations: dict[tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, page_key: str, result: dict) -> None:
+        """
+        Adds the violations from a scan to the index.
+
+        Args:
+            page_key (str): The identifier for the page scanned.
+            result (dict): The axe-core output for the page scanned.
+        """
+        with self._lock:
+            self.pages_scanned.add(page_key)
+            for violation in result["violations"]:
+                for node in violation["nodes"]:
+                    selector = _node_selector(node)
+                    entry = self._violations.get((violation["id"], selector))
+                    if entry is None:
+                        entry = {
+                            "id": violation["id"],
+                            "impact": violation.get("impact"),
+                            "help": violation.get("help", ""),
+                            "helpUrl": violation.get("helpUrl", ""),
+                            "selector": selector,
+                            "pages": set(),
+                        }
+                        self._violations[(violation["id"], selector)] = entry
+                    entry["pages"].add(page_key)
+
+    def violations(self) -> list[dict]:
+        """
+        Returns the unique violations in the index, ordered by the number of
+        pages they occur on (most first).
+
+        Returns:
+            list[dict]: A list of unique violations, each including the pages
+                they occur on.
+        """
+        with self._lock:
+            entries = [
+                {**entry, "pages": sorted(entry["pages"])}
+                for entry in self._violations.values()
+            ]
+        return sorted(entries, key=lambda entry: (-len(entry["pages"]), entry["id"], entry["selector"]))
+
+    def export(self) -> str:
+        """
+        Exports the pages scanned and violations in the index as a JSON
+        string, so the index from another process (e.g. a pytest-xdist
+        worker) can be added to this one using merge().
+
+        Returns:
+            str: The contents of the index as a JSON string.
+        """
+        with self._lock:
+            pages_scanned = sorted(self.pages_scanned)
+        return json.dumps({"pagesScanned": pages_scanned, "violations": self.violations()})
+
+    def merge(self, exported: str) -> None:
+        """
+        Adds the pages scanned and violations from an index exported using
+        export() to this index, deduplicating any violations already present.
+
+        Args:
+            exported (str): The contents of another index, as returned by
+                export().
+        """
+        data = json.loads(exported)
+        with self._lock:
+            self.pages_scanned.update(data["pagesScanned"])
+            for violation in data["violations"]:
+                key = (violation["id"], violation["selector"])
+                entry = self._violations.setdefault(key, {**violation, "pages": set()})
+                entry["pages"].update(violation["pages"])
+
+    def clear(self) -> None:
+        """
+        Clears all data held in the index.
+        """
+        with self._lock:
+            self.pages_scanned.clear()
+            self._violations.clear()
+
+    def write_summary(self, output_directory: str | Path = PATH_FOR_REPORT, filename: str = "axe-summary") -> None:
+        """
+        Writes a HTML and JSON summary report of the unique violations in the
+        index, if any pages have been scanned.
+
+        Args:
+            output_directory (str | pathlib.Path): [Optional] The directory to
+                output the reports to. If not provided, defaults to
+                /axe-reports directory.
+            filename (str): [Optional] The filename (excluding extension) to
+                use for the reports. Defaults to axe-summary.
+        """
+        if not self.pages_scanned:
+            return
+
+        violations = self.violations()
+        summary = {
+            "timestamp": datetime.now().isoformat(),
+            "pagesScanned": len(self.pages_scanned),
+            "uniqueViolations": len(violations),
+            "violations": violations,
+        }
+
+        output_path = Path(output_directory)
+        output_path.mkdir(parents=True, exist_ok=True)
+        with open(output_path / f"{filename}.json", "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=4)
+        with open(output_path / f"{filename}.html", "w", encoding="utf-8") as file:
+            file.write(self._generate_html(summary))
+
+        logger.info(f"Axe summary report generated: {output_path / filename}.html")
+
+    def _generate_html(self, summary: dict) -> str:
+        rows = ""
+        for violation in summary["violations"]:
+            pages = "<br>".join(escape(page) for page in violation["pages"])
+            rows += (
+                f"<tr><td><a href=\"{escape(violation['helpUrl'])}\">{escape(violation['id'])}</a></td>"
+                f"<td>{escape(str(violation['impact']))}</td>"
+                f"<td>{escape(violation['help'])}</td>"
+                f"<td><code>{escape(violation['selector'])}</code></td>"
+                f"<td>{len(violation['pages'])}</td>"
+                f"<td>{pages}</td></tr>"
+            )
+
+        return (
+            "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"UTF-8\">"
+            "<title>Axe Accessibility Summary</title>"
+            f"{_AxeCompat.report_css()}</head><body>"
+            "<h1>Axe Accessibility Summary</h1>"
+            f"<p>Pages scanned: {summary['pagesScanned']}<br>"
+            f"Unique violations: {summary['uniqueViolations']}<br>"
+            f"Generated: {summary['timestamp']}</p>"
+            "<table><tr><th>Rule</th><th>Impact</th><th>Description</th><th>Selector</th>"
+            f"<th>Page Count</th><th>Pages</th></tr>{rows}</table></body></html>"
+        )
+
+
+def _node_selector(node: dict, first_element_only: bool = False) -> str:
+    """
+    Returns the selector for an axe-core result node as a single string,
+    joining any selectors for elements within iframes or shadow DOM.
+
+    Args:
+        node (dict): The axe-core result node.
+        first_element_only (bool): [Optional] If true, only return the
+            selector for the element in the top-level document (e.g. the
+            iframe or shadow host containing the node). Defaults to False.
+
+    Returns:
+        str: The selector for the node.
+    """
+    target = node.get("target", [])
+    if first_element_only:
+        first_part = target[0] if target else ""
+        return first_part[0] if isinstance(first_part, list) else str(first_part)
+
+    return " >>> ".join(
+        " > ".join(part) if isinstance(part, list) else str(part)
+        for part in node.get("target", [])
+    )
+
+
+class AxeBaseline:
+    """
+    A baseline of known violations, stored as a JSON file of violation
+    fingerprints (a hash of the rule id, normalized selector and page) that
+    can be checked into the repository. Scans can then be checked against
+    the baseline so that only violations not in the baseline cause a
+    failure, and the baseline can be regenerated from the violations
+    recorded during a test run.
+
+    Args:
+        path (str | pathlib.Path): The path to the baseline file.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._fingerprints: set[str] | None = None
+        self._recorded: dict[str, str] = {}
+        self._scanned_pages: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def fingerprints(self) -> set[str]:
+        """
+        The set of fingerprints in the baseline file, loaded on first use.
+        """
+        if self._fingerprints is None:
+            self._fingerprints = set(self._read_file())
+        return self._fingerprints
+
+    @staticmethod
+    def fingerprint(rule_id: str, selector: str, page_key: str) -> tuple[str, str]:
+        """
+        Generates the fingerprint for a violation.
+
+        Args:
+            rule_id (str): The axe-core rule id for the violation.
+            selector (str): The selector for the element with the violation.
+            page_key (str): The page the violation was found on. If this is a
+                full URL, only the path is used so the fingerprint is the same
+                across environments.
+
+        Returns:
+            tuple[str, str]: The fingerprint, and a readable description of the
+                values it was generated from.
+        """
+        page_key = AxeBaseline._baseline_page(page_key)
+        selector = re.sub(r"\s+", " ", selector).strip()
+        selector = re.sub(r":nth-(child|of-type)\(\d+\)", r":nth-\1(n)", selector)
+
+        description = f"{rule_id} | {selector} | {page_key}"
+        return hashlib.sha1(description.encode("utf-8")).hexdigest(), description
+
+    def check(self, results: dict[str, dict], update: bool = False) -> None:
+        """
+        Checks the results provided against the baseline, raising an exception
+        if any violations are found that are not in the baseline.
+
+        Args:
+            results (dict[str, dict]): The axe-core output to check, keyed by
+                the page scanned.
+            update (bool): [Optional] If true, the violations are recorded to
+                regenerate the baseline with (see write), rather than being
+                checked. Defaults to False.
+        """
+        new_violations = []
+        for page_key, result in results.items():
+            if update:
+                with self._lock:
+                    self._scanned_pages.add(AxeBaseline._baseline_page(page_key))
+            for violation in result["violations"]:
+                for node in violation["nodes"]:
+                    fingerprint, description = AxeBaseline.fingerprint(
+                        violation["id"], _node_selector(node), page_key
+                    )
+                    if update:
+                        with self._lock:
+                            self._recorded[fingerprint] = description
+                    elif fingerprint not in self.fingerprints:
+                        new_violations.append(description)
+
+        if new_violations:
+            raise pytest_playwright_axe.AxeAccessibilityException(
+                f"{len(new_violations)} Axe Accessibility Violation(s) not in baseline [{self.path.name}] detected:\n- "
+                + "\n- ".join(new_violations)
+            )
+
+    def write(self, run_id: str) -> None:
+        """
+        Updates the baseline file with the violations recorded. Only the
+        fingerprints for pages scanned in this run are replaced, so a partial
+        run (e.g. using -k) keeps the fingerprints for every other page. If
+        the baseline file has already been written by another process with the
+        same run id (e.g. another pytest-xdist worker), the fingerprints it
+        recorded are kept even for pages this process also scanned.
+
+        Args:
+            run_id (str): The identifier for the test run.
+        """
+        path_hash = hashlib.sha1(str(self.path.resolve()).encode("utf-8")).hexdigest()
+        run_marker = Path(tempfile.gettempdir()) / f"axe-baseline-{path_hash}.run"
+
+        with _file_lock(run_marker.with_suffix(".lock")):
+            with self._lock:
+                recorded = dict(self._recorded)
+                scanned_pages = set(self._scanned_pages)
+            written_this_run = AxeBaseline._read_run_marker(run_marker, run_id)
+
+            fingerprints = {
+                fingerprint: description
+                for fingerprint, description in self._read_file().items()
+                if fingerprint in written_this_run or description.rsplit(" | ", 1)[-1] not in scanned_pages
+            }
+            fingerprints.update(recorded)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump({"fingerprints": dict(sorted(fingerprints.items()))}, file, indent=4)
+            run_marker.write_text(
+                json.dumps({"run_id": run_id, "fingerprints": sorted(written_this_run | set(recorded))}),
+                encoding="utf-8",
+            )
+
+        self._fingerprints = set(fingerprints)
+        logger.info(f"Axe baseline [{self.path}] written with {len(fingerprints)} fingerprints")
+
+    @staticmethod
+    def _baseline_page(page_key: str) -> str:
+        """
+        Returns the page identifier used in fingerprints, which is only the
+        path for a full URL so it is the same across environments.
+        """
+        if urlparse(page_key).scheme in ["http", "https", "file"]:
+            return urlparse(page_key).path or "/"
+        return page_key
+
+    @staticmethod
+    def _read_run_marker(run_marker: Path, run_id: str) -> set[str]:
+        """
+        Returns the fingerprints already written to the baseline by other
+        processes in the run provided.
+        """
+        try:
+            marker = json.loads(run_marker.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return set()
+        if not isinstance(marker, dict) or marker.get("run_id") != run_id:
+            return set()
+        return set(marker.get("fingerprints", []))
+
+    def _read_file(self) -> dict[str, str]:
+        if not self.path.is_file():
+            return {}
+        with open(self.path, "r", encoding="utf-8") as file:
+            return json.load(file).get("fingerprints", {})
+
+
+@contextmanager
+def _file_lock(lock_path: Path, timeout: float = 30) -> Iterator[None]:
+    """
+    Holds an exclusive lock file for the duration of the context, for
+    coordinating writes between processes. Lock files older than the timeout
+    are treated as abandoned and replaced.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > timeout:
+                    lock_path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock file [{lock_path}]")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+
+class _AxeCompat:
+    """
+    The pytest-playwright-axe internals this module depends on, which are not
+    part of its public API and so may change in any release. All access to
+    them goes through this class so they are kept in one place, and
+    requirements.txt pins the pytest-playwright-axe version they have been
+    checked against. The utility tests check that every attribute listed in
+    REQUIRED_ATTRIBUTES still exists, so an upgrade that removes one fails
+    the tests rather than breaking silently.
+    """
+
+    # The attributes of a pytest_playwright_axe.Axe instance used (or
+    # overridden by _BlueprintAxe) within this module
+    REQUIRED_ATTRIBUTES = [
+        "axe_path",
+        "_create_html_report",
+        "_create_json_report",
+        "_modify_filename_for_report",
+        "_css_styling",
+    ]
+
+    # The report methods pytest-playwright-axe calls once a scan completes,
+    # which _BlueprintAxe overrides to generate reports in the background
+    OVERRIDDEN_METHODS = ["_create_html_report", "_create_json_report"]
+
+    @staticmethod
+    def axe_script_path(runner: pytest_playwright_axe.Axe | None = None) -> str:
+        """
+        Returns the path to the axe-core script injected by the runner.
+        """
+        return (runner or pytest_playwright_axe.Axe()).axe_path
+
+    @staticmethod
+    @contextmanager
+    def axe_script_replaced(runner: pytest_playwright_axe.Axe, script_path: str | Path) -> Iterator[None]:
+        """
+        Replaces the axe-core script injected by the runner for the duration
+        of the context.
+        """
+        original_path = runner.axe_path
+        runner.axe_path = script_path
+        try:
+            yield
+        finally:
+            runner.axe_path = original_path
+
+    @staticmethod
+    def report_filename(filename: str) -> str:
+        """
+        Returns the filename pytest-playwright-axe uses for the reports
+        generated for the filename or URL provided.
+        """
+        return pytest_playwright_axe.Axe()._modify_filename_for_report(filename)
+
+    @staticmethod
+    def report_css() -> str:
+        """
+        Returns the <style> element pytest-playwright-axe uses for its HTML
+        reports.
+        """
+        return pytest_playwright_axe.Axe()._css_styling()
+
+    @staticmethod
+    def create_reports(
+        runner: pytest_playwright_axe.Axe,
+        result: dict,
+        filename: str,
+        html_report_generated: bool,
+        json_report_generated: bool,
+    ) -> None:
+        """
+        Generates the reports for a result the runner did not produce itself,
+        using the runner's own report methods so the reports match.
+        """
+        if html_report_generated:
+            runner._create_html_report(result, filename)
+        if json_report_generated:
+            runner._create_json_report(result, filename)
+
+
+class _BlueprintAxe(pytest_playwright_axe.Axe):
+    """
+    Extends the pytest-playwright-axe runner to support the blueprint scan
+    modes:
+
+    - For pages within a browser context registered using
+      Axe.register_context, axe-core is only injected if the init script has
+      not already made it available.
+    - If a report writer is provided, reports are queued to be generated in
+      the background rather than being generated on the test thread.
+
+    The report methods overridden are pytest-playwright-axe internals, so are
+    listed in _AxeCompat.OVERRIDDEN_METHODS and checked by the utility tests.
+    """
+
+    def __init__(
+        self,
+        output_directory: str,
+        registered: bool = False,
+        report_writer: AxeReportWriter | None = None,
+    ) -> None:
+        super().__init__(output_directory=output_directory)
+        self.registered = registered
+        self.report_writer = report_writer
+
+    def run(self, page: Page, *args, **kwargs) -> dict:
+        if self.registered and page.evaluate("() => typeof window.axe !== 'undefined'"):
+            with _AxeCompat.axe_script_replaced(self, AXE_REGISTERED_SCRIPT_PATH):
+                return super().run(page, *args, **kwargs)
+        return super().run(page, *args, **kwargs)
+
+    def _create_json_report(self, data: dict, filename_override: str = "") -> None:
+        if self.report_writer:
+            self.report_writer.submit(super()._create_json_report, data, filename_override)
+        else:
+            super()._create_json_report(data, filename_override)
+
+    def _create_html_report(self, data: dict, filename_override: str = "") -> None:
+        if self.report_writer:
+            self.report_writer.submit(super()._create_html_report, data, filename_override)
+        else:
+            super()._create_html_report(data, filename_override)
 
 
 class Axe():
@@ -16,6 +792,185 @@ class Axe():
     accessibility concerns.
     """
 
+    # The cache used when Axe.run is called with use_cache=True. This can be
+    # replaced with a differently configured AxeResultCache if required.
+    result_cache = AxeResultCache()
+
+    # The report writer used when Axe.run or Axe.run_list is called with
+    # background_reports=True.
+    report_writer = AxeReportWriter()
+
+    # The index of unique violations across the test run, which scans are
+    # added to once enabled (see Axe.enable_summary).
+    violation_index = AxeViolationIndex()
+
+    # If true, scans using a baseline record their violations to regenerate
+    # the baseline with (see Axe.write_baselines) rather than being checked.
+    update_baselines = False
+    _baselines: dict[Path, AxeBaseline] = {}
+
+    # The latest merged result for each page scanned incrementally.
+    _incremental_results: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    # Browser contexts that have had axe-core registered as an init script.
+    _registered_contexts: weakref.WeakSet = weakref.WeakSet()
+
+    @staticmethod
+    def register_context(browser_context: BrowserContext) -> None:
+        """
+        This registers axe-core against a browser context as an init script,
+        so it is available in every page and frame (including after any
+        navigation) without being injected again on each scan. Any calls to
+        Axe.run or Axe.run_list for pages in this context will then only
+        inject axe-core if it is not already present.
+
+        Args:
+            browser_context (playwright.sync_api.BrowserContext): The browser
+                context to register axe-core against.
+        """
+        if browser_context in Axe._registered_contexts:
+            return
+
+        browser_context.add_init_script(path=_AxeCompat.axe_script_path())
+        Axe._registered_contexts.add(browser_context)
+
+    @staticmethod
+    def _runner(page: Page, output_directory: str, background_reports: bool = False) -> pytest_playwright_axe.Axe:
+        """
+        This returns the pytest-playwright-axe runner to use for the page
+        provided, depending on if its browser context has been registered and
+        if reports should be generated in the background.
+        """
+        registered = page.context in Axe._registered_contexts
+        if registered or background_reports:
+            return _BlueprintAxe(
+                output_directory=output_directory,
+                registered=registered,
+                report_writer=Axe.report_writer if background_reports else None,
+            )
+        return pytest_playwright_axe.Axe(output_directory=output_directory)
+
+    @staticmethod
+    def enable_summary(skip_page_reports: bool = False) -> None:
+        """
+        This enables adding the results of every scan to Axe.violation_index,
+        so that a single summary report of unique violations can be written
+        at the end of the test run using Axe.write_summary().
+
+        Args:
+            skip_page_reports (bool): [Optional] If true, the per-page reports
+                are no longer generated, in favour of the summary report. If
+                false (default), the per-page reports are still generated.
+        """
+        Axe.violation_index.enabled = True
+        Axe.violation_index.skip_page_reports = skip_page_reports
+
+    @staticmethod
+    def write_summary(output_directory: str = PATH_FOR_REPORT, filename: str = "axe-summary") -> None:
+        """
+        This writes the HTML and JSON summary report of unique violations
+        from Axe.violation_index, if any pages have been scanned.
+
+        Args:
+            output_directory (str): [Optional] The directory to output the
+                reports to. If not provided, defaults to /axe-reports
+                directory.
+            filename (str): [Optional] The filename (excluding extension) to
+                use for the reports. Defaults to axe-summary.
+        """
+        Axe.violation_index.write_summary(output_directory, filename)
+
+    @staticmethod
+    def write_baselines() -> None:
+        """
+        This regenerates every baseline file used during the test run from the
+        violations recorded, if Axe.update_baselines is set.
+
+        The AXE_BASELINE_RUN_ID environment variable is used to identify the
+        test run, so that when running with pytest-xdist each worker's
+        violations are merged into the same baseline (conftest.py sets this).
+        """
+        if not Axe.update_baselines:
+            return
+
+        run_id = os.environ.setdefault("AXE_BASELINE_RUN_ID", uuid.uuid4().hex)
+        for baseline in Axe._baselines.values():
+            baseline.write(run_id)
+
+    @staticmethod
+    def _baseline(baseline_file: str | Path) -> AxeBaseline | None:
+        """
+        This returns the baseline for the file provided, loading it once per
+        test run.
+        """
+        if not baseline_file:
+            return None
+
+        path = Path(baseline_file).resolve()
+        if path not in Axe._baselines:
+            Axe._baselines[path] = AxeBaseline(path)
+        return Axe._baselines[path]
+
+    @staticmethod
+    def process_results(results: dict[str, dict], strict_mode: bool = False, baseline_file: str | Path = "") -> None:
+        """
+        This adds results produced using Axe.run(defer_processing=True) to
+        the violation index (if enabled), and then checks them against the
+        baseline (if provided) or applies strict mode, in the same way as
+        Axe.run_list().
+
+        Args:
+            results (dict[str, dict]): The axe-core output to process, keyed
+                by the filename or URL to use for each page.
+            strict_mode (bool): [Optional] If true, raise an exception if a
+                violation is detected. If false (default), proceed with test
+                execution.
+            baseline_file (str | pathlib.Path): [Optional] If provided, the
+                path to a baseline file of known violations to check the
+                results against.
+        """
+        Axe._process_results(results, strict_mode, Axe._baseline(baseline_file))
+
+    @staticmethod
+    def _process_results(results: dict[str, dict], strict_mode: bool, baseline: AxeBaseline | None) -> None:
+        """
+        This adds the results provided to the violation index (if enabled),
+        and then checks them against the baseline (if provided) or applies
+        strict mode.
+        """
+        if Axe.violation_index.enabled:
+            for page_key, result in results.items():
+                Axe.violation_index.add(page_key, result)
+
+        if baseline is not None:
+            baseline.check(results, update=Axe.update_baselines)
+        elif strict_mode:
+            Axe._raise_on_violations(list(results.values()))
+
+    @staticmethod
+    def _raise_on_violations(results: list[dict]) -> None:
+        """
+        This raises an exception for the first result provided that has
+        violations, matching the strict mode behaviour of pytest-playwright-axe.
+        """
+        for result in results:
+            if result["violations"]:
+                raise pytest_playwright_axe.AxeAccessibilityException(
+                    f"Axe Accessibility Violation detected on page: {result['url']}"
+                )
+
+    @staticmethod
+    def flush_reports() -> list[str]:
+        """
+        This waits for any reports queued using background_reports=True to be
+        generated.
+
+        Returns:
+            list[str]: A list of errors for any reports that failed to
+                generate since the last flush.
+        """
+        return Axe.report_writer.flush()
+
     @staticmethod
     def run(
         page: Page,
@@ -27,6 +982,11 @@ class Axe():
         strict_mode: bool = False,
         html_report_generated: bool = True,
         json_report_generated: bool = True,
+        use_cache: bool = False,
+        background_reports: bool = False,
+        baseline_file: str | Path = "",
+        incremental: bool = False,
+        defer_processing: bool = False,
     ) -> dict:
         """
         This runs axe-core against the page provided.
@@ -56,23 +1016,187 @@ class Axe():
             json_report_generated (bool): [Optional] If true (default),
                 generates a json report for the page scanned. If false, no
                 json report is generated.
+            use_cache (bool): [Optional] If true, return the stored result
+                from Axe.result_cache if the page has already been scanned in
+                the same state with the same context and options, without
+                executing axe-core or generating reports again. If false
+                (default), always execute axe-core.
+            background_reports (bool): [Optional] If true, any reports are
+                queued to be generated by Axe.report_writer in the background,
+                and the results are returned as soon as axe-core completes.
+                Call Axe.flush_reports() to wait for the reports to be
+                generated (conftest.py does this at the end of the test run).
+                If false (default), reports are generated before returning.
+            baseline_file (str | pathlib.Path): [Optional] If provided, the
+                path to a baseline file of known violations. An exception is
+                raised only if a violation is found that is not in the
+                baseline (strict_mode is not applied). If Axe.update_baselines
+                is set, the violations are instead recorded to regenerate the
+                baseline with at the end of the test run.
+            incremental (bool): [Optional] If true, only the regions of the
+                page that have changed since the last incremental scan of the
+                page are scanned, with the results merged into the result from
+                the previous scan. The first incremental scan of a page (and
+                any scan following navigation) scans the whole page. Cannot be
+                used with the context argument. If false (default), the whole
+                page is scanned.
+            defer_processing (bool): [Optional] If true, the result is not
+                added to the violation index, checked against a baseline or
+                checked using strict mode, so that results can be processed
+                together afterwards using Axe.process_results(). If false
+                (default), the result is processed before returning.
 
         Returns:
             dict: A Python dictionary with the axe-core output of the page
                 scanned.
         """
-        return pytest_playwright_axe.Axe(
-            output_directory=output_directory
-        ).run(
-            page=page,
-            filename=filename,
-            context=context,
-            options=options,
-            report_on_violation_only=report_on_violation_only,
-            strict_mode=strict_mode,
-            html_report_generated=html_report_generated,
-            json_report_generated=json_report_generated,
-        )
+        index = Axe.violation_index
+        if index.enabled and index.skip_page_reports:
+            html_report_generated = json_report_generated = False
+        baseline = Axe._baseline(baseline_file)
+
+        if use_cache:
+            cache_key = Axe.result_cache.key_for(page, context, options)
+            cached_result = Axe.result_cache.get(cache_key)
+            if cached_result is not None:
+                if not defer_processing:
+                    Axe._process_results(
+                        {filename or cached_result.get("url", ""): cached_result}, strict_mode, baseline
+                    )
+                return cached_result
+
+        # Strict mode is left to pytest-playwright-axe unless the result needs
+        # adding to the index or checking against a baseline first
+        runner = Axe._runner(page, output_directory, background_reports)
+        scan_args = {
+            "filename": filename,
+            "options": options,
+            "report_on_violation_only": report_on_violation_only,
+            "strict_mode": strict_mode and not index.enabled and baseline is None and not defer_processing,
+            "html_report_generated": html_report_generated,
+            "json_report_generated": json_report_generated,
+        }
+        if incremental:
+            if context:
+                raise pytest_playwright_axe.AxeAccessibilityException(
+                    "A context cannot be provided for an incremental scan."
+                )
+            result = Axe._run_incremental(page, runner, **scan_args)
+        else:
+            result = runner.run(page=page, context=context, **scan_args)
+
+        if use_cache:
+            Axe.result_cache.put(cache_key, result)
+
+        if (index.enabled or baseline is not None) and not defer_processing:
+            Axe._process_results({filename or result.get("url", ""): result}, strict_mode, baseline)
+        return result
+
+    @staticmethod
+    def _run_incremental(
+        page: Page,
+        runner: pytest_playwright_axe.Axe,
+        filename: str,
+        options: str,
+        report_on_violation_only: bool,
+        strict_mode: bool,
+        html_report_generated: bool,
+        json_report_generated: bool,
+    ) -> dict:
+        """
+        This scans the regions of the page that have changed since the last
+        incremental scan, and merges the results into the previous result.
+
+        If the page has not been scanned incrementally before (or the page has
+        navigated since, losing the MutationObserver), the whole page is
+        scanned and a MutationObserver is installed to track changes.
+        """
+        previous_result = Axe._incremental_results.get(page)
+        changed_regions = page.evaluate(INCREMENTAL_MARK_SCRIPT) if previous_result else -1
+
+        if changed_regions < 0:
+            result = runner.run(
+                page=page,
+                filename=filename,
+                options=options,
+                report_on_violation_only=report_on_violation_only,
+                strict_mode=strict_mode,
+                html_report_generated=html_report_generated,
+                json_report_generated=json_report_generated,
+            )
+            page.evaluate(INCREMENTAL_OBSERVE_SCRIPT)
+            Axe._incremental_results[page] = copy.deepcopy(result)
+            return result
+
+        if changed_regions == 0:
+            result = copy.deepcopy(previous_result)
+        else:
+            try:
+                region_result = runner.run(
+                    page=page,
+                    context=INCREMENTAL_CONTEXT,
+                    options=options,
+                    strict_mode=False,
+                    html_report_generated=False,
+                    json_report_generated=False,
+                )
+                previous_selectors = {
+                    _node_selector(node, first_element_only=True)
+                    for category in AXE_RESULT_CATEGORIES
+                    for rule in previous_result[category]
+                    for node in rule["nodes"]
+                }
+                stale_selectors = set(page.evaluate(INCREMENTAL_STALE_SCRIPT, sorted(previous_selectors)))
+            finally:
+                page.evaluate(INCREMENTAL_UNMARK_SCRIPT)
+
+            result = Axe._merge_incremental_results(previous_result, region_result, stale_selectors)
+            Axe._incremental_results[page] = copy.deepcopy(result)
+
+        logger.info(f"Axe incremental scan of [{result['url']}]: Changed regions scanned = {changed_regions}")
+
+        if not report_on_violation_only or result["violations"]:
+            _AxeCompat.create_reports(runner, result, filename, html_report_generated, json_report_generated)
+
+        if strict_mode:
+            Axe._raise_on_violations([result])
+
+        return result
+
+    @staticmethod
+    def _merge_incremental_results(previous_result: dict, region_result: dict, stale_selectors: set[str]) -> dict:
+        """
+        This merges the result of scanning the changed regions of a page into
+        the previous result for the page, replacing any nodes from the
+        previous result that are now stale (no longer present, or within a
+        changed region).
+        """
+        merged_result = copy.deepcopy(region_result)
+        rules_with_nodes = set()
+
+        for category in AXE_RESULT_CATEGORIES:
+            rules = {}
+            for rule in previous_result[category]:
+                rules[rule["id"]] = {
+                    **rule,
+                    "nodes": [
+                        node for node in rule["nodes"]
+                        if _node_selector(node, first_element_only=True) not in stale_selectors
+                    ],
+                }
+            for rule in copy.deepcopy(region_result[category]):
+                if rule["id"] in rules:
+                    rules[rule["id"]]["nodes"].extend(rule["nodes"])
+                else:
+                    rules[rule["id"]] = rule
+
+            if category == "inapplicable":
+                merged_result[category] = [rule for rule in rules.values() if rule["id"] not in rules_with_nodes]
+            else:
+                merged_result[category] = [rule for rule in rules.values() if rule["nodes"]]
+                rules_with_nodes.update(rule["id"] for rule in merged_result[category])
+
+        return merged_result
 
     @staticmethod
     def run_list(
@@ -86,6 +1210,12 @@ class Axe():
         strict_mode: bool = False,
         html_report_generated: bool = True,
         json_report_generated: bool = True,
+        workers: int = 1,
+        base_url: str = "",
+        background_reports: bool = False,
+        baseline_file: str | Path = "",
+        browser_launch_args: dict | None = None,
+        browser_context_args: dict | None = None,
     ) -> dict:
         """
         This runs axe-core against a list of pages provided.
@@ -123,22 +1253,178 @@ class Axe():
             json_report_generated (bool): [Optional] If true (default),
                 generates a json report for the page scanned. If false, no
                 json report is generated.
+            workers (int): [Optional] The number of pages to scan
+                concurrently. If 1 (default), the pages are scanned one after
+                another using the page provided. If greater than 1, the
+                page_list is split between this many browser instances (of
+                the same browser type as the page provided, and seeded with
+                its storage state and viewport) which scan their pages in
+                parallel.
+            base_url (str): [Optional] The base URL to resolve partial URLs
+                against when workers is greater than 1. This should match
+                the --base-url value used for the test run. If not provided,
+                any base_url in browser_context_args is used.
+            background_reports (bool): [Optional] If true, any reports are
+                queued to be generated by Axe.report_writer in the background
+                (see Axe.run for further details). If false (default), reports
+                are generated as each page is scanned.
+            baseline_file (str | pathlib.Path): [Optional] If provided, the
+                path to a baseline file of known violations to check each page
+                against (see Axe.run for further details).
+            browser_launch_args (dict): [Optional] The arguments to launch
+                each worker's browser with when workers is greater than 1,
+                such as the browser_type_launch_args fixture provided by
+                pytest-playwright.
+            browser_context_args (dict): [Optional] The arguments to create
+                each worker's browser context with when workers is greater
+                than 1, such as the browser_context_args fixture provided by
+                pytest-playwright. The storage state of the page provided is
+                always used.
 
         Returns:
             dict: A Python dictionary with the axe-core output of all the
                 pages scanned, with the page list used as the key for each
                 report.
         """
-        return pytest_playwright_axe.Axe(
-            output_directory=output_directory
-        ).run_list(
-            page=page,
-            page_list=page_list,
-            use_list_for_filename=use_list_for_filename,
-            context=context,
-            options=options,
-            report_on_violation_only=report_on_violation_only,
-            strict_mode=strict_mode,
-            html_report_generated=html_report_generated,
-            json_report_generated=json_report_generated,
+        index = Axe.violation_index
+        if index.enabled and index.skip_page_reports:
+            html_report_generated = json_report_generated = False
+        baseline = Axe._baseline(baseline_file)
+
+        if workers > 1:
+            results = Axe._run_list_concurrently(
+                page=page,
+                page_list=page_list,
+                workers=workers,
+                base_url=base_url,
+                browser_launch_args=browser_launch_args or {},
+                browser_context_args=browser_context_args or {},
+                use_list_for_filename=use_list_for_filename,
+                output_directory=output_directory,
+                context=context,
+                options=options,
+                report_on_violation_only=report_on_violation_only,
+                html_report_generated=html_report_generated,
+                json_report_generated=json_report_generated,
+                background_reports=background_reports,
+            )
+        else:
+            # Strict mode is left to pytest-playwright-axe unless the results
+            # need adding to the index or checking against a baseline first
+            results = Axe._runner(page, output_directory, background_reports).run_list(
+                page=page,
+                page_list=page_list,
+                use_list_for_filename=use_list_for_filename,
+                context=context,
+                options=options,
+                report_on_violation_only=report_on_violation_only,
+                strict_mode=strict_mode and not index.enabled and baseline is None,
+                html_report_generated=html_report_generated,
+                json_report_generated=json_report_generated,
+            )
+
+        Axe._process_results(results, strict_mode, baseline)
+        return results
+
+    @staticmethod
+    def _run_list_concurrently(
+        page: Page,
+        page_list: list[str | dict],
+        workers: int,
+        base_url: str,
+        browser_launch_args: dict,
+        browser_context_args: dict,
+        use_list_for_filename: bool,
+        output_directory: str,
+        background_reports: bool,
+        **scan_args,
+    ) -> dict:
+        """
+        This splits the page list between a number of workers, each scanning
+        its share of the list in its own browser instance, and then combines
+        the results in the original page list order.
+
+        Playwright's sync API cannot be shared between threads, so each worker
+        starts its own Playwright instance. The filenames used for reports are
+        derived from the page list in the same way as a sequential scan, so
+        the output is identical regardless of the number of workers used.
+
+        Each worker's browser context is created with the context arguments
+        provided, along with the viewport and storage state of the page
+        provided, so pages that need a login or a particular viewport give the
+        same results as a sequential scan.
+        """
+        if any(isinstance(entry, dict) for entry in page_list):
+            raise pytest_playwright_axe.AxeAccessibilityException(
+                "Dictionary page entries cannot be scanned with workers > 1, "
+                "as their locators are bound to the page provided."
+            )
+
+        unique_pages = list(dict.fromkeys(page_list))
+        chunks = [unique_pages[index::workers] for index in range(min(workers, len(unique_pages)))]
+        if not chunks:
+            return {}
+
+        browser = page.context.browser
+        browser_name = browser.browser_type.name if browser else "chromium"
+        context_args = dict(browser_context_args)
+        if page.viewport_size is not None:
+            context_args.setdefault("viewport", page.viewport_size)
+        if base_url:
+            context_args["base_url"] = base_url
+        context_args["storage_state"] = page.context.storage_state()
+        logger.info(f"Scanning {len(unique_pages)} pages using {len(chunks)} workers")
+
+        chunk_results = {}
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = [
+                executor.submit(
+                    Axe._run_list_worker,
+                    chunk,
+                    browser_name,
+                    browser_launch_args,
+                    context_args,
+                    use_list_for_filename,
+                    output_directory,
+                    background_reports,
+                    scan_args,
+                )
+                for chunk in chunks
+            ]
+            for future in futures:
+                chunk_results.update(future.result())
+
+        return {entry: chunk_results[entry] for entry in unique_pages}
+
+    @staticmethod
+    def _run_list_worker(
+        page_list: list[str],
+        browser_name: str,
+        launch_args: dict,
+        context_args: dict,
+        use_list_for_filename: bool,
+        output_directory: str,
+        background_reports: bool,
+        scan_args: dict,
+    ) -> dict:
+        """
+        This scans a share of the page list in a dedicated browser instance.
+        """
+        runner = (
+            _BlueprintAxe(output_directory=output_directory, report_writer=Axe.report_writer)
+            if background_reports
+            else pytest_playwright_axe.Axe(output_directory=output_directory)
         )
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, browser_name).launch(**launch_args)
+            try:
+                browser_context = browser.new_context(**context_args)
+                return runner.run_list(
+                    page=browser_context.new_page(),
+                    page_list=page_list,
+                    use_list_for_filename=use_list_for_filename,
+                    strict_mode=False,
+                    **scan_args,
+                )
+            finally:
+                browser.close()
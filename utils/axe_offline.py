@@ -0,0 +1,161 @@
+import glob
+import logging
+import multiprocessing
+import os
+import re
+import pytest_playwright_axe
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from playwright.sync_api import sync_playwright
+from utils.axe import Axe, PATH_FOR_REPORT, _AxeCompat
+
+
+logger = logging.getLogger(__name__)
+
+
+class AxeOffline():
+    """
+    This utility allows for axe-core to be run against saved HTML snapshots
+    of pages, without needing to drive the application under test. Each
+    snapshot is loaded from the local filesystem with all network access
+    blocked, so the results are fast and deterministic.
+    """
+
+    @staticmethod
+    def run_snapshots(
+        source: str | Path,
+        output_directory: str = PATH_FOR_REPORT,
+        options: str = pytest_playwright_axe.OPTIONS_WCAG_22AA,
+        report_on_violation_only: bool = False,
+        strict_mode: bool = False,
+        html_report_generated: bool = True,
+        json_report_generated: bool = True,
+        workers: int | None = None,
+        browser_name: str = "chromium",
+    ) -> dict:
+        """
+        This runs axe-core against each HTML snapshot found in the source
+        provided, spreading the snapshots across a pool of processes.
+
+        Args:
+            source (str | pathlib.Path): The directory to scan .html files
+                within (including subdirectories), or a glob pattern for the
+                files to scan (e.g. "snapshots/**/dashboard*.html").
+            output_directory (str): [Optional] The directory to output the
+                reports to. If not provided, defaults to /axe-reports
+                directory.
+            options (str): [Optional] If provided, a stringified JavaScript
+                object to denote the options axe-core should use. If not
+                provided, defaults to WCAG 2.2 AA standard.
+            report_on_violation_only (bool): [Optional] If true, only
+                generates an Axe report if a violation is detected. If false
+                (default), always generate a report.
+            strict_mode (bool): [Optional] If true, raise an exception once
+                all snapshots have been scanned if a violation is detected.
+                If false (default), proceed with test execution.
+            html_report_generated (bool): [Optional] If true (default),
+                generates a html report for each snapshot scanned. If false,
+                no html report is generated.
+            json_report_generated (bool): [Optional] If true (default),
+                generates a json report for each snapshot scanned. If false,
+                no json report is generated.
+            workers (int): [Optional] The number of processes to use. If not
+                provided, defaults to the number of CPUs available. If 1, the
+                snapshots are scanned within the current process.
+            browser_name (str): [Optional] The browser to use, which can be
+                one of chromium (default), firefox or webkit.
+
+        Returns:
+            dict: A Python dictionary with the axe-core output of all the
+                snapshots scanned, with the path of each snapshot (relative to
+                the source directory, or as matched by the glob pattern) used
+                as the key for each report.
+        """
+        snapshots = AxeOffline._snapshot_files(source)
+        if not snapshots:
+            logger.warning(f"No HTML snapshots found for [{source}]")
+            return {}
+
+        violation_index = Axe.violation_index
+        if violation_index.enabled and violation_index.skip_page_reports:
+            html_report_generated = json_report_generated = False
+        scan_args = {
+            "output_directory": output_directory,
+            "options": options,
+            "report_on_violation_only": report_on_violation_only,
+            "html_report_generated": html_report_generated,
+            "json_report_generated": json_report_generated,
+        }
+        workers = min(workers or os.cpu_count() or 1, len(snapshots))
+        logger.info(f"Scanning {len(snapshots)} HTML snapshots using {workers} workers")
+
+        if workers == 1:
+            chunk_results = _scan_snapshots(snapshots, browser_name, scan_args)
+        else:
+            chunk_results = {}
+            snapshot_list = list(snapshots.items())
+            chunks = [dict(snapshot_list[index::workers]) for index in range(workers)]
+            # Spawned (rather than forked) processes are used, as forking a
+            # process with a running Playwright instance is not safe
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    executor.submit(_scan_snapshots, chunk, browser_name, scan_args)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    chunk_results.update(future.result())
+
+        # The results are processed only here, as the violation index for any
+        # worker process is not shared with this process
+        results = {key: chunk_results[key] for key in snapshots}
+        Axe.process_results(results, strict_mode)
+        return results
+
+    @staticmethod
+    def _snapshot_files(source: str | Path) -> dict[str, Path]:
+        """
+        This returns the HTML snapshots to scan, keyed by the identifier to use
+        for each snapshot, in a consistent order.
+        """
+        source_path = Path(source)
+        if source_path.is_dir():
+            return {
+                file.relative_to(source_path).as_posix(): file.resolve()
+                for file in sorted(source_path.rglob("*.html"))
+            }
+
+        return {
+            Path(file).as_posix(): Path(file).resolve()
+            for file in sorted(glob.glob(str(source), recursive=True))
+            if Path(file).is_file()
+        }
+
+
+def _scan_snapshots(snapshots: dict[str, Path], browser_name: str, scan_args: dict) -> dict:
+    """
+    This scans a share of the snapshots in a dedicated browser instance, with
+    any requests over the network aborted.
+    """
+    results = {}
+    with sync_playwright() as playwright:
+        browser = getattr(playwright, browser_name).launch()
+        try:
+            browser_context = browser.new_context()
+            browser_context.route(re.compile(r"^(?!file:|data:|about:)"), lambda route: route.abort())
+            Axe.register_context(browser_context)
+            page = browser_context.new_page()
+
+            for key, snapshot in snapshots.items():
+                page.goto(snapshot.as_uri())
+                results[key] = Axe.run(
+                    page=page,
+                    filename=_AxeCompat.report_filename(key),
+                    defer_processing=True,
+                    **scan_args,
+                )
+        finally:
+            browser.close()
+
+    return results
@@ -1,4 +1,24 @@
-from datetime import datetime, timedelta
+import json
+import threading
+import weakref
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    import numpy
+    from playwright.sync_api import BrowserContext, Page
+
+
+BANK_HOLIDAYS_FILE = Path(__file__).parent / "resources" / "bank_holidays.json"
+BANK_HOLIDAY_DIVISION = "england-and-wales"
+
+# Working day indexes built from bank holiday files, keyed by file path and division
+_WORKING_DAY_INDEXES: dict[tuple[Path, str], "_WorkingDayIndex"] = {}
+_WORKING_DAY_INDEXES_LOCK = threading.Lock()
+
+# Browser contexts which have had a virtual clock installed, as the clock is shared by every page in the context
+_CLOCK_CONTEXTS: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
 
 
 class DateTimeUtils:
@@ -7,15 +27,18 @@ class DateTimeUtils:
     """
 
     @staticmethod
-    def current_datetime(format_date: str = "%d/%m/%Y %H:%M") -> str:
+    def current_datetime(format_date: str = "%d/%m/%Y %H:%M", page: "Page | None" = None) -> str:
         """Gets the current datetime in the specified format.
 
         Args:
             format_date (str): [Optional] The format to return the current datetime in. Defaults to dd/mm/yyyy hh:mm if not provided.
+            page (Page): [Optional] If provided and the page has a virtual clock installed, the current datetime of the page's clock is used.
 
         Returns:
             str: The current datetime in the specified format.
         """
+        if page is not None and page.context in _CLOCK_CONTEXTS:
+            return DateTimeUtils.page_datetime(page).strftime(format_date)
         return datetime.now().strftime(format_date)
 
     @staticmethod
@@ -67,3 +90,241 @@ class DateTimeUtils:
             str: The day of the week relating to the specified date.
         """
         return date.strftime("%A")
+
+    @staticmethod
+    def is_working_day(date: date | datetime) -> bool:
+        """Checks if the specified date is a working day (not a weekend or bank holiday).
+
+        Args:
+            date (date | datetime): The date to check.
+
+        Returns:
+            bool: True if the specified date is a working day, otherwise False.
+        """
+        index = _WorkingDayIndex.get()
+        offset = index.offset(date)
+        return index.cumulative[offset + 1] > index.cumulative[offset]
+
+    @staticmethod
+    def add_working_days(date: date | datetime, days: int) -> date | datetime:
+        """Adds a specified number of working days (excluding weekends and bank holidays) to a specified date.
+        If the specified date is not a working day, adding 1 working day returns the next working day (and
+        subtracting 1 working day returns the previous working day).
+
+        Args:
+            date (date | datetime): The date to which the working days will be added.
+            days (int): The number of working days to add to the specified date, which can be negative.
+
+        Returns:
+            date | datetime: The specified date plus the number of specified working days, keeping the same time
+            if a datetime is provided.
+        """
+        if days == 0:
+            return date
+
+        index = _WorkingDayIndex.get()
+        offset = index.offset(date)
+        # The number of working days before the specified date, and up to and including the specified date
+        before, up_to = index.cumulative[offset], index.cumulative[offset + 1]
+        position = up_to - 1 + days if days > 0 else before + days
+        if not 0 <= position < len(index.working_days):
+            raise DateTimeUtilsException(
+                f"Adding {days} working days to {date:%d/%m/%Y} is outside the bank holiday calendar "
+                f"({index.start:%d/%m/%Y} to {index.end:%d/%m/%Y})"
+            )
+
+        return date + timedelta(days=index.working_days[position] - date.toordinal())
+
+    @staticmethod
+    def working_days_between(start_date: date | datetime, end_date: date | datetime) -> int:
+        """Counts the number of working days (excluding weekends and bank holidays) after the start date, up to and
+        including the end date. This is negative if the end date is before the start date.
+
+        Args:
+            start_date (date | datetime): The date to count working days from.
+            end_date (date | datetime): The date to count working days to.
+
+        Returns:
+            int: The number of working days between the specified dates.
+        """
+        index = _WorkingDayIndex.get()
+        return index.cumulative[index.offset(end_date) + 1] - index.cumulative[index.offset(start_date) + 1]
+
+    @staticmethod
+    def add_working_days_array(
+        dates: "Sequence[date | datetime] | numpy.ndarray", days: "int | Sequence[int] | numpy.ndarray"
+    ) -> "numpy.ndarray":
+        """Adds a specified number of working days to each of the specified dates in a single vectorised operation,
+        in the same way as add_working_days(). This requires numpy to be installed.
+
+        Args:
+            dates (Sequence[date | datetime] | numpy.ndarray): The dates to which the working days will be added.
+            days (int | Sequence[int] | numpy.ndarray): The number of working days to add, either as a single value
+            for all dates or one value per date.
+
+        Returns:
+            numpy.ndarray: An array of numpy datetime64 dates (without times) for each of the specified dates plus
+            the number of specified working days.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise DateTimeUtilsException(
+                "numpy is required for add_working_days_array(), and can be installed using: pip install numpy"
+            ) from e
+
+        index = _WorkingDayIndex.get()
+        start = np.datetime64(index.start, "D")
+        cumulative = np.asarray(index.cumulative)
+        working_days = np.asarray(index.working_days, dtype=np.int64) - index.start.toordinal() + start
+
+        dates = np.asarray(dates, dtype="datetime64[D]").reshape(-1)
+        days = np.broadcast_to(np.asarray(days, dtype=np.int64), dates.shape)
+        offsets = (dates - start).astype(np.int64)
+        if ((offsets < 0) | (offsets >= len(cumulative) - 1)).any():
+            raise DateTimeUtilsException(
+                f"A date provided is outside the bank holiday calendar ({index.start:%d/%m/%Y} to {index.end:%d/%m/%Y})"
+            )
+
+        positions = np.where(days > 0, cumulative[offsets + 1] - 1 + days, cumulative[offsets] + days)
+        out_of_range = (days != 0) & ((positions < 0) | (positions >= len(working_days)))
+        if out_of_range.any():
+            raise DateTimeUtilsException(
+                f"Adding working days to a date provided is outside the bank holiday calendar "
+                f"({index.start:%d/%m/%Y} to {index.end:%d/%m/%Y})"
+            )
+
+        return np.where(days == 0, dates, working_days[np.clip(positions, 0, len(working_days) - 1)])
+
+    @staticmethod
+    def install_clock(page: "Page", time: datetime | None = None) -> None:
+        """Installs a virtual clock on the specified page, so the page's time can be controlled using the other clock
+        functions instead of waiting in real time. The clock continues to run from the time provided until paused. The
+        clock belongs to the page's browser context, so it also applies to any other pages in the same context.
+
+        Args:
+            page (Page): The page to install the virtual clock on.
+            time (datetime): [Optional] The datetime to start the clock from. Defaults to the current datetime if not provided.
+        """
+        page.clock.install(time=time or datetime.now())
+        _CLOCK_CONTEXTS.add(page.context)
+
+    @staticmethod
+    def freeze_clock(page: "Page", time: datetime | None = None) -> None:
+        """Pauses the page's virtual clock at the specified datetime, so no time passes and no timers run until the clock is
+        moved on or resumed. A virtual clock is installed on the page first if needed.
+
+        Args:
+            page (Page): The page to freeze the time for.
+            time (datetime): [Optional] The datetime to pause the clock at, which must not be before the page's current datetime.
+                Defaults to one second after the page's current datetime if not provided.
+        """
+        DateTimeUtils._ensure_clock(page)
+        # The clock keeps running until it is paused, and Playwright cannot pause it at a datetime that has already
+        # passed, so by default pause it just ahead of the page's current datetime
+        page.clock.pause_at(time or DateTimeUtils.page_datetime(page) + timedelta(seconds=1))
+
+    @staticmethod
+    def fast_forward_clock(page: "Page", duration: timedelta) -> None:
+        """Moves the page's virtual clock forward by the specified duration, firing any timers that became due once (as if
+        the device had been asleep). A virtual clock is installed on the page first if needed.
+
+        Args:
+            page (Page): The page to move the time forward for.
+            duration (timedelta): The amount of time to move the clock forward by.
+        """
+        DateTimeUtils._ensure_clock(page)
+        page.clock.fast_forward(round(duration.total_seconds() * 1000))
+
+    @staticmethod
+    def run_clock_for(page: "Page", duration: timedelta) -> None:
+        """Moves the page's virtual clock forward by the specified duration, firing every timer and interval due within
+        that time in order (e.g. each tick of a countdown). A virtual clock is installed on the page first if needed.
+
+        Args:
+            page (Page): The page to move the time forward for.
+            duration (timedelta): The amount of time to move the clock forward by.
+        """
+        DateTimeUtils._ensure_clock(page)
+        page.clock.run_for(round(duration.total_seconds() * 1000))
+
+    @staticmethod
+    def resume_clock(page: "Page") -> None:
+        """Resumes a paused virtual clock on the specified page, so time passes in real time from the page's current datetime.
+
+        Args:
+            page (Page): The page to resume the time for.
+        """
+        DateTimeUtils._ensure_clock(page)
+        page.clock.resume()
+
+    @staticmethod
+    def page_datetime(page: "Page") -> datetime:
+        """Gets the current datetime of the specified page, which reflects any virtual clock installed on the page.
+
+        Args:
+            page (Page): The page to get the current datetime for.
+
+        Returns:
+            datetime: The current datetime of the page, in the local timezone.
+        """
+        return datetime.fromtimestamp(page.evaluate("Date.now()") / 1000)
+
+    @staticmethod
+    def _ensure_clock(page: "Page") -> None:
+        """Installs a virtual clock on the specified page from the current datetime, if not already installed on the
+        page's browser context."""
+        if page.context not in _CLOCK_CONTEXTS:
+            DateTimeUtils.install_clock(page)
+
+
+class _WorkingDayIndex:
+    """
+    A precomputed index of the working days covered by a bank holiday file, which allows working day calculations
+    to be done with a constant number of lookups regardless of the number of days involved.
+    """
+
+    def __init__(self, bank_holidays_file: Path, division: str) -> None:
+        with open(bank_holidays_file, "r", encoding="utf-8") as file:
+            events = json.load(file)[division]["events"]
+
+        bank_holidays = {date.fromisoformat(event["date"]) for event in events}
+        # The index covers every full year included in the bank holiday file
+        self.start = date(min(bank_holidays).year, 1, 1)
+        self.end = date(max(bank_holidays).year, 12, 31)
+
+        # The ordinals of each working day in order, and the number of working days before each day in the index
+        self.working_days: list[int] = []
+        self.cumulative: list[int] = [0]
+        for ordinal in range(self.start.toordinal(), self.end.toordinal() + 1):
+            day = date.fromordinal(ordinal)
+            if day.weekday() < 5 and day not in bank_holidays:
+                self.working_days.append(ordinal)
+            self.cumulative.append(len(self.working_days))
+
+    def offset(self, day: date | datetime) -> int:
+        """
+        Returns the number of days the date provided is from the start of the index.
+        """
+        offset = day.toordinal() - self.start.toordinal()
+        if not 0 <= offset < len(self.cumulative) - 1:
+            raise DateTimeUtilsException(
+                f"The date {day:%d/%m/%Y} is outside the bank holiday calendar "
+                f"({self.start:%d/%m/%Y} to {self.end:%d/%m/%Y})"
+            )
+        return offset
+
+    @staticmethod
+    def get() -> "_WorkingDayIndex":
+        """
+        Returns the working day index for the current bank holiday file and division, building it if needed.
+        """
+        key = (Path(BANK_HOLIDAYS_FILE), BANK_HOLIDAY_DIVISION)
+        with _WORKING_DAY_INDEXES_LOCK:
+            if key not in _WORKING_DAY_INDEXES:
+                _WORKING_DAY_INDEXES[key] = _WorkingDayIndex(*key)
+            return _WORKING_DAY_INDEXES[key]
+
+
+class DateTimeUtilsException(Exception):
+    pass
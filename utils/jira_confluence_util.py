@@ -1,16 +1,195 @@
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import random
 import re
+import requests
 import shutil
+import tempfile
+import threading
+import time
+import zipfile
 from atlassian import Jira, Confluence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from dotenv import load_dotenv
 from git import Repo
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Any, Callable, Iterator
+from utils.artifact_manifest import ArtifactManifest
 
 # Paths to file locations in this project
 ROOT_DIR = Path(__file__).resolve().parent.parent
 LOCAL_ENV_PATH = ROOT_DIR.joinpath("local.env")
 RESULTS_DIR = ROOT_DIR.joinpath("test-results")
+UPLOAD_MANIFEST_PATH = ROOT_DIR.joinpath(".jira-upload-manifest.json")
+
+# The Jira attachment size limit, which files need to be below to be uploaded
+JIRA_FILE_SIZE_LIMIT = 10 * 1024 * 1024
+
+# The maximum number of keep-alive connections to hold open to Jira, shared across parallel uploads
+JIRA_CONNECTION_POOL_SIZE = 10
+
+# How long (in seconds) issue data retrieved from Jira is reused for before being retrieved again
+ISSUE_DATA_CACHE_TTL = 60
+
+# The amount of results.json to read at a time when finding failed tests
+RESULTS_JSON_READ_CHUNK_SIZE = 64 * 1024
+
+# The name used for bundles of files uploaded as a single attachment, and the index file included in each bundle
+BUNDLE_NAME_PREFIX = "results-bundle-"
+BUNDLE_INDEX_NAME = "index.csv"
+
+# File types that are already compressed, so are stored in bundles without compressing them again
+COMPRESSED_FILE_TYPES = {".zip", ".png", ".jpg", ".jpeg", ".webm", ".gz"}
+
+# Whitespace allowed between values in a JSON file
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# The test outcomes in results.json treated as failures when only uploading evidence for failed tests
+FAILED_TEST_OUTCOMES = {"failed", "error"}
+
+# Jira clients shared by all instances in this process, keyed by Jira URL and API key
+_JIRA_CLIENTS: dict[tuple[str, str], Jira] = {}
+_JIRA_CLIENTS_LOCK = threading.Lock()
+
+# The response status codes from Jira that indicate a request can be retried
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class JiraRequestScheduler:
+    """
+    This schedules requests to Jira, limiting the number of requests in progress at once and the rate of requests
+    (using a token bucket), and retrying any requests that fail due to rate limiting (HTTP 429), a transient server
+    error (HTTP 5xx) or a connection issue. Retries wait for the time given in any Retry-After header (pausing all
+    requests using the scheduler, as the limit applies to all of them), or otherwise use exponential backoff with
+    jitter so that parallel requests do not all retry at the same time. Requests that are not idempotent (such as
+    uploading an attachment or adding a comment) are only retried when Jira has not processed them, which is when
+    rate limited (HTTP 429) or when unavailable (HTTP 503) with a Retry-After header.
+
+    Args:
+        max_concurrent_requests (int): [Optional] The maximum number of requests in progress at once. Defaults to 10.
+        requests_per_second (float): [Optional] The sustained rate of requests allowed. Defaults to 10.
+        burst (int): [Optional] The number of requests that can be made at once before being limited to the sustained rate. Defaults to 10.
+        max_retries (int): [Optional] The number of times to retry a failed request. Defaults to 5.
+        base_delay (float): [Optional] The delay in seconds the exponential backoff starts from. Defaults to 1.
+        max_delay (float): [Optional] The maximum delay in seconds between retries. Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_requests: int = JIRA_CONNECTION_POOL_SIZE,
+        requests_per_second: float = 10,
+        burst: int = 10,
+        max_retries: int = 5,
+        base_delay: float = 1,
+        max_delay: float = 60,
+    ) -> None:
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_concurrent_requests = max_concurrent_requests
+        self._concurrency = threading.BoundedSemaphore(max_concurrent_requests)
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+
+    def call(self, function: Callable[..., Any], *args: Any, idempotent: bool = True, **kwargs: Any) -> Any:
+        """
+        This calls the function provided (which should make a single request to Jira) once a request is allowed,
+        retrying it if it fails with a retryable error, and returns the result. If idempotent is False, the request
+        is only retried if Jira has definitely not processed it, so it is never made twice.
+        """
+        attempt = 0
+        while True:
+            self._acquire_token()
+            with self._concurrency:
+                try:
+                    return function(*args, **kwargs)
+                except Exception as e:
+                    retry_delay = self._retry_delay(e, attempt, idempotent)
+                    if retry_delay is None or attempt >= self.max_retries:
+                        raise
+                    error = e
+
+            attempt += 1
+            print(f"! INFO: Jira request failed ({error}), retrying in {retry_delay:.1f}s (retry {attempt} of {self.max_retries})")
+            time.sleep(retry_delay)
+
+    def _acquire_token(self) -> None:
+        """
+        This waits until a token is available in the token bucket (and any Retry-After pause has passed), then
+        takes the token.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # The clock the last refill was taken from can be ahead of this one (e.g. if the clock has been
+                # swapped), which must not take tokens away
+                elapsed = max(0.0, now - self._last_refill)
+                self._tokens = min(self.burst, self._tokens + elapsed * self.requests_per_second)
+                self._last_refill = now
+
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.requests_per_second
+
+            time.sleep(wait)
+
+    def _retry_delay(self, error: Exception, attempt: int, idempotent: bool = True) -> float | None:
+        """
+        This returns the number of seconds to wait before retrying a request that failed with the error provided,
+        or None if the request should not be retried.
+        """
+        response = getattr(error, "response", None)
+        if isinstance(error, requests.HTTPError) and response is not None:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return None
+            # Other server errors (and connection issues) can happen after Jira has processed the request
+            if not idempotent and not (
+                response.status_code == 429 or (response.status_code == 503 and "Retry-After" in response.headers)
+            ):
+                return None
+        elif not idempotent or not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return None
+
+        retry_after = self._parse_retry_after(response.headers.get("Retry-After") if response is not None else None)
+        if retry_after is not None:
+            # The server has asked for all requests to wait, not just this one
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            return retry_after
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _parse_retry_after(self, retry_after: str | None) -> float | None:
+        """
+        This returns the number of seconds requested by a Retry-After header value, which can either be a number
+        of seconds or a HTTP date, or None if the value is not provided or invalid.
+        """
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
 
 
 class JiraConfluenceUtil:
@@ -35,6 +214,13 @@ class JiraConfluenceUtil:
         results_dir (pathlib.Path | str): The results directory to scan files within. If not populated, will use [parent-dir-of-this-file]/test-results (the default settings for this project).
     """
 
+    # Schedules all requests to Jira made in this process, so limits apply across all instances and threads
+    request_scheduler = JiraRequestScheduler()
+
+    # Issue data retrieved from Jira and the attachment filenames for each issue, keyed by ticket id
+    _issue_data_cache: dict[str, tuple[float, dict, set[str]]] = {}
+    _issue_data_cache_lock = threading.Lock()
+
     def __init__(self, results_dir: Path | str = RESULTS_DIR) -> None:
         load_dotenv(LOCAL_ENV_PATH, override=False)
         self.jira_url = os.getenv("JIRA_URL", "")
@@ -44,6 +230,8 @@ class JiraConfluenceUtil:
         self.confluence_api_key = os.getenv("CONFLUENCE_API_KEY", "")
         self.jira_ticket_reference = os.getenv("JIRA_TICKET_REFERENCE", "")
         self.results_dir = Path(results_dir)
+        # Temporary directory for any files created for an upload, such as shrunk files and bundles
+        self.upload_temp_dir: Path | None = None
         if not self.results_dir.exists():
             raise ValueError(f"The filepath provided for the results directory is invalid [{str(self.results_dir)}]")
 
@@ -71,8 +259,28 @@ class JiraConfluenceUtil:
         """
         Configures the Jira client if not already set
         """
+        if getattr(self, "jira_client", None) is not None:
+            return
+
         self._can_complete_jira_actions_check()
-        self.jira_client = Jira(url=self.jira_url, token=self.jira_api_key)
+        # One client (and connection pool) is shared by every instance in the process using the same Jira details
+        with _JIRA_CLIENTS_LOCK:
+            client_key = (self.jira_url, self.jira_api_key)
+            if client_key not in _JIRA_CLIENTS:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=JIRA_CONNECTION_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # Retries (including for rate limiting) are left to the request scheduler, which also knows whether
+                # a request is safe to repeat
+                _JIRA_CLIENTS[client_key] = Jira(
+                    url=self.jira_url,
+                    token=self.jira_api_key,
+                    session=session,
+                    backoff_and_retry=False,
+                    retry_with_header=False,
+                )
+            self.jira_client = _JIRA_CLIENTS[client_key]
 
     def _setup_confluence_client(self) -> None:
         """
@@ -83,18 +291,37 @@ class JiraConfluenceUtil:
             url=self.confluence_url, token=self.confluence_api_key
         )
 
-    def get_issue_data(self, ticket_id: str) -> dict | None:
+    def get_issue_data(self, ticket_id: str, use_cache: bool = True) -> dict | None:
         """
         Check if Jira issue exists and returns data if it does, or None if not.
+        Issue data retrieved within the last ISSUE_DATA_CACHE_TTL seconds is reused if use_cache is True.
         """
+        if use_cache:
+            with self._issue_data_cache_lock:
+                cached = self._issue_data_cache.get(ticket_id)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
         try:
             self._setup_jira_client()
-            issue = self.jira_client.get_issue(ticket_id)
-            return issue
+            issue = self.request_scheduler.call(self.jira_client.get_issue, ticket_id)
         except Exception as e:
             print(f"Error checking issue: {e}")
             return None
 
+        if issue:
+            attachment_filenames = {attachment["filename"] for attachment in issue["fields"].get("attachment", [])}
+            with self._issue_data_cache_lock:
+                self._issue_data_cache[ticket_id] = (time.monotonic() + ISSUE_DATA_CACHE_TTL, issue, attachment_filenames)
+        return issue
+
+    def _clear_cached_issue_data(self, ticket_id: str) -> None:
+        """
+        Removes any cached issue data for the ticket provided, for example once attachments have been added.
+        """
+        with self._issue_data_cache_lock:
+            self._issue_data_cache.pop(ticket_id, None)
+
     def get_issue_summary_in_issue_data(self, issue_data: dict) -> str | None:
         return (
             f"{issue_data["key"]} ({issue_data["fields"]["summary"]})"
@@ -108,16 +335,18 @@ class JiraConfluenceUtil:
         """
         Checks if a Jira attachment already exists.
         """
-        for attachment in issue_data["fields"]["attachment"]:
-            if attachment["filename"] == filename:
-                return True
-        return False
+        # Issue data from get_issue_data() has a set of its attachment filenames cached
+        with self._issue_data_cache_lock:
+            cached = self._issue_data_cache.get(issue_data.get("key"))
+        if cached is not None and cached[1] is issue_data:
+            return filename in cached[2]
+
+        return any(attachment["filename"] == filename for attachment in issue_data["fields"]["attachment"])
 
     def is_valid_jira_reference(self, ticket_id: str) -> bool:
         """
         Determine if the ticket reference provided is valid.
         """
-        self._setup_jira_client()
         if not ticket_id:
             print("ERROR: Branch name cannot be empty")
             return False
@@ -182,7 +411,7 @@ class JiraConfluenceUtil:
         """
         This checks that the file provided is below the Jira file size limit (10MB).
         """
-        return file_path.stat().st_size < (10 * 1024 * 1024)
+        return file_path.stat().st_size < JIRA_FILE_SIZE_LIMIT
 
     def _get_files_to_upload_to_jira(
         self,
@@ -190,42 +419,354 @@ class JiraConfluenceUtil:
         include_trace_files: bool,
         include_screenshots: bool,
         include_csv: bool,
+        issue_data: dict | None = None,
+        shrink_oversized_files: bool = False,
+        failed_only: bool = False,
+        bundle_files: bool = False,
     ) -> list[dict[str, str]]:
         """
-        This determines the files that should be uploaded to Jira
+        This determines the files that should be uploaded to Jira. If issue data is provided, any files that are
+        unchanged since they were last uploaded to that Jira ticket are excluded. Any files too big to upload to
+        Jira are skipped, or recompressed (and split into parts if still too big) if shrink_oversized_files is
+        True.
+
+        If a complete artifact manifest was written during the test run, the trace files and screenshots in
+        subdirectories are taken only from the manifest rather than searching the results directory. If the manifest
+        is missing or incomplete (for example, if the test run was interrupted), the results directory is searched
+        instead. The size, hash and test recorded in any manifest are reused for each file.
+
+        If failed_only is True, only the HTML report and the files produced by tests that failed or errored (according
+        to results.json) are included.
+
+        If bundle_files is True, the files other than HTML reports are bundled into as few zip files as possible
+        (each under the Jira file size limit) to upload instead.
         """
         full_file_list = []
 
         if include_html:
             full_file_list.extend(list(self.results_dir.glob("*.html")))
 
-        # Get subdirectories to check for trace files and screenshots dir
-        subdirectories = [d for d in self.results_dir.iterdir() if d.is_dir()]
+        artifacts = {}
+        if ArtifactManifest.manifest_exists(self.results_dir):
+            artifacts = {artifact["path"]: artifact for artifact in ArtifactManifest.read_artifacts(self.results_dir)}
+
+        if ArtifactManifest.manifest_complete(self.results_dir):
+            subdirectory_files = [path for path in artifacts if path.parent != self.results_dir and path.is_file()]
+        else:
+            if artifacts:
+                print(
+                    "! INFO: The artifact manifest was not completed at the end of the test run, so the results "
+                    "directory will be searched instead"
+                )
+            # Get subdirectories to check for trace files and screenshots dir
+            subdirectories = [d for d in self.results_dir.iterdir() if d.is_dir()]
+            subdirectory_files = [file for subdir in subdirectories for file in subdir.glob("*.zip")]
+            subdirectory_files.extend(
+                file for subdir in subdirectories if subdir.name == "screenshot" for file in subdir.glob("*.png")
+            )
 
         if include_trace_files:
-            for subdir in subdirectories:
-                full_file_list.extend(list(subdir.glob("*.zip")))
+            full_file_list.extend(file for file in subdirectory_files if file.suffix == ".zip")
 
         if include_screenshots:
             full_file_list.extend(list(self.results_dir.glob("*.png")))
-            for subdir in subdirectories:
-                if subdir.name == "screenshot":
-                    full_file_list.extend(list(subdir.glob("*.png")))
+            full_file_list.extend(
+                file for file in subdirectory_files if file.suffix == ".png" and file.parent.name == "screenshot"
+            )
 
         if include_csv:
             full_file_list.extend(list(self.results_dir.glob("*.csv")))
 
-        # Check if files are too big and if so, remove them
+        if failed_only:
+            full_file_list = self._remove_files_for_passed_tests(full_file_list, artifacts)
+
+        # Check if files are too big and if so, shrink or remove them
         file_too_big_list = []
         for file in full_file_list:
             if not self.is_file_is_less_than_jira_file_limit(file):
                 file_too_big_list.append(file)
-                print(f"! INFO: {file.name} is too big to upload to Jira (> 10MB) so will be skipped")
+                if not shrink_oversized_files:
+                    print(
+                        f"! INFO: {file.name} is too big to upload to Jira (> 10MB) so will be skipped "
+                        "(use --shrink-oversized to recompress or split it instead)"
+                    )
+
+        if not shrink_oversized_files:
+            for file in file_too_big_list:
+                full_file_list.remove(file)
+
+        file_data = self._generate_file_data_dict(full_file_list)
+        for file_info in file_data:
+            # Keep the details recorded during the test run, so the file does not need hashing again
+            if file_info["path"] in artifacts:
+                for key in ["size", "sha256", "nodeid", "outcome"]:
+                    file_info[key] = artifacts[file_info["path"]][key]
+        if file_too_big_list and shrink_oversized_files:
+            file_data = self._shrink_oversized_files(file_data, file_too_big_list)
+        if issue_data is not None:
+            file_data = self._remove_unchanged_files(issue_data, file_data)
+        if bundle_files:
+            file_data = self._bundle_files(file_data)
+
+        return file_data
+
+    def _remove_files_for_passed_tests(self, file_list: list[Path], artifacts: dict[Path, dict]) -> list[Path]:
+        """
+        This removes any files that were not produced by a test that failed or errored, keeping the HTML report. Files
+        are linked to tests using the artifact manifest, so any file not recorded in the manifest is removed.
+        """
+        failed_nodeids = self._get_failed_test_nodeids()
+        if not artifacts:
+            raise ValueError(
+                f"An artifact manifest in [{self.results_dir}] is required to only upload the files for failed tests"
+            )
+        print(f"! INFO: Only uploading files for the {len(failed_nodeids)} test(s) that failed or errored")
+
+        selected_files = []
+        unrecorded_files = []
+        for file in file_list:
+            if file.suffix == ".html" and file.parent == self.results_dir:
+                selected_files.append(file)
+            elif file not in artifacts:
+                unrecorded_files.append(file)
+            elif artifacts[file]["nodeid"] in failed_nodeids:
+                selected_files.append(file)
+
+        if unrecorded_files:
+            print(
+                f"! INFO: {len(unrecorded_files)} file(s) are not recorded in the artifact manifest, so cannot be "
+                "linked to a test and will be skipped"
+            )
+        return selected_files
+
+    def _get_failed_test_nodeids(self) -> set[str]:
+        """
+        This returns the nodeids of the tests that failed or errored according to results.json in the results
+        directory, reading the file a test at a time rather than loading the whole report into memory.
+        """
+        results_file = self.results_dir.joinpath("results.json")
+        if not results_file.is_file():
+            raise ValueError(f"[{results_file}] is required to only upload the files for failed tests")
+
+        failed_nodeids = set()
+        for test in _StreamingJsonReader(results_file).iter_array_items("tests"):
+            stage_outcomes = [test.get(stage, {}).get("outcome") for stage in ("setup", "call", "teardown")]
+            if test.get("outcome") in FAILED_TEST_OUTCOMES or "failed" in stage_outcomes:
+                failed_nodeids.add(test["nodeid"])
+
+        return failed_nodeids
+
+    def _shrink_oversized_files(self, file_data: list[dict[str, str]], oversized_files: list[Path]) -> list[dict[str, str]]:
+        """
+        This replaces the file data for each oversized file with the file data for its recompressed version, or
+        its numbered parts if still too big, processing the oversized files in parallel across processes.
+        """
+        oversized_dir = self._upload_temp_dir().joinpath("oversized")
+        oversized_file_data = [file_info for file_info in file_data if file_info["path"] in oversized_files]
+        print(f"! INFO: Shrinking {len(oversized_file_data)} file(s) that are too big to upload to Jira (> 10MB)...")
+
+        with ProcessPoolExecutor(
+            max_workers=min(len(oversized_file_data), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            shrunk_files = executor.map(
+                _shrink_oversized_file,
+                [Path(file_info["path"]) for file_info in oversized_file_data],
+                [oversized_dir.joinpath(str(index)) for index in range(len(oversized_file_data))],
+                [file_info["default_name"] for file_info in oversized_file_data],
+                [JIRA_FILE_SIZE_LIMIT] * len(oversized_file_data),
+            )
+            replacements = {}
+            for file_info, shrunk in zip(oversized_file_data, shrunk_files):
+                prefix = file_info["non_overwrite_name"].removesuffix(file_info["default_name"])
+                local_dir = file_info["local_file_path"].removesuffix(Path(file_info["local_file_path"]).name)
+                replacements[file_info["local_file_path"]] = [
+                    {
+                        "path": shrunk_path,
+                        "parent_dir": file_info["parent_dir"],
+                        "local_file_path": f"{local_dir}{shrunk_path.name}",
+                        "non_overwrite_name": f"{prefix}{shrunk_name}",
+                        "default_name": shrunk_name,
+                    }
+                    for shrunk_path, shrunk_name in shrunk
+                ]
+                print(f"! INFO: {file_info["local_file_path"]} will be uploaded as {", ".join(name for _, name in shrunk)}")
+
+        return [
+            new_file_info
+            for file_info in file_data
+            for new_file_info in replacements.get(file_info["local_file_path"], [file_info])
+        ]
+
+    def _bundle_files(self, file_data: list[dict[str, str]]) -> list[dict[str, str]]:
+        """
+        This replaces the file data for the files to upload (other than HTML reports, and any files too big to fit in
+        a bundle) with the file data for bundles of those files. Files are streamed into each zip file in turn, with
+        a new bundle started when the next file could take the bundle over the Jira file size limit.
+        """
+        files_to_bundle = [
+            file_info for file_info in file_data
+            if Path(file_info["path"]).suffix.lower() != ".html"
+            and self._bundle_entry_size(file_info) < JIRA_FILE_SIZE_LIMIT - 1024
+        ]
+        if len(files_to_bundle) < 2:
+            return file_data
+
+        bundle_dir = self._upload_temp_dir().joinpath("bundles")
+        bundle_dir.mkdir(parents=True, exist_ok=True)
+        file_prefix = datetime.now().strftime("%Y%m%d%H%M%S_")
+        bundles = []
 
-        for file in file_too_big_list:
-            full_file_list.remove(file)
+        def _close_bundle(bundle: _ResultsBundle) -> None:
+            bundle.close()
+            bundle_name = bundle.path.name
+            bundles.append(
+                {
+                    "path": bundle.path,
+                    "parent_dir": "",
+                    "local_file_path": bundle_name,
+                    "non_overwrite_name": f"{file_prefix}{bundle_name}",
+                    "default_name": bundle_name,
+                    "bundled_files": bundle.bundled_files,
+                }
+            )
+            print(f"! INFO: {len(bundle.bundled_files)} file(s) will be uploaded in {bundle_name}")
+
+        bundle = None
+        for file_info in files_to_bundle:
+            # Start a new bundle if the most space the file could take would take the bundle over the limit
+            if bundle is not None and bundle.size() + self._bundle_entry_size(file_info) >= JIRA_FILE_SIZE_LIMIT - 1024:
+                _close_bundle(bundle)
+                bundle = None
+            if bundle is None:
+                bundle = _ResultsBundle(bundle_dir.joinpath(f"{BUNDLE_NAME_PREFIX}{len(bundles) + 1:03d}.zip"))
+            bundle.add(file_info, self._bundle_compress_type(file_info))
+        _close_bundle(bundle)
+
+        bundled_paths = {file_info["local_file_path"] for file_info in files_to_bundle}
+        return [file_info for file_info in file_data if file_info["local_file_path"] not in bundled_paths] + bundles
+
+    def _bundle_entry_size(self, file_info: dict) -> int:
+        """
+        This returns the most space the file provided could take up in a bundle, including its zip headers and its
+        row in the index file.
+        """
+        size = Path(file_info["path"]).stat().st_size
+        if self._bundle_compress_type(file_info) == zipfile.ZIP_DEFLATED:
+            # Deflate can make incompressible data slightly bigger
+            size += size // 1000 + 64
+        name_size = len(file_info["local_file_path"].encode("utf-8"))
+        nodeid_size = len(file_info.get("nodeid", "").encode("utf-8"))
+        # The local and central directory headers (including any zip64 fields), and the index row (which may have
+        # quotes escaped, doubling its size)
+        return size + 2 * (name_size + 100) + 2 * (name_size + nodeid_size) + 128
+
+    def _bundle_compress_type(self, file_info: dict) -> int:
+        """
+        This returns the compression to use for the file provided in a bundle, storing files that are already
+        compressed as they are.
+        """
+        if Path(file_info["path"]).suffix.lower() in COMPRESSED_FILE_TYPES:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
 
-        return self._generate_file_data_dict(full_file_list)
+    def _upload_temp_dir(self) -> Path:
+        """
+        This returns the temporary directory holding any files created for the upload (such as shrunk versions of
+        oversized files and bundles), creating it if needed.
+        """
+        if self.upload_temp_dir is None:
+            self.upload_temp_dir = Path(tempfile.mkdtemp(prefix="jira-upload-"))
+        return self.upload_temp_dir
+
+    def _remove_upload_temp_dir(self) -> None:
+        """
+        This removes the temporary directory holding any files created for the upload, if one was created.
+        """
+        if self.upload_temp_dir is not None:
+            shutil.rmtree(self.upload_temp_dir, ignore_errors=True)
+            self.upload_temp_dir = None
+
+    def _remove_unchanged_files(self, issue_data: dict, file_data: list[dict[str, str]]) -> list[dict[str, str]]:
+        """
+        This removes any files that the upload manifest shows have already been uploaded to the Jira ticket with the
+        same size and content hash, where the uploaded attachment is still present on the ticket.
+        """
+        uploaded = self._read_upload_manifest().get(issue_data["key"], {})
+        attachment_sizes = {
+            attachment["filename"]: attachment.get("size") for attachment in issue_data["fields"]["attachment"]
+        }
+
+        changed_files = []
+        for file_info in file_data:
+            previous_upload = uploaded.get(file_info["local_file_path"])
+            size = Path(file_info["path"]).stat().st_size
+            # Only hash the file if the size already matches, as that check is much cheaper
+            if (
+                previous_upload
+                and previous_upload["filename"] in attachment_sizes
+                and previous_upload["size"] == size
+                and (previous_upload.get("bundled") or attachment_sizes[previous_upload["filename"]] in (size, None))
+                and previous_upload["sha256"] == self._file_info_hash(file_info)
+            ):
+                print(f"! INFO: {file_info["local_file_path"]} is unchanged since it was uploaded to {issue_data["key"]} as {previous_upload["filename"]} so will be skipped")
+            else:
+                changed_files.append(file_info)
+
+        return changed_files
+
+    def _file_hash(self, file_path: Path) -> str:
+        """
+        This returns the SHA-256 hash of the file provided, reading the file in chunks rather than all at once.
+        """
+        with open(file_path, "rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+
+    def _file_info_hash(self, file_info: dict) -> str:
+        """
+        This returns the SHA-256 hash of the file, using the hash recorded in the artifact manifest during the test
+        run if the file size is unchanged since then.
+        """
+        if "sha256" in file_info and file_info["size"] == Path(file_info["path"]).stat().st_size:
+            return file_info["sha256"]
+        return self._file_hash(Path(file_info["path"]))
+
+    def _read_upload_manifest(self) -> dict:
+        """
+        This reads the upload manifest, which records the size and content hash of each file uploaded to each
+        Jira ticket, keyed by ticket and then by the local file path within the results directory.
+        """
+        try:
+            return json.loads(UPLOAD_MANIFEST_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _record_uploads_in_manifest(self, ticket_id: str, uploads: list[tuple[dict, str]]) -> None:
+        """
+        This records the files uploaded to the Jira ticket (and the attachment name used for each) in the upload
+        manifest, so they can be skipped by future incremental uploads if unchanged. For bundles, each file in the
+        bundle is recorded against the bundle's attachment name.
+        """
+        if not uploads:
+            return
+
+        manifest = self._read_upload_manifest()
+        ticket_uploads = manifest.setdefault(ticket_id, {})
+        for file_info, filename in uploads:
+            for uploaded_file_info in file_info.get("bundled_files", [file_info]):
+                ticket_uploads[uploaded_file_info["local_file_path"]] = {
+                    "filename": filename,
+                    "size": Path(uploaded_file_info["path"]).stat().st_size,
+                    "sha256": self._file_info_hash(uploaded_file_info),
+                    "bundled": "bundled_files" in file_info,
+                }
+
+        try:
+            temp_path = UPLOAD_MANIFEST_PATH.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            os.replace(temp_path, UPLOAD_MANIFEST_PATH)
+        except Exception as e:
+            print(f"ERROR: Failed to update upload manifest [{str(UPLOAD_MANIFEST_PATH)}]: {e}")
 
     def _generate_file_data_dict(self, file_list: list[Path]) -> list[dict[str, str]]:
         """
@@ -277,50 +818,96 @@ class JiraConfluenceUtil:
 
         return True
 
-    def _upload_files_to_jira(self, issue_data: dict, files_to_attach: list, overwrite_files: bool) -> list:
+    def _upload_files_to_jira(
+        self, issue_data: dict, files_to_attach: list, overwrite_files: bool, parallel: int = 1, incremental: bool = False
+    ) -> list:
         """
-        This uploads the files specified to the Jira ticket referenced.
+        This uploads the files specified to the Jira ticket referenced, uploading up to the parallel number of files
+        at the same time. The uploaded files are returned in the same order as the files specified. If incremental is
+        True, the uploads are recorded in the upload manifest for future incremental uploads.
         """
-        # Uploaded files
-        uploaded_files = []
-
-        # Create temp directory for modifying the filename and uploading
-        temp_dir = self.results_dir.joinpath("temp")
-        temp_dir.mkdir(exist_ok=True)
-
-        for file_info in files_to_attach:
-            file_exists = self.check_attachment_exists_in_issue_data(
-                issue_data, file_info["default_name"]
-            )
-
-            filename_to_use = file_info["default_name"]
-            if file_exists and not overwrite_files:
-                filename_to_use = file_info["non_overwrite_name"]
+        filenames_to_use = [
+            self._filename_to_use(issue_data, file_info, overwrite_files) for file_info in files_to_attach
+        ]
+
+        # Uploaded files, in the order provided
+        upload_results = [None] * len(files_to_attach)
+        failed_uploads = []
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+            futures = {
+                executor.submit(self._upload_file_to_jira, issue_data["key"], file_info, filename_to_use): index
+                for index, (file_info, filename_to_use) in enumerate(zip(files_to_attach, filenames_to_use))
+            }
+            for completed, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                progress = f"[{completed}/{len(futures)}]"
+                error = future.result()
+                if error is None:
+                    print(f"{progress} Added attachment with {filenames_to_use[index]} to {issue_data['key']}")
+                    upload_results[index] = filenames_to_use[index]
+                else:
+                    print(f"{progress} ERROR: Failed to upload {filenames_to_use[index]} to {issue_data['key']}, error: {error}")
+                    failed_uploads.append(filenames_to_use[index])
+
+        self._complete_uploads(issue_data["key"], files_to_attach, upload_results, incremental)
+
+        if failed_uploads:
+            print(f"ERROR: {len(failed_uploads)} file(s) failed to upload to {issue_data['key']}: {", ".join(failed_uploads)}")
+
+        return [filename for filename in upload_results if filename is not None]
+
+    def _filename_to_use(self, issue_data: dict, file_info: dict, overwrite_files: bool) -> str:
+        """
+        This returns the filename to upload the file as, which is the non-overwrite name if the file already exists
+        on the Jira ticket and overwrite_files is False, or the default name otherwise.
+        """
+        file_exists = self.check_attachment_exists_in_issue_data(issue_data, file_info["default_name"])
+        if file_exists and not overwrite_files:
+            return file_info["non_overwrite_name"]
+        return file_info["default_name"]
 
-            new_file_path = shutil.copy2(Path(file_info["path"]), temp_dir.joinpath(filename_to_use))
+    def _complete_uploads(
+        self, ticket_id: str, files_to_attach: list, upload_results: list[str | None], incremental: bool
+    ) -> None:
+        """
+        This clears the cached issue data for the Jira ticket (as its attachments have changed) and, if incremental
+        is True, records the successful uploads in the upload manifest. The upload results hold the filename each
+        file was uploaded as, or None if the upload failed.
+        """
+        self._clear_cached_issue_data(ticket_id)
+        if not incremental:
+            return
 
-            try:
-                self.jira_client.add_attachment(issue_data["key"], str(new_file_path))
-                print(f"Added attachment with {filename_to_use} to {issue_data['key']}")
-                uploaded_files.append(filename_to_use)
-            except Exception as e:
-                print(f"ERROR: Failed to upload {filename_to_use} to {issue_data['key']}, error: {e}")
+        self._record_uploads_in_manifest(
+            ticket_id,
+            [(file_info, filename) for file_info, filename in zip(files_to_attach, upload_results) if filename is not None],
+        )
 
-            try:
-                Path(new_file_path).unlink()
-            except Exception as e:
-                print(f"ERROR: Failed to remove {filename_to_use} from temp directory")
+    def _upload_file_to_jira(self, ticket_id: str, file_info: dict, filename_to_use: str) -> Exception | None:
+        """
+        This uploads a single file to the Jira ticket referenced using the filename provided, returning the error
+        encountered if the upload failed, or None if successful. The file is read directly from its original
+        location, with the filename to use set in the upload request rather than by renaming a copy of the file.
+        """
+        def _post_attachment() -> None:
+            # The file is opened for each attempt, so any retry sends the whole file again
+            with open(file_info["path"], "rb") as attachment:
+                self.jira_client.post(
+                    f"{self.jira_client.resource_url('issue')}/{ticket_id}/attachments",
+                    headers=self.jira_client.no_check_headers,
+                    files={"file": (filename_to_use, attachment)},
+                )
 
         try:
-            temp_dir.rmdir()
+            self.request_scheduler.call(_post_attachment, idempotent=False)
         except Exception as e:
-            print(f"ERROR: Failed to remove temp directory [{str(temp_dir)}]: {e}")
+            return e
 
-        return uploaded_files
+        return None
 
-    def _add_comment_to_jira(self, ticket_id: str, uploaded_files: list, include_env_metadata: bool) -> None:
+    def _add_comment_to_jira(self, ticket_id: str, uploaded_files: list, include_env_metadata: bool) -> bool:
         """
-        Adds a comment to Jira in a standard format based on the files uploaded.
+        Adds a comment to Jira in a standard format based on the files uploaded, returning True if successful.
         """
 
         def _default_list_layout(report_list: list, header: str) -> str:
@@ -347,15 +934,25 @@ class JiraConfluenceUtil:
             ".csv": [],
         }
 
+        split_files = []
+        bundles = []
         for file_name in uploaded_files:
             ext = Path(file_name).suffix.lower()
-            if ext in report_lists:
+            if re.fullmatch(rf"(\d{{14}}_)?{BUNDLE_NAME_PREFIX}\d{{3}}\.zip", file_name):
+                bundles.append(file_name)
+            elif re.fullmatch(r"\.\d{3}", ext):
+                split_files.append(file_name)
+            elif ext == ".jpg":
+                report_lists[".png"].append(file_name)
+            elif ext in report_lists:
                 report_lists[ext].append(file_name)
 
         # Handle standard layout for non-image files
         comment += _default_list_layout(report_lists[".html"], "HTML Reports")
         comment += _default_list_layout(report_lists[".zip"], "Trace Files")
         comment += _default_list_layout(report_lists[".csv"], "CSV Output Files")
+        comment += _default_list_layout(bundles, f"Result Bundles (each includes an {BUNDLE_INDEX_NAME} file listing the files in the bundle)")
+        comment += _default_list_layout(split_files, "Split Files (download all parts and join them in order to restore the original file)")
 
         # Put screenshots in a table with the thumbnail
         if report_lists[".png"]:
@@ -367,10 +964,12 @@ class JiraConfluenceUtil:
             comment += f"\n*+Environment Details+*\n\n{json_metadata}"
 
         try:
-            self.jira_client.issue_add_comment(ticket_id, comment)
+            self.request_scheduler.call(self.jira_client.issue_add_comment, ticket_id, comment, idempotent=False)
             print(f"Successfully added comment to {ticket_id}")
+            return True
         except Exception as e:
             print(f"Failed to add comment to Jira, exception: {e}")
+            return False
 
 
     def upload_test_results_dir_to_jira(
@@ -384,9 +983,19 @@ class JiraConfluenceUtil:
         include_env_metadata: bool = True,
         add_comment: bool = True,
         automatically_accept: bool = False,
+        parallel: int = 1,
+        incremental: bool = False,
+        shrink_oversized_files: bool = False,
+        failed_only: bool = False,
+        bundle_files: bool = False,
     ) -> None:
         """
         This uploads files to a specified Jira ticket and notifies of success or failure in the console.
+        If parallel is greater than 1, that number of files are uploaded at the same time.
+        If incremental is True, files that are unchanged since they were last uploaded to the ticket are skipped.
+        If shrink_oversized_files is True, files too big for Jira are recompressed or split into parts to upload.
+        If failed_only is True, only the HTML report and the files for tests that failed or errored are uploaded.
+        If bundle_files is True, the files other than HTML reports are uploaded in zip bundles under the file limit.
         """
 
         self._can_complete_jira_actions_check()
@@ -399,21 +1008,365 @@ class JiraConfluenceUtil:
             print(f"Issue data for {ticket_id} not found, exiting upload")
             return None
 
-        # Get list of files to upload
-        files_to_attach = self._get_files_to_upload_to_jira(
-            include_html, include_trace_files, include_screenshots, include_csv
-        )
-        if not files_to_attach:
-            print("No files to upload found in test-results, exiting upload")
-            return None
+        try:
+            # Get list of files to upload
+            files_to_attach = self._get_files_to_upload_to_jira(
+                include_html, include_trace_files, include_screenshots, include_csv,
+                issue_data if incremental else None, shrink_oversized_files, failed_only, bundle_files,
+            )
+            if not files_to_attach:
+                print("No files to upload found in test-results, exiting upload")
+                return None
 
-        # Make decision
-        if not automatically_accept and not self._accept_message(issue_data, files_to_attach, overwrite_files, add_comment):
-            return None
+            # Make decision
+            if not automatically_accept and not self._accept_message(issue_data, files_to_attach, overwrite_files, add_comment):
+                return None
 
-        # Upload files
-        uploaded_files = self._upload_files_to_jira(issue_data, files_to_attach, overwrite_files)
+            # Upload files
+            uploaded_files = self._upload_files_to_jira(issue_data, files_to_attach, overwrite_files, parallel, incremental)
+        finally:
+            self._remove_upload_temp_dir()
 
         # Add comment
         if add_comment:
             self._add_comment_to_jira(ticket_id, uploaded_files, include_env_metadata)
+
+
+    def upload_test_results_dir_to_jira_tickets(
+        self,
+        ticket_ids: list[str],
+        overwrite_files: bool = True,
+        include_html: bool = True,
+        include_trace_files: bool = True,
+        include_screenshots: bool = True,
+        include_csv: bool = True,
+        include_env_metadata: bool = True,
+        add_comment: bool = True,
+        automatically_accept: bool = False,
+        max_connections: int = JIRA_CONNECTION_POOL_SIZE,
+        incremental: bool = False,
+        shrink_oversized_files: bool = False,
+        failed_only: bool = False,
+        bundle_files: bool = False,
+    ) -> dict[str, dict]:
+        """
+        This uploads files to multiple Jira tickets at the same time, retrieving the issue data, uploading the files
+        and adding the comment for every ticket concurrently, with no more than max_connections requests to Jira in
+        progress at once. A summary for each ticket is printed to the console once complete.
+
+        The max_connections value must be between 1 and the number of requests to Jira the shared connection pool and
+        request scheduler allow at once (10 by default), as any higher value would have no effect.
+
+        Returns:
+            dict[str, dict]: The result for each ticket, with the files uploaded ("uploaded"), the files that failed
+            to upload ("failed"), whether a comment was added ("comment_added") and any error preventing the upload
+            to the ticket ("error").
+        """
+        self._can_complete_jira_actions_check()
+        connection_limit = min(JIRA_CONNECTION_POOL_SIZE, self.request_scheduler.max_concurrent_requests)
+        if not 1 <= max_connections <= connection_limit:
+            raise ValueError(f"The maximum number of connections to Jira must be between 1 and {connection_limit}")
+
+        self._setup_jira_client()
+        print(f"Checking files to upload from [{self.results_dir}]...\n")
+
+        try:
+            files_to_attach = self._get_files_to_upload_to_jira(
+                include_html, include_trace_files, include_screenshots, include_csv,
+                shrink_oversized_files=shrink_oversized_files, failed_only=failed_only, bundle_files=bundle_files,
+            )
+            if not files_to_attach:
+                print("No files to upload found in test-results, exiting upload")
+                return {}
+
+            if not automatically_accept:
+                message = f"\nThis will upload the following files {"and add a comment " if add_comment else ""}to {", ".join(ticket_ids)}:\n"
+                message += "".join(f"- {file_info["local_file_path"]}\n" for file_info in files_to_attach)
+                message += "\nDo you want to proceed? [y/n]: "
+                if input(message).strip().lower() != "y":
+                    print("Aborting upload")
+                    return {}
+
+            with ThreadPoolExecutor(max_workers=max_connections) as executor:
+                results = asyncio.run(
+                    self._publish_to_jira_tickets(
+                        executor, ticket_ids, files_to_attach, overwrite_files, include_env_metadata, add_comment, incremental
+                    )
+                )
+        finally:
+            self._remove_upload_temp_dir()
+
+        print("\nUpload summary:")
+        for ticket_id, result in results.items():
+            if result["error"]:
+                print(f"- {ticket_id}: {result["error"]}")
+            else:
+                print(
+                    f"- {ticket_id}: {len(result["uploaded"])} file(s) uploaded, {len(result["failed"])} failed"
+                    f"{", comment added" if result["comment_added"] else ""}"
+                )
+
+        return results
+
+    async def _publish_to_jira_tickets(
+        self,
+        executor: ThreadPoolExecutor,
+        ticket_ids: list[str],
+        files_to_attach: list,
+        overwrite_files: bool,
+        include_env_metadata: bool,
+        add_comment: bool,
+        incremental: bool,
+    ) -> dict[str, dict]:
+        """
+        This uploads the files to each Jira ticket concurrently, making each request to Jira using the executor
+        provided so the number of requests in progress at once is limited by the executor's number of workers.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def _run(function: Callable[..., Any], *args: Any) -> Any:
+            return await loop.run_in_executor(executor, partial(function, *args))
+
+        async def _publish(ticket_id: str) -> dict:
+            result = {"uploaded": [], "failed": [], "comment_added": False, "error": None}
+            issue_data = await _run(self.get_issue_data, ticket_id)
+            if not issue_data:
+                result["error"] = "Issue data not found, so no files were uploaded"
+                return result
+
+            # Checking for unchanged files hashes them, so is done in the executor to keep the event loop free
+            ticket_files = (
+                await _run(self._remove_unchanged_files, issue_data, files_to_attach) if incremental else files_to_attach
+            )
+            filenames_to_use = [self._filename_to_use(issue_data, file_info, overwrite_files) for file_info in ticket_files]
+            errors = await asyncio.gather(*[
+                _run(self._upload_file_to_jira, issue_data["key"], file_info, filename_to_use)
+                for file_info, filename_to_use in zip(ticket_files, filenames_to_use)
+            ])
+
+            upload_results = []
+            for filename_to_use, error in zip(filenames_to_use, errors):
+                if error is None:
+                    print(f"Added attachment with {filename_to_use} to {issue_data['key']}")
+                    result["uploaded"].append(filename_to_use)
+                    upload_results.append(filename_to_use)
+                else:
+                    print(f"ERROR: Failed to upload {filename_to_use} to {issue_data['key']}, error: {error}")
+                    result["failed"].append(filename_to_use)
+                    upload_results.append(None)
+            await _run(self._complete_uploads, issue_data["key"], ticket_files, upload_results, incremental)
+
+            if add_comment:
+                result["comment_added"] = await _run(
+                    self._add_comment_to_jira, issue_data["key"], result["uploaded"], include_env_metadata
+                )
+            return result
+
+        results = await asyncio.gather(*[_publish(ticket_id) for ticket_id in ticket_ids])
+        return dict(zip(ticket_ids, results))
+
+
+def _shrink_oversized_file(
+    file_path: Path, output_dir: Path, upload_name: str, file_size_limit: int
+) -> list[tuple[Path, str]]:
+    """
+    This shrinks a file that is too big to upload to Jira, returning the path and upload name of each file to
+    upload in its place. Zip files are recompressed using the highest compression level, and PNG images are
+    converted to JPEG (if Pillow is installed). If the file is still too big, it is split into numbered parts
+    (e.g. trace.zip.001, trace.zip.002) that can be joined back together in order to restore the file.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    shrunk_path, shrunk_name = file_path, upload_name
+
+    if file_path.suffix.lower() == ".zip":
+        shrunk_path = output_dir.joinpath(upload_name)
+        with zipfile.ZipFile(file_path) as source, zipfile.ZipFile(shrunk_path, "w") as target:
+            for item in source.infolist():
+                target.writestr(item, source.read(item), compress_type=zipfile.ZIP_DEFLATED, compresslevel=9)
+
+    elif file_path.suffix.lower() == ".png":
+        try:
+            from PIL import Image
+        except ImportError:
+            print(f"! INFO: Pillow is not installed, so {file_path.name} cannot be converted to a smaller image format")
+        else:
+            shrunk_name = f"{Path(upload_name).stem}.jpg"
+            shrunk_path = output_dir.joinpath(shrunk_name)
+            with Image.open(file_path) as image:
+                image.convert("RGB").save(shrunk_path, "JPEG", quality=85, optimize=True)
+
+    if shrunk_path.stat().st_size < file_size_limit:
+        return [(shrunk_path, shrunk_name)]
+
+    parts = []
+    with open(shrunk_path, "rb") as file:
+        while chunk := file.read(file_size_limit - 1):
+            part_name = f"{shrunk_name}.{len(parts) + 1:03d}"
+            part_path = output_dir.joinpath(part_name)
+            part_path.write_bytes(chunk)
+            parts.append((part_path, part_name))
+
+    return parts
+
+
+class _ResultsBundle:
+    """
+    A zip file that files to upload to Jira are streamed into, tracking the space used so far (including the zip
+    central directory and index file still to be written) so the bundle can be kept under the Jira file size limit.
+    The index file, listing each file in the bundle with its size, hash and the test that produced it (if known), is
+    written when the bundle is closed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.bundled_files = []
+        self._file = open(path, "wb")
+        self._zip = zipfile.ZipFile(self._file, "w")
+        self._index = io.StringIO()
+        self._pending_size = 0
+        self._add_index_row(["file", "size", "sha256", "test", "outcome"])
+
+    def add(self, file_info: dict, compress_type: int) -> None:
+        """
+        Streams the file provided into the bundle, using its path in the results directory as its name.
+        """
+        self._zip.write(file_info["path"], file_info["local_file_path"], compress_type=compress_type)
+        # The central directory entry for the file, including any zip64 fields
+        self._pending_size += len(file_info["local_file_path"].encode("utf-8")) + 100
+        self._add_index_row([
+            file_info["local_file_path"],
+            Path(file_info["path"]).stat().st_size,
+            file_info.get("sha256", ""),
+            file_info.get("nodeid", ""),
+            file_info.get("outcome", ""),
+        ])
+        self.bundled_files.append(file_info)
+
+    def _add_index_row(self, row: list) -> None:
+        """
+        Adds a row to the index file, which is written to the bundle when closed.
+        """
+        row_buffer = io.StringIO()
+        csv.writer(row_buffer).writerow(row)
+        self._index.write(row_buffer.getvalue())
+        self._pending_size += len(row_buffer.getvalue().encode("utf-8"))
+
+    def size(self) -> int:
+        """
+        Returns the most space the bundle would take up if closed now.
+        """
+        return self._file.tell() + self._pending_size
+
+    def close(self) -> None:
+        """
+        Writes the index file to the bundle and closes it.
+        """
+        self._zip.writestr(BUNDLE_INDEX_NAME, self._index.getvalue(), compress_type=zipfile.ZIP_DEFLATED)
+        self._zip.close()
+        self._file.close()
+
+
+class _StreamingJsonReader:
+    """
+    Reads a JSON file a chunk at a time, so large arrays within the file can be processed an item at a time without
+    loading the whole file into memory.
+    """
+
+    def __init__(self, file_path: Path, chunk_size: int = RESULTS_JSON_READ_CHUNK_SIZE) -> None:
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+
+    def iter_array_items(self, key: str) -> Iterator[Any]:
+        """
+        Yields each item of the array stored under the key provided in the top-level object of the file. Any other
+        values in the top-level object are decoded and discarded.
+        """
+        with open(self.file_path, "r", encoding="utf-8") as self._file:
+            self._buffer, self._position, self._eof = "", 0, False
+            self._expect("{")
+            if self._peek() == "}":
+                return
+
+            while True:
+                name = self._decode_value()
+                self._expect(":")
+                if name == key:
+                    yield from self._iter_array()
+                else:
+                    self._decode_value()
+
+                if self._peek() != ",":
+                    self._expect("}")
+                    return
+                self._position += 1
+
+    def _iter_array(self) -> Iterator[Any]:
+        """
+        Yields and consumes each item of the array at the current position.
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._position += 1
+            return
+
+        while True:
+            yield self._decode_value()
+            if self._peek() != ",":
+                self._expect("]")
+                return
+            self._position += 1
+
+    def _read_more(self) -> None:
+        """
+        Reads the next chunk of the file into the buffer, dropping the part of the buffer already decoded. The amount
+        read grows with the buffer, so a single large value does not need to be decoded a chunk at a time.
+        """
+        chunk = self._file.read(max(self.chunk_size, len(self._buffer) - self._position))
+        self._eof = not chunk
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+
+    def _peek(self) -> str:
+        """
+        Skips any whitespace and returns the next character, without consuming it.
+        """
+        while True:
+            self._position = JSON_WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if self._eof:
+                raise ValueError(f"Unexpected end of file in [{self.file_path}]")
+            self._read_more()
+
+    def _expect(self, character: str) -> None:
+        """
+        Consumes the next character, which must be the character provided.
+        """
+        if self._peek() != character:
+            raise ValueError(
+                f"Expected [{character}] but found [{self._buffer[self._position]}] in [{self.file_path}]"
+            )
+        self._position += 1
+
+    def _decode_value(self) -> Any:
+        """
+        Decodes and consumes the next value, reading more of the file until the value is complete.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._read_more()
+                continue
+
+            # A number at the end of the buffer (e.g. "1." of "1.5") may continue in the next chunk
+            if not self._eof and (end == len(self._buffer) or self._buffer[end] in "0123456789.eE+-"):
+                self._read_more()
+                continue
+
+            self._position = end
+            return value
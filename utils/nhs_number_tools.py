@@ -1,8 +1,20 @@
 import logging
+import os
+import random
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+if TYPE_CHECKING:
+    import numpy
 
 
 logger = logging.getLogger(__name__)
 
+# The weightings applied to the first nine digits of an NHS number when calculating the check digit
+CHECK_DIGIT_WEIGHTS = (10, 9, 8, 7, 6, 5, 4, 3, 2)
+# The number of NHS numbers to generate at a time when writing NHS numbers to a file
+GENERATION_CHUNK_SIZE = 1_000_000
+
 
 class NHSNumberTools:
     """
@@ -38,6 +50,265 @@ class NHSNumberTools:
 
         return f"{formatted_nhs_number[:3]} {formatted_nhs_number[3:6]} {formatted_nhs_number[6:]}"
 
+    @staticmethod
+    def is_valid_nhs_number(nhs_number: int | str) -> bool:
+        """
+        This checks if a provided NHS number is 10 digits and has a valid modulus 11 check digit.
+
+        Args:
+            nhs_number (int | str): The NHS number to check.
+
+        Returns:
+            bool: True if the NHS number is valid, otherwise False.
+        """
+        formatted_nhs_number = str(nhs_number).replace(" ", "")
+        if len(formatted_nhs_number) != 10 or not formatted_nhs_number.isascii() or not formatted_nhs_number.isdigit():
+            return False
+
+        digits = [int(digit) for digit in formatted_nhs_number]
+        return NHSNumberTools._check_digit(sum(d * w for d, w in zip(digits, CHECK_DIGIT_WEIGHTS))) == digits[9]
+
+    @staticmethod
+    def validate_nhs_numbers(nhs_numbers: "Sequence[int | str] | numpy.ndarray") -> "numpy.ndarray":
+        """
+        This checks a batch of NHS numbers in a single vectorised operation, confirming each is 10 digits and has
+        a valid modulus 11 check digit. This requires numpy to be installed.
+
+        Args:
+            nhs_numbers (Sequence[int | str] | numpy.ndarray): The NHS numbers to check, as a list (or other
+            sequence) or numpy array of integers or strings. Spaces within strings are ignored.
+
+        Returns:
+            numpy.ndarray: A boolean array the same length as the NHS numbers provided, which is True where the
+            NHS number is valid.
+        """
+        return NHSNumberTools._nhs_number_digits(nhs_numbers)[1]
+
+    @staticmethod
+    def spaced_nhs_numbers(
+        nhs_numbers: "Sequence[int | str] | numpy.ndarray",
+    ) -> "tuple[numpy.ndarray, numpy.ndarray]":
+        """
+        This checks and spaces out a batch of NHS numbers in the format: nnn nnn nnnn, in a single vectorised
+        operation. This requires numpy to be installed.
+
+        Args:
+            nhs_numbers (Sequence[int | str] | numpy.ndarray): The NHS numbers to check and space out, as a list
+            (or other sequence) or numpy array of integers or strings. Spaces within strings are ignored.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: A boolean array which is True where the NHS number is valid, and a
+            string array of the NHS numbers in "nnn nnn nnnn" format (or an empty string where the NHS number is
+            not valid), both the same length as the NHS numbers provided.
+        """
+        np = NHSNumberTools._numpy()
+        digits, valid = NHSNumberTools._nhs_number_digits(nhs_numbers)
+
+        # Build the spaced numbers directly as unicode code points, with spaces after the 3rd and 6th digits
+        code_points = np.full((len(digits), 12), ord(" "), dtype=np.uint32)
+        code_points[:, [0, 1, 2, 4, 5, 6, 8, 9, 10, 11]] = digits + ord("0")
+        code_points[~valid] = 0
+        return valid, code_points.view("<U12").reshape(len(digits))
+
+    @staticmethod
+    def generate_nhs_numbers(
+        seed: int = 0,
+        prefix: str = "9",
+        shard_index: int | None = None,
+        shard_count: int | None = None,
+    ) -> Iterator[str]:
+        """
+        This lazily generates valid NHS numbers (with a valid modulus 11 check digit) in a reproducible order
+        for the seed provided, without repeating any NHS number. The NHS numbers are split into separate shards,
+        so that parallel processes using the same seed but a different shard will never generate the same NHS number.
+
+        Args:
+            seed (int): [Optional] The seed for the order of the NHS numbers generated. Defaults to 0.
+            prefix (str): [Optional] The leading digits all generated NHS numbers should start with. Defaults to "9".
+            shard_index (int): [Optional] The shard to generate NHS numbers for, starting from 0. If not provided,
+            the pytest-xdist worker number is used (e.g. 2 for worker gw2), or 0 if not running under pytest-xdist.
+            shard_count (int): [Optional] The total number of shards. If not provided, the number of pytest-xdist
+            workers is used, or 1 if not running under pytest-xdist.
+
+        Returns:
+            Iterator[str]: An iterator of 10 digit NHS numbers.
+        """
+        space, multiplier, offset, shard_index, shard_count = NHSNumberTools._generator_parameters(
+            seed, prefix, shard_index, shard_count
+        )
+        prefix_value = int(prefix) * space if prefix else 0
+
+        for index in range(shard_index, space, shard_count):
+            body = f"{prefix_value + (multiplier * index + offset) % space:09d}"
+            check_digit = NHSNumberTools._check_digit(
+                sum(int(digit) * weight for digit, weight in zip(body, CHECK_DIGIT_WEIGHTS))
+            )
+            if check_digit != 10:
+                yield f"{body}{check_digit}"
+
+    @staticmethod
+    def write_nhs_numbers(
+        file_path: str | Path,
+        count: int,
+        seed: int = 0,
+        prefix: str = "9",
+        shard_index: int | None = None,
+        shard_count: int | None = None,
+        file_format: str = "csv",
+    ) -> Path:
+        """
+        This writes the requested number of generated NHS numbers to a file, in the same order as
+        generate_nhs_numbers() would generate them for the same arguments. This generates the NHS numbers in
+        vectorised batches, so it is suitable for generating millions of NHS numbers, and requires numpy to be
+        installed.
+
+        Args:
+            file_path (str | pathlib.Path): The file to write the NHS numbers to.
+            count (int): The number of NHS numbers to write.
+            seed (int): [Optional] The seed for the order of the NHS numbers generated. Defaults to 0.
+            prefix (str): [Optional] The leading digits all generated NHS numbers should start with. Defaults to "9".
+            shard_index (int): [Optional] The shard to generate NHS numbers for, starting from 0. If not provided,
+            the pytest-xdist worker number is used, or 0 if not running under pytest-xdist.
+            shard_count (int): [Optional] The total number of shards. If not provided, the number of pytest-xdist
+            workers is used, or 1 if not running under pytest-xdist.
+            file_format (str): [Optional] Either "csv" (default) to write a CSV file with a nhs_number header and
+            one NHS number per row, or "binary" to write each NHS number as an unsigned 64-bit little-endian integer.
+
+        Returns:
+            pathlib.Path: The path to the file written.
+        """
+        if file_format not in ("csv", "binary"):
+            raise NHSNumberToolsException(f"The file format provided ({file_format}) is not csv or binary.")
+
+        np = NHSNumberTools._numpy()
+        space, multiplier, offset, shard_index, shard_count = NHSNumberTools._generator_parameters(
+            seed, prefix, shard_index, shard_count
+        )
+        prefix_value = int(prefix) * space if prefix else 0
+        powers = 10 ** np.arange(8, -1, -1, dtype=np.int64)
+        weights = np.array(CHECK_DIGIT_WEIGHTS, dtype=np.int64)
+
+        file_path = Path(file_path)
+        remaining = count
+        position = shard_index
+        with open(file_path, "wb") as file:
+            if file_format == "csv":
+                file.write(b"nhs_number\n")
+
+            while remaining > 0:
+                if position >= space:
+                    raise NHSNumberToolsException(
+                        f"Only {count - remaining} NHS numbers can be generated for the prefix ({prefix}) and shard."
+                    )
+                chunk_end = min(position + GENERATION_CHUNK_SIZE * shard_count, space)
+                indexes = np.arange(position, chunk_end, shard_count, dtype=np.int64)
+                position = int(indexes[-1]) + shard_count
+
+                bodies = prefix_value + (multiplier * indexes + offset) % space
+                digits = (bodies[:, None] // powers) % 10
+                check_digits = NHSNumberTools._check_digit(digits @ weights)
+                valid = check_digits != 10
+                digits, check_digits = digits[valid][:remaining], check_digits[valid][:remaining]
+                remaining -= len(digits)
+
+                if file_format == "csv":
+                    # Build each row directly as ASCII bytes: 9 digits, the check digit and a newline
+                    rows = np.empty((len(digits), 11), dtype=np.uint8)
+                    rows[:, :9] = digits + ord("0")
+                    rows[:, 9] = check_digits + ord("0")
+                    rows[:, 10] = ord("\n")
+                    file.write(rows.tobytes())
+                else:
+                    (digits @ (powers * 10) + check_digits).astype("<u8").tofile(file)
+
+        logger.info(f"Written {count} NHS numbers to {file_path}")
+        return file_path
+
+    @staticmethod
+    def _generator_parameters(
+        seed: int, prefix: str, shard_index: int | None, shard_count: int | None,
+    ) -> tuple[int, int, int, int, int]:
+        """
+        This returns the size of the number space, the seeded multiplier and offset used to shuffle it, and the
+        shard index and count to use when generating NHS numbers.
+
+        The order of NHS numbers is an affine permutation of the number space (index * multiplier + offset, modulo
+        the size of the space), which visits every NHS number exactly once as the multiplier shares no factors with
+        the size of the space. Each shard takes every shard_count-th index, so shards never overlap.
+        """
+        if not prefix.isascii() or not (prefix == "" or prefix.isdigit()) or len(prefix) > 8:
+            raise NHSNumberToolsException(f"The prefix provided ({prefix}) is not up to 8 digits.")
+
+        if shard_index is None:
+            shard_index = int(os.getenv("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw"))
+        if shard_count is None:
+            shard_count = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+        if not 0 <= shard_index < shard_count:
+            raise NHSNumberToolsException(
+                f"The shard index provided ({shard_index}) is not between 0 and the shard count ({shard_count})."
+            )
+
+        # The size of the space is a power of 10, so the multiplier must not be divisible by 2 or 5
+        space = 10 ** (9 - len(prefix))
+        rng = random.Random(seed)
+        multiplier = rng.randrange(1, space, 2)
+        while multiplier % 5 == 0:
+            multiplier = rng.randrange(1, space, 2)
+
+        return space, multiplier, rng.randrange(space), shard_index, shard_count
+
+    @staticmethod
+    def _nhs_number_digits(
+        nhs_numbers: "Sequence[int | str] | numpy.ndarray",
+    ) -> "tuple[numpy.ndarray, numpy.ndarray]":
+        """
+        This converts a batch of NHS numbers into an array of digits (one row per NHS number), returning the digits
+        and a boolean array which is True where the NHS number is valid.
+        """
+        np = NHSNumberTools._numpy()
+        values = np.asarray(nhs_numbers).reshape(-1)
+        if values.size == 0:
+            return np.zeros((0, 10), dtype=np.int64), np.zeros(0, dtype=bool)
+
+        if values.dtype.kind in "iu":
+            values = values.astype(np.int64)
+            in_range = (values >= 10**9) & (values < 10**10)
+            digits = (values[:, None] // 10 ** np.arange(9, -1, -1, dtype=np.int64)) % 10
+        else:
+            values = np.char.replace(values.astype(str), " ", "")
+            in_range = np.char.str_len(values) == 10
+            # Each unicode character is stored as a 4 byte code point, padded with zeros to a length of 10
+            code_points = np.where(in_range, values, "").astype("<U10").view(np.uint32).reshape(-1, 10)
+            digits = code_points.astype(np.int64) - ord("0")
+            in_range &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+            digits[~in_range] = 0
+
+        check_digits = NHSNumberTools._check_digit(digits[:, :9] @ np.array(CHECK_DIGIT_WEIGHTS))
+        valid = in_range & (check_digits == digits[:, 9])
+        return digits, valid
+
+    @staticmethod
+    def _check_digit(weighted_total: "int | numpy.ndarray") -> "int | numpy.ndarray":
+        """
+        This returns the expected check digit for the weighted total of the first nine digits of an NHS number.
+        A result of 10 means no check digit is valid, and as a single digit it will never match.
+        """
+        return (11 - weighted_total % 11) % 11
+
+    @staticmethod
+    def _numpy() -> object:
+        """
+        This returns the numpy module, which is only required for the batch NHS number methods.
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise NHSNumberToolsException(
+                "numpy is required for batch NHS number operations, and can be installed using: pip install numpy"
+            ) from e
+
+        return numpy
+
 
 class NHSNumberToolsException(Exception):
     pass
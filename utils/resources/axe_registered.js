@@ -0,0 +1,4 @@
+// This is evaluated by utils/axe.py in place of the axe-core source when
+// axe-core has already been registered against the browser context as an
+// init script (see Axe.register_context), so nothing needs to be injected.
+void 0;
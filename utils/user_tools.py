@@ -1,11 +1,30 @@
+import copy
+import hashlib
 import json
 import os
 import logging
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Iterator
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
 
 
 logger = logging.getLogger(__name__)
 USERS_FILE = Path(os.getcwd()) / "users.json"
+LEASE_DIRECTORY = Path(tempfile.gettempdir()) / "playwright-blueprint-user-leases"
+STORAGE_STATE_DIRECTORY = Path(os.getcwd()) / ".auth"
+
+# Parsed users files and their indexes, keyed by file path
+_USERS_CACHE: dict[Path, dict] = {}
+_USERS_CACHE_LOCK = threading.Lock()
 
 
 class UserTools:
@@ -24,14 +43,248 @@ class UserTools:
         Returns:
             dict: A Python dictionary with the details of the user requested, if present.
         """
-        with open(USERS_FILE, 'r') as file:
-            user_data = json.loads(file.read())
+        user_data = UserTools._load_users()["users"]
 
         if user not in user_data:
             raise UserToolsException(f"User [{user}] is not present in users.json")
 
         logger.debug(f"Returning user: {user_data[user]}")
-        return user_data[user]
+        return copy.deepcopy(user_data[user])
+
+    @staticmethod
+    def retrieve_user_by_username(username: str) -> dict:
+        """
+        Retrieves the user information as a dict for the username provided.
+
+        Args:
+            username (str): The username of the user details required, using the username value from users.json.
+
+        Returns:
+            dict: A Python dictionary with the details of the user requested, if present.
+        """
+        by_username = UserTools._load_users()["by_username"]
+
+        if username not in by_username:
+            raise UserToolsException(f"User with username [{username}] is not present in users.json")
+
+        return UserTools.retrieve_user(by_username[username])
+
+    @staticmethod
+    def users_with_role(role: str) -> dict[str, dict]:
+        """
+        Retrieves the user information for all users with the role provided.
+
+        Args:
+            role (str): The role to retrieve users for, using the roles values from users.json.
+
+        Returns:
+            dict[str, dict]: A Python dictionary of the users with the role requested (in the order they appear in
+            users.json), using the record key from users.json as the key, or an empty dictionary if no users have
+            the role.
+        """
+        users = UserTools._load_users()
+        return {
+            user: copy.deepcopy(users["users"][user])
+            for user in users["by_role"].get(role, [])
+        }
+
+    @staticmethod
+    @contextmanager
+    def lease_user(role: str, timeout: float = 60) -> Iterator[dict]:
+        """
+        Leases a user with the role provided for exclusive use, so that no other test (including tests in other
+        processes, such as pytest-xdist workers) can lease the same user until it is released. The user is released
+        when the context exits, or automatically by the operating system if the process holding it ends unexpectedly.
+
+        Args:
+            role (str): The role the leased user needs to have, using the roles values from users.json.
+            timeout (float): [Optional] The number of seconds to wait for a user with the role to become available.
+            Defaults to 60 seconds.
+
+        Returns:
+            Iterator[dict]: A context manager providing a Python dictionary with the details of the user leased.
+        """
+        candidates = list(UserTools._load_users()["by_role"].get(role, []))
+        if not candidates:
+            raise UserToolsException(f"No users with role [{role}] are present in users.json")
+
+        LEASE_DIRECTORY.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            for user in candidates:
+                lease_file = UserTools._try_lease(user)
+                if lease_file is not None:
+                    logger.debug(f"Leased user [{user}] for role [{role}]")
+                    try:
+                        yield UserTools.retrieve_user(user)
+                    finally:
+                        lease_file.close()
+                        logger.debug(f"Released user [{user}]")
+                    return
+
+            if time.monotonic() > deadline:
+                raise UserToolsException(f"No users with role [{role}] became available within {timeout} seconds")
+            time.sleep(0.1)
+
+    @staticmethod
+    def retrieve_storage_state(
+        user: str,
+        login_function: Callable[[dict], dict],
+        max_age: float = 3600,
+        timeout: float = 300,
+    ) -> Path:
+        """
+        Retrieves the path to a saved Playwright storage state (cookies and local storage) for the user provided,
+        logging the user in using the login function provided only if there is no saved state, or the saved state
+        is older than the max age or contains expired cookies. Only one process logs each user in at a time, with
+        any other processes waiting for and then using the state saved.
+
+        Args:
+            user (str): The user to retrieve the storage state for, using the record key from users.json.
+            login_function (Callable[[dict], dict]): The function to log the user in, which is passed the user
+            details from users.json and returns the Playwright storage state once logged in.
+            max_age (float): [Optional] The number of seconds a saved storage state can be used for before the user
+            is logged in again. Defaults to 3600 seconds.
+            timeout (float): [Optional] The number of seconds to wait for another process logging the same user in.
+            Defaults to 300 seconds.
+
+        Returns:
+            pathlib.Path: The path to the storage state file for the user, which can be passed to Playwright as the
+            storage_state for a new browser context.
+        """
+        state_file = UserTools._storage_state_file(user)
+        if UserTools._storage_state_current(state_file, max_age):
+            return state_file
+
+        user_details = UserTools.retrieve_user(user)
+        STORAGE_STATE_DIRECTORY.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while (lock_file := UserTools._try_lock(state_file.with_suffix(".lock"))) is None:
+            if time.monotonic() > deadline:
+                raise UserToolsException(f"Timed out waiting for user [{user}] to be logged in by another process")
+            time.sleep(0.1)
+
+        try:
+            # Another process may have logged the user in while waiting for the lock
+            if UserTools._storage_state_current(state_file, max_age):
+                return state_file
+
+            logger.info(f"Logging in user [{user}] to save storage state")
+            storage_state = login_function(user_details)
+            temp_file = state_file.with_suffix(f".{os.getpid()}.tmp")
+            temp_file.write_text(json.dumps(storage_state), encoding="utf-8")
+            os.replace(temp_file, state_file)
+            return state_file
+        finally:
+            lock_file.close()
+
+    @staticmethod
+    def invalidate_storage_state(user: str) -> None:
+        """
+        Removes any saved storage state for the user provided, so the user is logged in again the next time
+        retrieve_storage_state() is used, for example if a test finds the saved session is no longer valid.
+
+        Args:
+            user (str): The user to remove the storage state for, using the record key from users.json.
+        """
+        UserTools._storage_state_file(user).unlink(missing_ok=True)
+
+    @staticmethod
+    def _storage_state_file(user: str) -> Path:
+        """
+        Returns the path to the storage state file for the user provided.
+        """
+        return STORAGE_STATE_DIRECTORY / (re.sub(r"[^\w-]", "_", user) + ".json")
+
+    @staticmethod
+    def _storage_state_current(state_file: Path, max_age: float) -> bool:
+        """
+        Returns True if the storage state file provided exists, is within the max age and has no expired cookies.
+        """
+        try:
+            if time.time() - state_file.stat().st_mtime > max_age:
+                return False
+            storage_state = json.loads(state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+
+        # Session cookies have an expiry of -1
+        now = time.time()
+        return all(
+            cookie.get("expires", -1) < 0 or cookie["expires"] > now
+            for cookie in storage_state.get("cookies", [])
+        )
+
+    @staticmethod
+    def _try_lease(user: str) -> object | None:
+        """
+        Attempts to lease the user provided, returning the open lease file (which releases the lease when closed)
+        if successful, or None if the user is already leased.
+        """
+        lease_key = hashlib.sha1(f"{Path(USERS_FILE).resolve()}:{user}".encode("utf-8")).hexdigest()
+        return UserTools._try_lock(LEASE_DIRECTORY / f"{lease_key}.lock")
+
+    @staticmethod
+    def _try_lock(lock_path: Path) -> object | None:
+        """
+        Attempts to take an exclusive lock on the lock file provided, returning the open lock file (which releases
+        the lock when closed) if successful, or None if the lock is already held. The operating system releases the
+        lock automatically if the process holding it ends.
+        """
+        lock_file = open(lock_path, "a+")
+        try:
+            if os.name == "nt":
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+
+        return lock_file
+
+    @staticmethod
+    def _load_users() -> dict:
+        """
+        Returns the parsed users.json file and its indexes, only reading the file again if it has been modified
+        since it was last read.
+
+        Returns:
+            dict: A Python dictionary containing the users ("users"), the record keys for each role ("by_role") and
+            the record key for each username ("by_username").
+        """
+        users_file = Path(USERS_FILE)
+        file_stat = users_file.stat()
+        file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+
+        with _USERS_CACHE_LOCK:
+            cached = _USERS_CACHE.get(users_file)
+            if cached is not None and cached["version"] == file_version:
+                return cached
+
+            with open(users_file, 'r') as file:
+                user_data = json.loads(file.read())
+
+            by_role: dict[str, list[str]] = {}
+            by_username: dict[str, str] = {}
+            for user, details in user_data.items():
+                # Skip any non-user entries, such as comments
+                if not isinstance(details, dict):
+                    continue
+                for role in details.get("roles", []):
+                    by_role.setdefault(role, []).append(user)
+                if "username" in details:
+                    by_username[details["username"]] = user
+
+            cached = {
+                "version": file_version,
+                "users": user_data,
+                "by_role": by_role,
+                "by_username": by_username,
+            }
+            _USERS_CACHE[users_file] = cached
+            logger.debug(f"Loaded {len(user_data)} records from {users_file}")
+            return cached
 
 
 class UserToolsException(Exception):